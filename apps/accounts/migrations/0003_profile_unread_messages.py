@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:53
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_unread_messages(apps, schema_editor):
+    Profile = apps.get_model("accounts", "Profile")
+    Message = apps.get_model("portal", "Message")
+
+    counts = (
+        Message.objects.filter(read=False, to_user__isnull=False)
+        .values("to_user_id")
+        .annotate(total=Count("pk"))
+    )
+    for row in counts:
+        Profile.objects.filter(user_id=row["to_user_id"]).update(unread_messages=row["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_alter_user_managers_alter_profile_avatar"),
+        ("portal", "0003_content_length_limits"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="unread_messages",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_unread_messages, migrations.RunPython.noop),
+    ]
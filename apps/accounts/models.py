@@ -25,6 +25,8 @@ class User(SoftDeleteMixin, AbstractUser):
 
 
 class Profile(TimestampMixin):
+    variant_widths = {"avatar": (64, 128)}
+
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -32,10 +34,21 @@ class Profile(TimestampMixin):
     )
     phone = models.CharField(max_length=50, blank=True)
     avatar = models.ImageField(upload_to="avatars/", blank=True, validators=[validate_image_file])
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
+    unread_messages = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.user.get_full_name() or self.user.email
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in ("unread_messages", "avatar_variants")
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def role(self):
         if self.user.is_staff:
@@ -1,5 +1,4 @@
 from django.contrib import admin
-from django.core.cache import cache
 from django.utils import timezone
 from unfold.admin import ModelAdmin
 
@@ -21,4 +20,3 @@ class ArticleAdmin(ModelAdmin):
         if not obj.published:
             obj.published_at = None
         super().save_model(request, obj, form, change)
-        cache.clear()
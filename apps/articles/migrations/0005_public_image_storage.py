@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:56
+
+import apps.core.storage
+import apps.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0004_rendered_markdown"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="article",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                storage=apps.core.storage.public_storage,
+                upload_to="articles/images/",
+                validators=[apps.core.validators.validate_image_file],
+            ),
+        ),
+    ]
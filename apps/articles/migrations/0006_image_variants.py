@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0005_public_image_storage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
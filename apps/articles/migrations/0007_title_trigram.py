@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:43
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0006_image_variants"),
+        ("core", "0012_faq_question_trigram"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title"],
+                name="articles_article_title_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -2,18 +2,27 @@ from django.conf import settings
 from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.urls import reverse
 from django.utils import timezone
 
-from apps.core.models import TimestampMixin
+from apps.core.models import RenderedMarkdownMixin, TimestampMixin
+from apps.core.storage import public_storage
 from apps.core.validators import validate_image_file
 
 
-class Article(TimestampMixin):
+class Article(RenderedMarkdownMixin, TimestampMixin):
+    markdown_fields = {"content": "content_html"}
+    variant_widths = {"image": (320, 640, 1024, 1600)}
+
     title = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True)
     excerpt = models.TextField(blank=True)
     content = models.TextField(help_text="Contenu en Markdown")
-    image = models.ImageField(upload_to="articles/images/", blank=True, validators=[validate_image_file])
+    content_html = models.TextField(blank=True, editable=False)
+    image = models.ImageField(
+        upload_to="articles/images/", storage=public_storage, blank=True, validators=[validate_image_file]
+    )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     category = models.CharField(max_length=100, blank=True)
     published = models.BooleanField(default=False)
     published_at = models.DateTimeField(null=True, blank=True)
@@ -25,6 +34,7 @@ class Article(TimestampMixin):
         indexes = [
             models.Index(fields=["published", "-published_at"]),
             GinIndex(fields=["search_vector"]),
+            GinIndex(fields=["title"], name="articles_article_title_trgm", opclasses=["gin_trgm_ops"]),
         ]
 
     def save(self, *args, **kwargs):
@@ -33,3 +43,10 @@ class Article(TimestampMixin):
         if not self.published:
             self.published_at = None
         super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return reverse("article_detail", kwargs={"slug": self.slug})
+
+    @property
+    def rendered_content(self):
+        return self.rendered("content")
@@ -1,11 +1,12 @@
+from django.conf import settings
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django.views.generic import DetailView, ListView
 
 from apps.articles.models import Article
+from apps.core.cache import cache_page_tagged
 
 
-@method_decorator(cache_page(60), name="dispatch")
+@method_decorator(cache_page_tagged(settings.PAGE_CACHE_TIMEOUT, ["article-list"]), name="dispatch")
 class ArticleListView(ListView):
     model = Article
     template_name = "articles/list.html"
@@ -16,6 +17,10 @@ class ArticleListView(ListView):
         return Article.objects.filter(published=True)
 
 
+@method_decorator(
+    cache_page_tagged(settings.PAGE_CACHE_TIMEOUT, [lambda request, slug: f"article:{slug}"]),
+    name="dispatch",
+)
 class ArticleDetailView(DetailView):
     model = Article
     template_name = "articles/detail.html"
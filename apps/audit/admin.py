@@ -1,14 +1,107 @@
+import json
+
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 from unfold.admin import ModelAdmin
 
-from apps.audit.models import AuditLog
+from apps.audit.models import AuditLog, DetailsSearchVector
+from apps.core.enums import AuditAction, AuditEntity
+from apps.core.paginators import EstimatedCountPaginator
+
+AFTER_VAR = "after"
+BEFORE_VAR = "before"
+
+
+def encode_cursor(obj):
+    return f"{obj.created_at.isoformat()}_{obj.pk}"
+
+
+def decode_cursor(value):
+    created_at, _, pk = value.rpartition("_")
+    created_at = parse_datetime(created_at)
+    if created_at is None or not pk.isdigit():
+        raise IncorrectLookupParameters(f"Invalid cursor: {value}")
+    return created_at, int(pk)
+
+
+def match_choice(choices, term):
+    term = term.casefold()
+    for member in choices:
+        if term in (member.name.replace("_", "").casefold(), member.label.casefold()):
+            return member
+    return None
+
+
+def older_than(created_at, pk):
+    return Q(created_at__lte=created_at) & (Q(created_at__lt=created_at) | Q(pk__lt=pk))
+
+
+def newer_than(created_at, pk):
+    return Q(created_at__gte=created_at) & (Q(created_at__gt=created_at) | Q(pk__gt=pk))
+
+
+class KeysetChangeList(ChangeList):
+    def __init__(self, request, *args, **kwargs):
+        self.after = request.GET.get(AFTER_VAR)
+        self.before = request.GET.get(BEFORE_VAR)
+        self.keyset = False
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(AFTER_VAR, None)
+        lookup_params.pop(BEFORE_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        new_params = {AFTER_VAR: None, BEFORE_VAR: None, **(new_params or {})}
+        return super().get_query_string(new_params, remove)
+
+    def get_results(self, request):
+        if ORDER_VAR in self.params:
+            return super().get_results(request)
+
+        per_page = self.list_per_page
+        queryset = self.queryset.order_by("-created_at", "-pk")
+        if self.before:
+            rows = list(queryset.filter(newer_than(*decode_cursor(self.before))).reverse()[: per_page + 1])
+            has_newer, has_older = len(rows) > per_page, True
+            rows = rows[:per_page][::-1]
+        else:
+            if self.after:
+                queryset = queryset.filter(older_than(*decode_cursor(self.after)))
+            rows = list(queryset[: per_page + 1])
+            has_newer, has_older = bool(self.after), len(rows) > per_page
+            rows = rows[:per_page]
+
+        paginator = self.model_admin.get_paginator(request, self.queryset, per_page)
+        self.keyset = True
+        self.result_count = paginator.count
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.full_result_count = None
+        self.result_list = rows
+        self.can_show_all = False
+        self.multi_page = has_newer or has_older
+        self.paginator = paginator
+        self.newer_url = self.get_query_string({BEFORE_VAR: encode_cursor(rows[0])}) if has_newer and rows else None
+        self.older_url = self.get_query_string({AFTER_VAR: encode_cursor(rows[-1])}) if has_older and rows else None
 
 
 @admin.register(AuditLog)
 class AuditLogAdmin(ModelAdmin):
     list_display = ("created_at", "user", "action", "entity_type", "entity_id")
     list_filter = ("action", "entity_type", "created_at")
-    search_fields = ("action", "entity_type", "details")
+    list_select_related = ("user",)
+    search_fields = ("details",)
+    search_help_text = "Recherche dans les détails, ou « clé:valeur » pour une correspondance exacte."
+    ordering = ("-created_at", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     readonly_fields = (
         "user",
         "action",
@@ -20,6 +113,28 @@ class AuditLogAdmin(ModelAdmin):
         "created_at",
     )
 
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        key, sep, value = term.partition(":")
+        if sep and key.strip() and value.strip() and " " not in key.strip():
+            try:
+                value = json.loads(value.strip())
+            except ValueError:
+                value = value.strip()
+            return queryset.filter(details__contains={key.strip(): value}), False
+        queryset = queryset.alias(details_search=DetailsSearchVector("details"))
+        match = Q(entity_id=term)
+        if action := match_choice(AuditAction, term):
+            match |= Q(action=action)
+        if entity_type := match_choice(AuditEntity, term):
+            match |= Q(entity_type=entity_type)
+        return queryset.filter(match | Q(details_search=SearchQuery(term, config="simple"))), False
+
     def has_add_permission(self, request):
         return False
 
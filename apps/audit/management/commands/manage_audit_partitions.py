@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.audit.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    archive_partition,
+    create_partition,
+    default_partition_rows,
+    drop_partition,
+    existing_partitions,
+    month_start,
+    partition_name,
+)
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly audit log partitions and drop or archive expired ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=3, help="Number of future months to prepare")
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=settings.AUDIT_RETENTION_MONTHS,
+            help="Months of audit history to keep (0 keeps everything)",
+        )
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            help="Detach expired partitions as standalone tables instead of dropping them",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        current = month_start(timezone.now())
+        with transaction.atomic(), connection.cursor() as cursor:
+            existing = existing_partitions(cursor)
+
+            for offset in range(options["months_ahead"] + 1):
+                month = add_months(current, offset)
+                if month in existing:
+                    continue
+                self.stdout.write(f"  create {partition_name(month)}")
+                if not options["dry_run"]:
+                    create_partition(cursor, month)
+
+            if options["retention_months"] > 0:
+                cutoff = add_months(current, -options["retention_months"])
+                for month, name in sorted(existing.items()):
+                    if month >= cutoff:
+                        continue
+                    if options["archive"]:
+                        self.stdout.write(f"  archive {name}")
+                        if not options["dry_run"]:
+                            archive_partition(cursor, name)
+                    else:
+                        self.stdout.write(f"  drop {name}")
+                        if not options["dry_run"]:
+                            drop_partition(cursor, name)
+
+            stray = default_partition_rows(cursor)
+        if stray:
+            self.stderr.write(self.style.WARNING(f"{stray} audit rows fell into {DEFAULT_PARTITION}."))
+        self.stdout.write(self.style.SUCCESS("Audit partitions up to date."))
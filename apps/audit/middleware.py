@@ -1,15 +1,38 @@
-from apps.audit.services import set_request_metadata
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from apps.audit.services import audit_buffer, flush_audit_buffer, open_audit_buffer, set_request_metadata
 
 
 class AuditMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        self._set_metadata(request)
+        with audit_buffer():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        self._set_metadata(request)
+        opened = open_audit_buffer()
+        try:
+            return await self.get_response(request)
+        finally:
+            if opened:
+                await sync_to_async(flush_audit_buffer)()
+
+    def _set_metadata(self, request):
         ip = self._get_client_ip(request)
         ua = request.META.get("HTTP_USER_AGENT", "")
         set_request_metadata(ip, ua)
-        return self.get_response(request)
 
     @staticmethod
     def _get_client_ip(request):
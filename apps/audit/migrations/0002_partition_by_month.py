@@ -0,0 +1,88 @@
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+from apps.audit.partitions import add_months, create_partition, month_start
+
+MONTHS_AHEAD = 3
+
+
+def create_monthly_partitions(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT min(created_at) FROM audit_auditlog_legacy")
+        oldest = cursor.fetchone()[0] or timezone.now()
+        month = month_start(oldest)
+        last = add_months(month_start(timezone.now()), MONTHS_AHEAD)
+        while month <= last:
+            create_partition(cursor, month)
+            month = add_months(month, 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("audit", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    """
+                    ALTER TABLE audit_auditlog RENAME TO audit_auditlog_legacy;
+                    ALTER INDEX audit_auditlog_pkey RENAME TO audit_auditlog_legacy_pkey;
+                    CREATE SEQUENCE audit_auditlog_new_id_seq;
+                    CREATE TABLE audit_auditlog (
+                        id bigint NOT NULL DEFAULT nextval('audit_auditlog_new_id_seq'),
+                        action varchar(100) NOT NULL,
+                        entity_type varchar(50) NOT NULL,
+                        entity_id varchar(50) NOT NULL,
+                        details jsonb NULL,
+                        ip_address inet NULL,
+                        user_agent text NOT NULL,
+                        created_at timestamp with time zone NOT NULL,
+                        user_id bigint NULL,
+                        PRIMARY KEY (id, created_at)
+                    ) PARTITION BY RANGE (created_at);
+                    CREATE TABLE audit_auditlog_default PARTITION OF audit_auditlog DEFAULT;
+                    """
+                ),
+                migrations.RunPython(create_monthly_partitions),
+                migrations.RunSQL(
+                    """
+                    INSERT INTO audit_auditlog
+                        (id, action, entity_type, entity_id, details, ip_address, user_agent, created_at, user_id)
+                    SELECT id, action, entity_type, entity_id, details, ip_address, user_agent, created_at, user_id
+                    FROM audit_auditlog_legacy;
+                    SELECT setval(
+                        'audit_auditlog_new_id_seq',
+                        coalesce((SELECT max(id) FROM audit_auditlog_legacy), 0) + 1,
+                        false
+                    );
+                    DROP TABLE audit_auditlog_legacy;
+                    ALTER SEQUENCE audit_auditlog_new_id_seq RENAME TO audit_auditlog_id_seq;
+                    ALTER SEQUENCE audit_auditlog_id_seq OWNED BY audit_auditlog.id;
+                    ALTER TABLE audit_auditlog ADD CONSTRAINT audit_auditlog_user_id_fk_accounts_user_id
+                        FOREIGN KEY (user_id) REFERENCES accounts_user (id) DEFERRABLE INITIALLY DEFERRED;
+                    CREATE INDEX audit_auditlog_user_id_idx ON audit_auditlog (user_id);
+                    CREATE INDEX audit_audit_entity__9535bf_idx ON audit_auditlog (entity_type, entity_id);
+                    CREATE INDEX audit_audit_created_brin ON audit_auditlog USING brin (created_at);
+                    """
+                ),
+            ],
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name="auditlog",
+                    name="audit_audit_created_6e540c_idx",
+                ),
+                migrations.AddIndex(
+                    model_name="auditlog",
+                    index=django.contrib.postgres.indexes.BrinIndex(
+                        fields=["created_at"], name="audit_audit_created_brin"
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:15
+
+import apps.audit.models
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0002_partition_by_month"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="audit_audit_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["details"],
+                name="audit_audit_details_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=django.contrib.postgres.indexes.GinIndex(
+                apps.audit.models.DetailsSearchVector("details"),
+                name="audit_audit_details_search",
+            ),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0003_admin_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserAgent",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("value", models.CharField(max_length=512, unique=True)),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    """
+                    ALTER TABLE audit_auditlog
+                        ALTER COLUMN action TYPE smallint USING CASE action
+                            WHEN 'created' THEN 1
+                            WHEN 'updated' THEN 2
+                            WHEN 'deleted' THEN 3
+                        END,
+                        ALTER COLUMN entity_type TYPE smallint USING CASE entity_type
+                            WHEN 'Project' THEN 1
+                            WHEN 'Article' THEN 2
+                            WHEN 'Contact' THEN 3
+                            WHEN 'ClientProject' THEN 4
+                            WHEN 'Message' THEN 5
+                            WHEN 'ProjectComment' THEN 6
+                            WHEN 'EmailTemplate' THEN 7
+                            WHEN 'AssignmentRule' THEN 8
+                        END;
+                    INSERT INTO audit_useragent (value)
+                        SELECT DISTINCT left(user_agent, 512) FROM audit_auditlog WHERE user_agent <> ''
+                        ON CONFLICT DO NOTHING;
+                    ALTER TABLE audit_auditlog ADD COLUMN user_agent_id integer NULL;
+                    UPDATE audit_auditlog SET user_agent_id = audit_useragent.id
+                        FROM audit_useragent WHERE audit_useragent.value = left(audit_auditlog.user_agent, 512);
+                    ALTER TABLE audit_auditlog DROP COLUMN user_agent;
+                    ALTER TABLE audit_auditlog ADD CONSTRAINT audit_auditlog_user_agent_id_fk_audit_useragent_id
+                        FOREIGN KEY (user_agent_id) REFERENCES audit_useragent (id) DEFERRABLE INITIALLY DEFERRED;
+                    """
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="auditlog",
+                    name="action",
+                    field=models.SmallIntegerField(
+                        choices=[
+                            (1, "Création"),
+                            (2, "Modification"),
+                            (3, "Suppression"),
+                        ]
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="auditlog",
+                    name="entity_type",
+                    field=models.SmallIntegerField(
+                        choices=[
+                            (1, "Projet"),
+                            (2, "Article"),
+                            (3, "Contact"),
+                            (4, "Accès client"),
+                            (5, "Message"),
+                            (6, "Commentaire"),
+                            (7, "Modèle email"),
+                            (8, "Règle d'attribution"),
+                        ]
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name="auditlog",
+                    name="user_agent",
+                    field=models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="audit.useragent",
+                    ),
+                ),
+            ],
+        ),
+    ]
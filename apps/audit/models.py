@@ -1,20 +1,45 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
+from apps.core.enums import AuditAction, AuditEntity
+
+MAX_USER_AGENT_LENGTH = 512
+
+
+class DetailsSearchVector(models.Func):
+    function = "jsonb_to_tsvector"
+    template = "%(function)s('simple'::regconfig, %(expressions)s, '[\"string\", \"numeric\"]'::jsonb)"
+    output_field = SearchVectorField()
+
+
+class UserAgent(models.Model):
+    id = models.AutoField(primary_key=True)
+    value = models.CharField(max_length=MAX_USER_AGENT_LENGTH, unique=True)
+
+    def __str__(self):
+        return self.value
+
 
 class AuditLog(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
-    action = models.CharField(max_length=100)
-    entity_type = models.CharField(max_length=50)
+    action = models.SmallIntegerField(choices=AuditAction)
+    entity_type = models.SmallIntegerField(choices=AuditEntity)
     entity_id = models.CharField(max_length=50, blank=True, help_text="String representation of PK")
     details = models.JSONField(null=True, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    user_agent = models.TextField(blank=True)
+    user_agent = models.ForeignKey(
+        UserAgent, on_delete=models.PROTECT, null=True, blank=True, db_index=False, related_name="+"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["-created_at"]),
+            BrinIndex(fields=["created_at"], name="audit_audit_created_brin"),
             models.Index(fields=["entity_type", "entity_id"]),
+            models.Index(fields=["-created_at", "-id"], name="audit_audit_keyset_idx"),
+            GinIndex(fields=["details"], opclasses=["jsonb_path_ops"], name="audit_audit_details_gin"),
+            GinIndex(DetailsSearchVector("details"), name="audit_audit_details_search"),
         ]
@@ -0,0 +1,89 @@
+import re
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+
+from django.db import connection
+
+PARENT_TABLE = "audit_auditlog"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+ARCHIVE_PREFIX = f"{PARENT_TABLE}_archive_"
+
+_PARTITION_RE = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(value):
+    if isinstance(value, datetime):
+        value = value.astimezone(dt_timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{PARENT_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def partition_month(name):
+    match = _PARTITION_RE.match(name)
+    if not match:
+        return None
+    return date(int(match[1]), int(match[2]), 1)
+
+
+def _bound(month):
+    return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc).isoformat()
+
+
+def existing_partitions(cursor, parent=PARENT_TABLE):
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = %s",
+        [parent],
+    )
+    partitions = {}
+    for (name,) in cursor.fetchall():
+        month = partition_month(name)
+        if month is not None:
+            partitions[month] = name
+    return partitions
+
+
+def create_partition(cursor, month, parent=PARENT_TABLE):
+    qn = connection.ops.quote_name
+    name, default = qn(partition_name(month)), qn(DEFAULT_PARTITION)
+    start, end = _bound(month), _bound(add_months(month, 1))
+    in_range = f"created_at >= '{start}' AND created_at < '{end}'"
+
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})")
+    stray = cursor.fetchone()[0]
+    if stray:
+        cursor.execute(f"ALTER TABLE {qn(parent)} DETACH PARTITION {default}")
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {qn(parent)} FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+    if stray:
+        cursor.execute(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_range}")
+        cursor.execute(f"DELETE FROM {default} WHERE {in_range}")
+        cursor.execute(f"ALTER TABLE {qn(parent)} ATTACH PARTITION {default} DEFAULT")
+
+
+def drop_partition(cursor, name):
+    cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+
+
+def archive_partition(cursor, name, parent=PARENT_TABLE):
+    qn = connection.ops.quote_name
+    archive_name = ARCHIVE_PREFIX + name.removeprefix(f"{PARENT_TABLE}_")
+    cursor.execute(f"ALTER TABLE {qn(parent)} DETACH PARTITION {qn(name)}")
+    cursor.execute(f"ALTER TABLE {qn(name)} RENAME TO {qn(archive_name)}")
+    return archive_name
+
+
+def default_partition_rows(cursor):
+    cursor.execute(f"SELECT count(*) FROM {connection.ops.quote_name(DEFAULT_PARTITION)}")
+    return cursor.fetchone()[0]
@@ -1,30 +1,192 @@
+import atexit
+import logging
+import queue
+import re
 import threading
+import time
+from contextlib import contextmanager
 
-_thread_local = threading.local()
+from asgiref.local import Local
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from apps.core.enums import AuditAction, AuditEntity
+
+logger = logging.getLogger(__name__)
+
+MAX_BUFFERED_EVENTS = 500
+DRAIN_QUEUE_BATCHES = 100
+BULK_BATCH_SIZE = 500
+MAX_INTERNED_USER_AGENTS = 2000
+DRAIN_RETRY_DELAY = 1
+DRAIN_RETRY_MAX_DELAY = 60
+
+_request_local = Local()
+_drain_queue: queue.Queue[list] = queue.Queue(maxsize=DRAIN_QUEUE_BATCHES)
+_drain_lock = threading.Lock()
+_drain_thread = None
+_user_agent_ids: dict[str, int] = {}
 
 
 def get_request_metadata():
     return {
-        "ip_address": getattr(_thread_local, "ip_address", None),
-        "user_agent": getattr(_thread_local, "user_agent", ""),
+        "ip_address": getattr(_request_local, "ip_address", None),
+        "user_agent": getattr(_request_local, "user_agent", ""),
     }
 
 
 def set_request_metadata(ip_address, user_agent):
-    _thread_local.ip_address = ip_address
-    _thread_local.user_agent = user_agent
+    _request_local.ip_address = ip_address
+    _request_local.user_agent = user_agent
+
+
+def encode_choice(choices, value):
+    if isinstance(value, int):
+        return choices(value)
+    return choices[re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", value).upper()]
 
 
 def log_audit_event(user, action, entity_type, entity_id, details=None):
-    from apps.audit.models import AuditLog
+    from apps.audit.models import MAX_USER_AGENT_LENGTH, AuditLog
 
     meta = get_request_metadata()
-    AuditLog.objects.create(
+    event = AuditLog(
         user=user,
-        action=action,
-        entity_type=entity_type,
+        action=encode_choice(AuditAction, action),
+        entity_type=encode_choice(AuditEntity, entity_type),
         entity_id=str(entity_id),
         details=details,
         ip_address=meta["ip_address"],
-        user_agent=meta["user_agent"],
     )
+    event.user_agent_value = meta["user_agent"][:MAX_USER_AGENT_LENGTH]
+    if getattr(_request_local, "audit_events", None) is None:
+        _bulk_insert([event])
+    elif connection.in_atomic_block:
+        transaction.on_commit(lambda: _buffer_event(event))
+    else:
+        _buffer_event(event)
+
+
+def _buffer_event(event):
+    events = getattr(_request_local, "audit_events", None)
+    if events is None:
+        write_events([event])
+        return
+    events.append(event)
+    if len(events) >= MAX_BUFFERED_EVENTS:
+        _request_local.audit_events = []
+        write_events(events)
+
+
+def open_audit_buffer():
+    if getattr(_request_local, "audit_events", None) is not None:
+        return False
+    _request_local.audit_events = []
+    return True
+
+
+def flush_audit_buffer():
+    events = getattr(_request_local, "audit_events", None)
+    _request_local.audit_events = None
+    if events:
+        write_events(events)
+
+
+@contextmanager
+def audit_buffer():
+    opened = open_audit_buffer()
+    try:
+        yield
+    finally:
+        if opened:
+            flush_audit_buffer()
+
+
+def intern_user_agents(values):
+    from apps.audit.models import UserAgent
+
+    missing = {value for value in values if value and value not in _user_agent_ids}
+    if not missing:
+        return _user_agent_ids
+    UserAgent.objects.bulk_create([UserAgent(value=value) for value in missing], ignore_conflicts=True)
+    ids = dict(UserAgent.objects.filter(value__in=missing).values_list("value", "id"))
+    transaction.on_commit(lambda: _remember_user_agents(ids))
+    return {**_user_agent_ids, **ids}
+
+
+def _remember_user_agents(ids):
+    if len(_user_agent_ids) + len(ids) > MAX_INTERNED_USER_AGENTS:
+        _user_agent_ids.clear()
+    _user_agent_ids.update(ids)
+
+
+def _bulk_insert(events):
+    from apps.audit.models import AuditLog
+
+    ids = intern_user_agents(getattr(event, "user_agent_value", "") for event in events)
+    for event in events:
+        event.user_agent_id = ids.get(getattr(event, "user_agent_value", ""))
+    AuditLog.objects.bulk_create(events, batch_size=BULK_BATCH_SIZE)
+
+
+def write_events(events):
+    if not events:
+        return
+    if settings.AUDIT_ASYNC_DRAIN:
+        _ensure_drain_thread()
+        try:
+            _drain_queue.put_nowait(events)
+            return
+        except queue.Full:
+            logger.warning("Audit drain queue full, writing %s events synchronously", len(events))
+    _bulk_insert(events)
+
+
+def _ensure_drain_thread():
+    global _drain_thread
+    if _drain_thread is not None and _drain_thread.is_alive():
+        return
+    with _drain_lock:
+        if _drain_thread is None or not _drain_thread.is_alive():
+            _drain_thread = threading.Thread(target=_drain, name="audit-drain", daemon=True)
+            _drain_thread.start()
+
+
+def _drain():
+    while True:
+        events = _drain_queue.get()
+        try:
+            _insert_until_written(events)
+        finally:
+            _drain_queue.task_done()
+
+
+def _insert_until_written(events):
+    # Audit events must not be lost: a failing batch is retried with backoff while
+    # new batches wait in the queue, and write_events falls back to synchronous writes once it fills.
+    delay = DRAIN_RETRY_DELAY
+    while True:
+        try:
+            close_old_connections()
+            _bulk_insert(events)
+            return
+        except Exception:
+            logger.exception("Failed to write %s audit events, retrying in %ss", len(events), delay)
+            connection.close()
+            time.sleep(delay)
+            delay = min(delay * 2, DRAIN_RETRY_MAX_DELAY)
+
+
+@atexit.register
+def drain_pending_events():
+    while True:
+        try:
+            events = _drain_queue.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            _bulk_insert(events)
+        except Exception:
+            logger.exception("Dropped %s audit events at shutdown", len(events))
+        finally:
+            _drain_queue.task_done()
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.audit.admin import decode_cursor, encode_cursor
+from apps.audit.models import AuditLog
+from apps.core.enums import AuditAction, AuditEntity
+from apps.core.paginators import EstimatedCountPaginator
+
+
+def make_log(entity_id, entity_type=AuditEntity.PROJECT, action=AuditAction.CREATED, **kwargs):
+    return AuditLog.objects.create(action=action, entity_type=entity_type, entity_id=entity_id, **kwargs)
+
+
+class TestCursor:
+    def test_round_trip(self):
+        log = AuditLog(pk=42, created_at=timezone.now())
+        assert decode_cursor(encode_cursor(log)) == (log.created_at, 42)
+
+    def test_invalid_cursor_rejected(self):
+        with pytest.raises(IncorrectLookupParameters):
+            decode_cursor("garbage")
+
+
+@pytest.mark.django_db
+class TestAuditLogChangelist:
+    url = reverse("admin:audit_auditlog_changelist")
+
+    @pytest.fixture
+    def logs(self):
+        now = timezone.now()
+        logs = [make_log(str(i)) for i in range(5)]
+        for i, log in enumerate(logs):
+            AuditLog.objects.filter(pk=log.pk).update(created_at=now - timedelta(minutes=i))
+            log.refresh_from_db()
+        return logs
+
+    def test_keyset_pages(self, admin_client, logs, monkeypatch):
+        monkeypatch.setattr("apps.audit.admin.AuditLogAdmin.list_per_page", 2)
+        first = admin_client.get(self.url).context["cl"]
+        assert [log.pk for log in first.result_list] == [logs[0].pk, logs[1].pk]
+        assert first.newer_url is None
+
+        second = admin_client.get(first.older_url).context["cl"]
+        assert [log.pk for log in second.result_list] == [logs[2].pk, logs[3].pk]
+
+        back = admin_client.get(second.newer_url).context["cl"]
+        assert [log.pk for log in back.result_list] == [logs[0].pk, logs[1].pk]
+
+    def test_filter_links_reset_cursor(self, admin_client, logs):
+        response = admin_client.get(self.url, {"after": encode_cursor(logs[0])})
+        assert "after" not in response.context["cl"].get_query_string({"action": AuditAction.UPDATED})
+
+    def test_key_value_search_uses_containment(self, admin_client):
+        make_log("1", action=AuditAction.UPDATED, details={"status": "Published"})
+        make_log("2", action=AuditAction.UPDATED, details={"status": "Draft"})
+        cl = admin_client.get(self.url, {"q": "status:Published"}).context["cl"]
+        assert [log.entity_id for log in cl.result_list] == ["1"]
+
+    def test_text_search_matches_detail_values(self, admin_client):
+        make_log("7", AuditEntity.CONTACT, details={"email": "a@b.fr"})
+        make_log("8", AuditEntity.CONTACT, details={"name": "Ali"})
+        cl = admin_client.get(self.url, {"q": "ali"}).context["cl"]
+        assert [log.entity_id for log in cl.result_list] == ["8"]
+
+    def test_search_matches_entity_label(self, admin_client):
+        make_log("7", AuditEntity.CONTACT)
+        make_log("8")
+        cl = admin_client.get(self.url, {"q": "projet"}).context["cl"]
+        assert [log.entity_id for log in cl.result_list] == ["8"]
+
+
+@pytest.mark.django_db
+class TestEstimatedCountPaginator:
+    def test_small_tables_counted_exactly(self):
+        make_log("1")
+        assert EstimatedCountPaginator(AuditLog.objects.all(), 10).count == 1
@@ -1,4 +1,5 @@
 import pytest
+from asgiref.sync import async_to_sync
 from django.test import RequestFactory
 
 from apps.audit.middleware import AuditMiddleware
@@ -34,3 +35,12 @@ class TestAuditMiddleware:
         self.middleware(request)
         meta = get_request_metadata()
         assert meta["user_agent"] == "TestBot/1.0"
+
+    def test_async_get_response(self):
+        async def get_response(request):
+            return request
+
+        middleware = AuditMiddleware(get_response)
+        request = self.rf.get("/", REMOTE_ADDR="10.0.0.1")
+        async_to_sync(middleware)(request)
+        assert get_request_metadata()["ip_address"] == "10.0.0.1"
@@ -1,19 +1,20 @@
 import pytest
 
 from apps.audit.models import AuditLog
+from apps.core.enums import AuditAction, AuditEntity
 
 
 @pytest.mark.django_db
 class TestAuditLog:
     def test_ordering_newest_first(self):
-        AuditLog.objects.create(action="a", entity_type="X", entity_id="1")
-        AuditLog.objects.create(action="b", entity_type="X", entity_id="2")
+        AuditLog.objects.create(action=AuditAction.CREATED, entity_type=AuditEntity.PROJECT, entity_id="1")
+        AuditLog.objects.create(action=AuditAction.UPDATED, entity_type=AuditEntity.PROJECT, entity_id="2")
         result = list(AuditLog.objects.all())
-        assert result[0].action == "b"
+        assert result[0].action == AuditAction.UPDATED
 
     def test_nullable_user(self):
         log = AuditLog.objects.create(
-            user=None, action="test", entity_type="Test", entity_id="0"
+            user=None, action=AuditAction.DELETED, entity_type=AuditEntity.CONTACT, entity_id="0"
         )
         assert log.user is None
         assert log.pk is not None
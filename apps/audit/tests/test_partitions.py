@@ -0,0 +1,67 @@
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from apps.audit.models import AuditLog
+from apps.audit.partitions import (
+    add_months,
+    create_partition,
+    existing_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+from apps.core.enums import AuditAction, AuditEntity
+
+
+class TestPartitionHelpers:
+    def test_month_start_uses_utc(self):
+        value = datetime(2026, 10, 31, 23, 30, tzinfo=dt_timezone.utc).astimezone(timezone.get_fixed_timezone(60))
+        assert month_start(value) == date(2026, 10, 1)
+
+    def test_add_months_crosses_years(self):
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_name_round_trip(self):
+        assert partition_name(date(2026, 3, 1)) == "audit_auditlog_y2026m03"
+        assert partition_month("audit_auditlog_y2026m03") == date(2026, 3, 1)
+        assert partition_month("audit_auditlog_default") is None
+
+
+@pytest.mark.django_db
+class TestManageAuditPartitions:
+    def test_creates_future_partitions(self):
+        call_command("manage_audit_partitions", "--months-ahead=6")
+        current = month_start(timezone.now())
+        with connection.cursor() as cursor:
+            partitions = existing_partitions(cursor)
+        assert add_months(current, 6) in partitions
+
+    def test_rows_route_to_monthly_partition(self):
+        log = AuditLog.objects.create(action=AuditAction.CREATED, entity_type=AuditEntity.PROJECT, entity_id="1")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT tableoid::regclass::text FROM audit_auditlog WHERE id = %s", [log.pk])
+            assert cursor.fetchone()[0] == partition_name(month_start(log.created_at))
+
+    def test_drops_expired_partitions(self):
+        old = add_months(month_start(timezone.now()), -30)
+        with connection.cursor() as cursor:
+            create_partition(cursor, old)
+        call_command("manage_audit_partitions", "--retention-months=24")
+        with connection.cursor() as cursor:
+            assert old not in existing_partitions(cursor)
+
+    def test_moves_stray_rows_out_of_default(self):
+        future = add_months(month_start(timezone.now()), 12)
+        created_at = datetime(future.year, future.month, 15, tzinfo=dt_timezone.utc)
+        log = AuditLog.objects.create(action=AuditAction.CREATED, entity_type=AuditEntity.PROJECT, entity_id="1")
+        AuditLog.objects.filter(pk=log.pk).update(created_at=created_at)
+        with connection.cursor() as cursor:
+            create_partition(cursor, future)
+            cursor.execute("SELECT tableoid::regclass::text FROM audit_auditlog WHERE id = %s", [log.pk])
+            assert cursor.fetchone()[0] == partition_name(future)
@@ -1,8 +1,22 @@
+from unittest.mock import patch
+
 import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 
 from apps.accounts.factories import UserFactory
-from apps.audit.models import AuditLog
-from apps.audit.services import get_request_metadata, log_audit_event, set_request_metadata
+from apps.audit import services
+from apps.audit.models import AuditLog, UserAgent
+from apps.audit.services import (
+    audit_buffer,
+    drain_pending_events,
+    encode_choice,
+    get_request_metadata,
+    log_audit_event,
+    set_request_metadata,
+    write_events,
+)
+from apps.core.enums import AuditAction, AuditEntity
 
 
 @pytest.mark.django_db
@@ -10,19 +24,54 @@ class TestLogAuditEvent:
     def test_creates_record(self):
         user = UserFactory()
         log_audit_event(user=user, action="created", entity_type="Project", entity_id="1")
-        log = AuditLog.objects.filter(entity_type="Project").first()
+        log = AuditLog.objects.filter(entity_type=AuditEntity.PROJECT).first()
         assert log is not None
         assert log.user == user
-        assert log.action == "created"
+        assert log.action == AuditAction.CREATED
         assert log.entity_id == "1"
 
     def test_nullable_user(self):
         log_audit_event(user=None, action="deleted", entity_type="Contact", entity_id="5")
-        log = AuditLog.objects.filter(entity_type="Contact").first()
+        log = AuditLog.objects.filter(entity_type=AuditEntity.CONTACT).first()
         assert log is not None
         assert log.user is None
 
 
+class TestEncodeChoice:
+    def test_accepts_legacy_names(self):
+        assert encode_choice(AuditAction, "updated") == AuditAction.UPDATED
+        assert encode_choice(AuditEntity, "ClientProject") == AuditEntity.CLIENT_PROJECT
+
+    def test_accepts_codes(self):
+        assert encode_choice(AuditEntity, AuditEntity.MESSAGE) == AuditEntity.MESSAGE
+
+    def test_unknown_name_rejected(self):
+        with pytest.raises(LookupError):
+            encode_choice(AuditEntity, "Invoice")
+
+
+@pytest.mark.django_db
+class TestUserAgentInterning:
+    def test_deduplicates_user_agents(self):
+        set_request_metadata("10.0.0.1", "Mozilla/5.0")
+        for i in range(3):
+            log_audit_event(user=None, action="created", entity_type="Project", entity_id=i)
+        assert UserAgent.objects.count() == 1
+        assert AuditLog.objects.filter(user_agent__value="Mozilla/5.0").count() == 3
+
+    def test_cached_user_agent_skips_lookup(self, django_assert_num_queries, django_capture_on_commit_callbacks):
+        set_request_metadata("10.0.0.1", "Mozilla/5.0")
+        with django_capture_on_commit_callbacks(execute=True):
+            log_audit_event(user=None, action="created", entity_type="Project", entity_id=1)
+        with django_assert_num_queries(1):
+            log_audit_event(user=None, action="created", entity_type="Project", entity_id=2)
+
+    def test_empty_user_agent_stored_as_null(self):
+        set_request_metadata(None, "")
+        log_audit_event(user=None, action="created", entity_type="Project", entity_id=1)
+        assert AuditLog.objects.get().user_agent is None
+
+
 class TestRequestMetadata:
     def test_set_and_get(self):
         set_request_metadata("10.0.0.1", "Mozilla/5.0")
@@ -35,6 +84,53 @@ class TestRequestMetadata:
         set_request_metadata("203.0.113.1", "TestClient/2.0")
         user = UserFactory()
         log_audit_event(user=user, action="updated", entity_type="Article", entity_id="7")
-        log = AuditLog.objects.filter(entity_type="Article").first()
+        log = AuditLog.objects.filter(entity_type=AuditEntity.ARTICLE).first()
         assert log.ip_address == "203.0.113.1"
-        assert log.user_agent == "TestClient/2.0"
+        assert log.user_agent.value == "TestClient/2.0"
+
+
+@pytest.mark.django_db
+class TestAuditBuffer:
+    def test_flushes_with_single_insert(self, django_capture_on_commit_callbacks):
+        with CaptureQueriesContext(connection) as ctx, audit_buffer():
+            with django_capture_on_commit_callbacks(execute=True):
+                for i in range(3):
+                    log_audit_event(user=None, action="created", entity_type="Project", entity_id=i)
+            assert AuditLog.objects.count() == 0
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "audit_auditlog"')]
+        assert len(inserts) == 1
+        assert AuditLog.objects.count() == 3
+
+    def test_rolled_back_events_discarded(self, django_capture_on_commit_callbacks):
+        with audit_buffer(), django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError), transaction.atomic():
+                log_audit_event(user=None, action="created", entity_type="Project", entity_id=1)
+                raise RuntimeError
+        assert AuditLog.objects.count() == 0
+
+    def test_bounded_buffer_flushes_early(self, django_capture_on_commit_callbacks):
+        with patch.object(services, "MAX_BUFFERED_EVENTS", 2), audit_buffer():
+            with django_capture_on_commit_callbacks(execute=True):
+                for i in range(3):
+                    log_audit_event(user=None, action="created", entity_type="Project", entity_id=i)
+            assert AuditLog.objects.count() == 2
+        assert AuditLog.objects.count() == 3
+
+
+class TestAsyncDrain:
+    def test_batches_queued_and_drained(self, settings):
+        settings.AUDIT_ASYNC_DRAIN = True
+        with patch.object(services, "_ensure_drain_thread"), patch.object(services, "_bulk_insert") as mock_insert:
+            write_events(["a", "b"])
+            mock_insert.assert_not_called()
+            drain_pending_events()
+        mock_insert.assert_called_once_with(["a", "b"])
+
+    def test_failed_batch_retried_until_written(self):
+        failures = [Exception("down"), Exception("down"), None]
+        with patch.object(services, "_bulk_insert", side_effect=failures) as mock_insert, patch.object(
+            services.time, "sleep"
+        ) as mock_sleep, patch.object(services, "connection"):
+            services._insert_until_written(["a"])
+        assert mock_insert.call_count == 3
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1, 2]
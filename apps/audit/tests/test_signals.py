@@ -2,6 +2,7 @@ import pytest
 
 from apps.audit.models import AuditLog
 from apps.audit.signals import _get_user
+from apps.core.enums import AuditAction, AuditEntity
 from apps.projects.factories import ProjectFactory
 
 
@@ -11,7 +12,7 @@ class TestAuditSignals:
         initial_count = AuditLog.objects.count()
         ProjectFactory()
         assert AuditLog.objects.count() > initial_count
-        log = AuditLog.objects.filter(entity_type="Project", action="created").first()
+        log = AuditLog.objects.filter(entity_type=AuditEntity.PROJECT, action=AuditAction.CREATED).first()
         assert log is not None
 
     def test_log_on_project_update(self):
@@ -19,14 +20,14 @@ class TestAuditSignals:
         initial_count = AuditLog.objects.count()
         p.title = "Updated"
         p.save()
-        new_log = AuditLog.objects.filter(entity_type="Project", action="updated").first()
+        new_log = AuditLog.objects.filter(entity_type=AuditEntity.PROJECT, action=AuditAction.UPDATED).first()
         assert new_log is not None
 
     def test_log_on_project_delete(self):
         p = ProjectFactory()
         pk = p.pk
         p.delete()
-        log = AuditLog.objects.filter(entity_type="Project", action="deleted").first()
+        log = AuditLog.objects.filter(entity_type=AuditEntity.PROJECT, action=AuditAction.DELETED).first()
         assert log is not None
         assert log.entity_id == str(pk)
 
@@ -0,0 +1,90 @@
+import asyncio
+import hashlib
+import re
+import time
+import unicodedata
+
+ANSWER_CACHE_TIMEOUT = 60 * 60 * 24
+ANSWER_KEY_PREFIX = "chatbot:answer:"
+FOLLOW_POLL = 0.05
+FLIGHT_IDLE_TIMEOUT = 30
+
+_flights: dict[str, "Flight"] = {}
+
+
+def normalize_question(text):
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def prompt_version(system_prompt):
+    return hashlib.sha1(system_prompt.encode()).hexdigest()[:12]
+
+
+def answer_cache_key(question, version):
+    digest = hashlib.sha256(f"{version}:{normalize_question(question)}".encode()).hexdigest()
+    return f"{ANSWER_KEY_PREFIX}{digest}"
+
+
+def prior_turns(history, user_message):
+    turns = list(history)
+    if turns and turns[-1] == {"role": "user", "content": user_message}:
+        turns.pop()
+    while turns and turns[0]["role"] == "assistant":
+        turns.pop(0)
+    return turns
+
+
+class Flight:
+    def __init__(self):
+        self.events = []
+        self.done = False
+        self.updated = time.monotonic()
+
+    @property
+    def stale(self):
+        return not self.done and time.monotonic() - self.updated > FLIGHT_IDLE_TIMEOUT
+
+    def publish(self, event):
+        self.events.append(event)
+        self.updated = time.monotonic()
+
+    def finish(self, event=None):
+        if event is not None:
+            self.publish(event)
+        self.done = True
+
+    async def follow(self, stale_event=None):
+        sent = 0
+        while True:
+            while sent < len(self.events):
+                yield self.events[sent]
+                sent += 1
+            if self.done:
+                return
+            if self.stale:
+                if stale_event is not None:
+                    yield stale_event
+                return
+            await asyncio.sleep(FOLLOW_POLL)
+
+
+def get_flight(key):
+    flight = _flights.get(key)
+    if flight is not None and flight.stale:
+        end_flight(key, flight)
+        return None
+    return flight
+
+
+def start_flight(key):
+    flight = _flights[key] = Flight()
+    return flight
+
+
+def end_flight(key, flight, event=None):
+    flight.finish(event)
+    if _flights.get(key) is flight:
+        del _flights[key]
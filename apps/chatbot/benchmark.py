@@ -0,0 +1,132 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from urllib.parse import urljoin
+
+import httpx
+
+PROBE_INTERVAL = 0.5
+OUTCOME_BY_STATUS = {429: "rate_limited", 503: "busy"}
+
+
+@dataclass
+class SessionResult:
+    outcome: str
+    status: int | None = None
+    ttfb: float | None = None
+    tokens: int = 0
+    duration: float = 0.0
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_session(client, url, message, headers):
+    started = time.perf_counter()
+    result = SessionResult("dropped")
+    try:
+        async with client.stream("POST", url, json={"message": message}, headers=headers) as response:
+            result.status = response.status_code
+            if response.status_code != 200:
+                await response.aread()
+                result.outcome = OUTCOME_BY_STATUS.get(response.status_code, "http_error")
+                return result
+            async for line in response.aiter_lines():
+                if result.ttfb is None:
+                    result.ttfb = time.perf_counter() - started
+                if not line.startswith("data: "):
+                    continue
+                data = line.removeprefix("data: ")
+                if data == "[DONE]":
+                    result.outcome = "ok"
+                    break
+                if "error" in json.loads(data):
+                    result.outcome = "error_event"
+                    break
+                result.tokens += 1
+    except httpx.HTTPError:
+        result.outcome = "dropped"
+    finally:
+        result.duration = time.perf_counter() - started
+    return result
+
+
+async def probe(client, url, latencies, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            await client.get(url)
+        except httpx.HTTPError:
+            pass
+        else:
+            latencies.append(time.perf_counter() - started)
+        try:
+            await asyncio.wait_for(stop.wait(), PROBE_INTERVAL)
+        except TimeoutError:
+            pass
+
+
+async def csrf_headers(client, base_url, url):
+    await client.get(base_url)
+    headers = {"Referer": url}
+    if token := client.cookies.get("csrftoken"):
+        headers["X-CSRFToken"] = token
+    return headers
+
+
+async def run_benchmark(base_url, sessions, concurrency, message, timeout, unique=True):
+    url = urljoin(base_url, "/api/chatbot/")
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        headers = await csrf_headers(client, base_url, url)
+        probe_url = urljoin(base_url, "/healthz/")
+        baseline = []
+        for _ in range(5):
+            started = time.perf_counter()
+            await client.get(probe_url)
+            baseline.append(time.perf_counter() - started)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(index):
+            async with semaphore:
+                text = f"{message} ({index})" if unique else message
+                return await run_session(client, url, text, headers)
+
+        under_load = []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, probe_url, under_load, stop))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(limited(index) for index in range(sessions)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await prober
+    return summarize(results, elapsed, baseline, under_load)
+
+
+def summarize(results, elapsed, baseline, under_load):
+    outcomes = {}
+    for result in results:
+        outcomes[result.outcome] = outcomes.get(result.outcome, 0) + 1
+    completed = [result for result in results if result.outcome == "ok"]
+    ttfbs = [result.ttfb for result in results if result.ttfb is not None]
+    tokens = sum(result.tokens for result in results)
+    rates = [result.tokens / result.duration for result in completed if result.duration]
+    return {
+        "sessions": len(results),
+        "elapsed": elapsed,
+        "outcomes": outcomes,
+        "ttfb_p50": percentile(ttfbs, 50),
+        "ttfb_p95": percentile(ttfbs, 95),
+        "tokens": tokens,
+        "tokens_per_second": tokens / elapsed if elapsed else 0.0,
+        "stream_tokens_per_second_p50": percentile(rates, 50),
+        "probe_baseline_p50": percentile(baseline, 50),
+        "probe_load_p50": percentile(under_load, 50),
+        "probe_load_p95": percentile(under_load, 95),
+    }
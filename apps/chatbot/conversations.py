@@ -0,0 +1,39 @@
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.chatbot.models import Conversation
+
+CONVERSATION_TTL = timedelta(hours=24)
+MAX_TURNS = 20
+
+
+def parse_conversation_id(value):
+    try:
+        return uuid.UUID(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_turns(conversation_id):
+    turns = (
+        Conversation.objects.filter(pk=conversation_id, updated_at__gte=timezone.now() - CONVERSATION_TTL)
+        .values_list("turns", flat=True)
+        .first()
+    )
+    return turns or []
+
+
+def append_turns(conversation_id, *turns):
+    with transaction.atomic():
+        conversation, _ = Conversation.objects.select_for_update().get_or_create(pk=conversation_id)
+        if conversation.updated_at and conversation.updated_at < timezone.now() - CONVERSATION_TTL:
+            conversation.turns = []
+        conversation.turns = [*conversation.turns, *turns][-MAX_TURNS:]
+        conversation.save()
+
+
+def expired_conversations():
+    return Conversation.objects.filter(updated_at__lt=timezone.now() - CONVERSATION_TTL)
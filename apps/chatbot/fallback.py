@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import F, FloatField, Func, Q, Value
+from django.urls import reverse
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from apps.chatbot.answers import normalize_question
+from apps.chatbot.retrieval import search_query
+
+FALLBACK_MIN_SCORE = 0.3
+MIN_TERM_LENGTH = 4
+CONTACT_LINE = "Pour plus de precisions, contactez-nous a info@mygeoconsulting.com ou au +227 90 53 53 23."
+
+
+@dataclass
+class LocalAnswer:
+    score: float
+    text: str
+
+
+def _terms(text):
+    return {term for term in normalize_question(text).split() if len(term) >= MIN_TERM_LENGTH}
+
+
+def _faq_answer(question):
+    from apps.core.models import FAQ
+
+    query = search_query(question)
+    match = Q(question__trigram_word_similar=question)
+    if query is not None:
+        match |= Q(search_vector=query)
+    faq = (
+        FAQ.objects.filter(match, published=True)
+        .annotate(score=TrigramWordSimilarity(question, "question"))
+        .order_by("-score")
+        .only("answer", "answer_html")
+        .first()
+    )
+    if faq is None:
+        return None
+    return LocalAnswer(faq.score, strip_tags(faq.answer_html).strip() or faq.answer)
+
+
+def _project_answer(question):
+    from apps.projects.models import Project
+
+    query = search_query(question)
+    if query is None:
+        return None
+    project = (
+        Project.objects.filter(published=True, search_vector=query)
+        .annotate(score=Func(F("title"), Value(question), function="word_similarity", output_field=FloatField()))
+        .order_by("-score")
+        .only("title", "slug", "location", "year", "description")
+        .first()
+    )
+    if project is None:
+        return None
+    place = ", ".join(str(part) for part in (project.location, project.year) if part)
+    title = f"« {project.title} »" + (f" ({place})" if place else "")
+    description = Truncator(project.description).words(40)
+    text = f"Nous avons realise le projet {title}. {description}\nDetails : {project.get_absolute_url()}"
+    return LocalAnswer(project.score, text)
+
+
+def _service_answer(question):
+    from apps.core.views import SERVICES
+
+    terms = _terms(question)
+    if not terms:
+        return None
+    best = None
+    for service in SERVICES:
+        score = len(terms & _terms(" ".join([service["name"], service["short"], *service["items"]]))) / len(terms)
+        if score and (best is None or score > best[0]):
+            best = (score, service)
+    if best is None:
+        return None
+    score, service = best
+    url = reverse("service_detail", kwargs={"slug": service["slug"]})
+    items = "; ".join(service["items"])
+    return LocalAnswer(score, f"{service['name']} : {service['short']}\nNos prestations : {items}.\nDetails : {url}")
+
+
+def find_local_answer(question, min_score=FALLBACK_MIN_SCORE):
+    candidates = [
+        answer for answer in (_faq_answer(question), _service_answer(question), _project_answer(question)) if answer
+    ]
+    best = max(candidates, key=lambda answer: answer.score, default=None)
+    if best is None or best.score < min_score:
+        return None
+    return LocalAnswer(best.score, f"{best.text}\n\n{CONTACT_LINE}")
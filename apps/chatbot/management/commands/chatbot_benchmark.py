@@ -0,0 +1,54 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from apps.chatbot.benchmark import run_benchmark
+
+
+def seconds(value):
+    return "-" if value is None else f"{value * 1000:.0f} ms"
+
+
+class Command(BaseCommand):
+    help = "Drive concurrent chatbot SSE sessions against a running server and report latency and throughput"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/", help="Base URL of the running site")
+        parser.add_argument("--sessions", type=int, default=50, help="Total chat sessions to run")
+        parser.add_argument("--concurrency", type=int, default=10, help="Sessions streaming at the same time")
+        parser.add_argument("--message", default="Quels services proposez-vous ?")
+        parser.add_argument("--timeout", type=float, default=60, help="Per-request read timeout in seconds")
+        parser.add_argument(
+            "--same-message",
+            action="store_true",
+            help="Send the identical question every time to exercise the answer cache",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['sessions']} sessions, {options['concurrency']} concurrent, against {options['url']}"
+        )
+        report = asyncio.run(
+            run_benchmark(
+                options["url"],
+                options["sessions"],
+                options["concurrency"],
+                options["message"],
+                options["timeout"],
+                unique=not options["same_message"],
+            )
+        )
+        outcomes = ", ".join(f"{name}={count}" for name, count in sorted(report["outcomes"].items()))
+        self.stdout.write(f"Outcomes: {outcomes} in {report['elapsed']:.1f}s")
+        self.stdout.write(f"Time to first byte: p50 {seconds(report['ttfb_p50'])}, p95 {seconds(report['ttfb_p95'])}")
+        stream_rate = report["stream_tokens_per_second_p50"] or 0
+        self.stdout.write(
+            f"Tokens: {report['tokens']} ({report['tokens_per_second']:.1f}/s overall, {stream_rate:.1f}/s per stream)"
+        )
+        self.stdout.write(
+            f"Worker saturation (/healthz/): idle p50 {seconds(report['probe_baseline_p50'])}, "
+            f"under load p50 {seconds(report['probe_load_p50'])}, p95 {seconds(report['probe_load_p95'])}"
+        )
+        dropped = report["outcomes"].get("dropped", 0) + report["outcomes"].get("error_event", 0)
+        style = self.style.SUCCESS if not dropped else self.style.WARNING
+        self.stdout.write(style(f"Dropped streams: {dropped}"))
@@ -0,0 +1,31 @@
+import uvicorn
+from django.core.management.base import BaseCommand
+
+from apps.chatbot.stub import StubConfig, StubOpenAI
+
+
+class Command(BaseCommand):
+    help = "Serve an OpenAI-compatible streaming stub for load testing the chatbot"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8001)
+        parser.add_argument("--ttft", type=float, default=0.5, help="Seconds before the first token")
+        parser.add_argument("--tokens-per-second", type=float, default=30, help="Streaming rate per response")
+        parser.add_argument("--tokens", type=int, default=150, help="Tokens per response")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500")
+        parser.add_argument("--stall-rate", type=float, default=0.0, help="Share of streams that stall mid-answer")
+        parser.add_argument("--stall-seconds", type=float, default=60, help="How long a stalled stream hangs")
+
+    def handle(self, *args, **options):
+        config = StubConfig(
+            ttft=options["ttft"],
+            tokens_per_second=options["tokens_per_second"],
+            tokens=options["tokens"],
+            error_rate=options["error_rate"],
+            stall_rate=options["stall_rate"],
+            stall_seconds=options["stall_seconds"],
+        )
+        base_url = f"http://{options['host']}:{options['port']}/v1"
+        self.stdout.write(f"Stub {config}; set OPENAI_BASE_URL={base_url}")
+        uvicorn.run(StubOpenAI(config), host=options["host"], port=options["port"], lifespan="off", log_level="warning")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.chatbot.conversations import expired_conversations
+
+
+class Command(BaseCommand):
+    help = "Delete chatbot conversations idle for longer than the retention window"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        expired = expired_conversations()
+        if options["dry_run"]:
+            count = expired.count()
+        else:
+            count, _ = expired.delete()
+        self.stdout.write(self.style.SUCCESS(f"Expired conversations: {count}"))
@@ -1,4 +1,9 @@
 from apps.chatbot.services import fetch_company_stats
+from apps.core.cache import get_or_set_tagged
+
+SYSTEM_PROMPT_CACHE_KEY = "chatbot:system-prompt"
+SYSTEM_PROMPT_TAGS = ("project-list", "article-list")
+SYSTEM_PROMPT_TIMEOUT = 60 * 60
 
 SYSTEM_PROMPT_TEMPLATE = """\
 Tu es l'assistant virtuel de GeoConsulting SARLU, un bureau d'etudes geotechniques \
@@ -38,6 +43,10 @@ l'utilisateur a contacter l'equipe via la page de contact ou par email.\
 
 
 def build_system_prompt():
+    return get_or_set_tagged(SYSTEM_PROMPT_CACHE_KEY, SYSTEM_PROMPT_TAGS, render_system_prompt, SYSTEM_PROMPT_TIMEOUT)
+
+
+def render_system_prompt():
     stats = fetch_company_stats()
     categories_summary = ", ".join(
         f"{name} ({count})" for name, count in stats["categories"].items()
@@ -0,0 +1,99 @@
+import hashlib
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.utils.text import Truncator
+
+from apps.chatbot.answers import normalize_question
+from apps.core.cache import get_or_set_tagged
+
+TOP_K = 3
+CONTEXT_TOKEN_BUDGET = 600
+HISTORY_TOKEN_BUDGET = 1500
+SNIPPET_WORDS = 60
+MIN_TERM_LENGTH = 3
+CONTEXT_TAGS = ("project-list", "article-list", "faq")
+CONTEXT_TIMEOUT = 60 * 60
+
+CONTEXT_HEADER = "Informations du site pertinentes pour la question :"
+
+
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+
+def search_query(question):
+    terms = [term for term in re.findall(r"\w+", question) if len(term) >= MIN_TERM_LENGTH]
+    if not terms:
+        return None
+    return SearchQuery(" or ".join(terms), config="french", search_type="websearch")
+
+
+def _ranked(queryset, query):
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(rank=SearchRank("search_vector", query))
+        .order_by("-rank")[:TOP_K]
+    )
+
+
+def _truncate(text):
+    return Truncator(" ".join(text.split())).words(SNIPPET_WORDS)
+
+
+def find_snippets(question):
+    from apps.articles.models import Article
+    from apps.core.models import FAQ
+    from apps.projects.models import Project
+
+    query = search_query(question)
+    if query is None:
+        return []
+
+    snippets = []
+    projects = _ranked(Project.objects.filter(published=True), query).only(
+        "title", "location", "year", "description", "category"
+    )
+    for project in projects:
+        place = ", ".join(str(part) for part in (project.location, project.year) if part)
+        title = f"{project.title} ({place})" if place else project.title
+        description = _truncate(project.description)
+        snippets.append((project.rank, f"Projet {project.get_category_display()} : {title}. {description}"))
+    for article in _ranked(Article.objects.filter(published=True), query).only("title", "excerpt"):
+        snippets.append((article.rank, f"Article : {article.title}. {_truncate(article.excerpt)}"))
+    for faq in _ranked(FAQ.objects.filter(published=True), query).only("question", "answer"):
+        snippets.append((faq.rank, f"FAQ : {faq.question} {_truncate(faq.answer)}"))
+
+    snippets.sort(key=lambda snippet: snippet[0], reverse=True)
+    return [text for _, text in snippets]
+
+
+def build_context(question, budget=CONTEXT_TOKEN_BUDGET):
+    lines = []
+    used = estimate_tokens(CONTEXT_HEADER)
+    for snippet in find_snippets(question):
+        cost = estimate_tokens(snippet)
+        if used + cost > budget:
+            continue
+        lines.append(f"- {snippet}")
+        used += cost
+    if not lines:
+        return ""
+    return "\n".join([CONTEXT_HEADER, *lines])
+
+
+def retrieve_context(question):
+    digest = hashlib.sha256(normalize_question(question).encode()).hexdigest()
+    return get_or_set_tagged(f"chatbot:context:{digest}", CONTEXT_TAGS, lambda: build_context(question), CONTEXT_TIMEOUT)
+
+
+def trim_history(turns, budget=HISTORY_TOKEN_BUDGET):
+    kept = []
+    used = 0
+    for turn in reversed(turns):
+        used += estimate_tokens(turn["content"])
+        if used > budget:
+            break
+        kept.append(turn)
+    kept.reverse()
+    return kept
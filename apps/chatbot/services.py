@@ -1,35 +1,104 @@
+import asyncio
+import random
 import time
 
 from django.conf import settings
-from openai import OpenAI
+from django.core.cache import cache
+from django.db.models import Count, Q
+from openai import AsyncOpenAI, OpenAI
+
+FAILURE_THRESHOLD = 5
+OPEN_SECONDS = 300
+PROBE_TIMEOUT = 30
+STREAM_SLOT_REFRESH = 30
+STREAM_SLOT_POLL = 0.25
+STREAM_SLOT_MAX_POLL = 2
+
+FAILURES_KEY = "chatbot:breaker:failures"
+OPEN_UNTIL_KEY = "chatbot:breaker:open-until"
+PROBE_KEY = "chatbot:breaker:probe"
+STREAM_SLOT_KEY = "chatbot:stream-slot:{}"
 
 _client = None
-_failure_count = 0
-_disabled_until = 0
+_async_client = None
+_slot_refreshed: dict[str, float] = {}
 
 
 def get_openai_client():
     global _client
     if _client is None:
         api_key = getattr(settings, "OPENAI_API_KEY", "")
-        _client = OpenAI(api_key=api_key)
+        _client = OpenAI(api_key=api_key, base_url=getattr(settings, "OPENAI_BASE_URL", None))
     return _client
 
 
+def get_async_openai_client():
+    global _async_client
+    if _async_client is None:
+        api_key = getattr(settings, "OPENAI_API_KEY", "")
+        _async_client = AsyncOpenAI(api_key=api_key, base_url=getattr(settings, "OPENAI_BASE_URL", None))
+    return _async_client
+
+
 def is_circuit_open():
-    return time.time() < _disabled_until
+    open_until = cache.get(OPEN_UNTIL_KEY)
+    if open_until is None:
+        return False
+    if time.time() < open_until:
+        return True
+    return not cache.add(PROBE_KEY, True, PROBE_TIMEOUT)
 
 
 def record_failure():
-    global _failure_count, _disabled_until
-    _failure_count += 1
-    if _failure_count >= 5:
-        _disabled_until = time.time() + 300
+    cache.add(FAILURES_KEY, 0, None)
+    try:
+        failures = cache.incr(FAILURES_KEY)
+    except ValueError:
+        failures = 1
+    if failures >= FAILURE_THRESHOLD:
+        cache.set(OPEN_UNTIL_KEY, time.time() + OPEN_SECONDS, None)
+        cache.delete(PROBE_KEY)
 
 
 def record_success():
-    global _failure_count
-    _failure_count = 0
+    if cache.get(FAILURES_KEY) or cache.get(OPEN_UNTIL_KEY) is not None:
+        cache.delete_many([FAILURES_KEY, OPEN_UNTIL_KEY, PROBE_KEY])
+
+
+def stream_slot_timeout():
+    return settings.CHATBOT_UPSTREAM_TIMEOUT + 2 * STREAM_SLOT_REFRESH
+
+
+async def acquire_stream_slot():
+    keys = [STREAM_SLOT_KEY.format(index) for index in range(settings.CHATBOT_MAX_STREAMS)]
+    deadline = time.monotonic() + settings.CHATBOT_QUEUE_TIMEOUT
+    delay = STREAM_SLOT_POLL
+    while True:
+        # One read per round; writes are only attempted on slots that looked free.
+        taken = await cache.aget_many(keys)
+        free = [key for key in keys if key not in taken]
+        random.shuffle(free)
+        for key in free:
+            if await cache.aadd(key, True, stream_slot_timeout()):
+                _slot_refreshed[key] = time.monotonic()
+                return key
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        await asyncio.sleep(min(random.uniform(delay / 2, delay), remaining))
+        delay = min(delay * 2, STREAM_SLOT_MAX_POLL)
+
+
+async def keep_stream_slot(key):
+    now = time.monotonic()
+    if now - _slot_refreshed.get(key, now) >= STREAM_SLOT_REFRESH:
+        await cache.atouch(key, stream_slot_timeout())
+        _slot_refreshed[key] = now
+
+
+async def release_stream_slot(key):
+    _slot_refreshed.pop(key, None)
+    await cache.adelete(key)
 
 
 def fetch_company_stats():
@@ -37,13 +106,12 @@ def fetch_company_stats():
     from apps.core.enums import ProjectCategory
     from apps.projects.models import Project
 
-    stats = {
-        "project_count": int(Project.objects.filter(published=True).count()),
-        "article_count": int(Article.objects.filter(published=True).count()),
-        "categories": {},
+    counts = Project.objects.filter(published=True).aggregate(
+        project_count=Count("pk"),
+        **{cat.name: Count("pk", filter=Q(category=cat.value)) for cat in ProjectCategory},
+    )
+    return {
+        "project_count": counts["project_count"],
+        "article_count": Article.objects.filter(published=True).count(),
+        "categories": {cat.label: counts[cat.name] for cat in ProjectCategory},
     }
-    for cat in ProjectCategory:
-        stats["categories"][cat.label] = int(
-            Project.objects.filter(published=True, category=cat.value).count()
-        )
-    return stats
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+
+STUB_WORDS = (
+    "GEOCONSULTING",
+    "realise",
+    "des",
+    "etudes",
+    "techniques",
+    "le",
+    "suivi",
+    "et",
+    "controle",
+    "de",
+    "travaux",
+    "routiers",
+    "au",
+    "Niger",
+)
+
+
+@dataclass
+class StubConfig:
+    ttft: float = 0.5
+    tokens_per_second: float = 30
+    tokens: int = 150
+    error_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_seconds: float = 60
+
+
+def completion_chunk(completion_id, model, delta, finish_reason=None):
+    return {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+class StubOpenAI:
+    """ASGI app answering /v1/chat/completions with synthetic streamed tokens."""
+
+    def __init__(self, config=None):
+        self.config = config or StubConfig()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        if scope["method"] != "POST" or not scope["path"].endswith("/chat/completions"):
+            await self.send_json(send, 404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+        request = json.loads(body or b"{}")
+
+        config = self.config
+        if random.random() < config.error_rate:
+            await self.send_json(send, 500, {"error": {"message": "Injected stub error", "type": "server_error"}})
+            return
+
+        await asyncio.sleep(config.ttft)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache")],
+            }
+        )
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+        model = request.get("model", "stub")
+        tokens = min(config.tokens, request.get("max_tokens") or config.tokens)
+        stall_at = random.randrange(tokens) if tokens and random.random() < config.stall_rate else None
+        delay = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+
+        await self.send_chunk(send, completion_chunk(completion_id, model, {"role": "assistant", "content": ""}))
+        for index in range(tokens):
+            if index == stall_at:
+                await asyncio.sleep(config.stall_seconds)
+            word = STUB_WORDS[index % len(STUB_WORDS)]
+            await self.send_chunk(send, completion_chunk(completion_id, model, {"content": f"{word} "}))
+            await asyncio.sleep(delay)
+        await self.send_chunk(send, completion_chunk(completion_id, model, {}, "stop"))
+        await send({"type": "http.response.body", "body": b"data: [DONE]\n\n", "more_body": False})
+
+    async def send_chunk(self, send, chunk):
+        await send({"type": "http.response.body", "body": f"data: {json.dumps(chunk)}\n\n".encode(), "more_body": True})
+
+    async def send_json(self, send, status, payload):
+        headers = [(b"content-type", b"application/json")]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": json.dumps(payload).encode()})
@@ -0,0 +1,74 @@
+import asyncio
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+
+from apps.chatbot.answers import (
+    Flight,
+    answer_cache_key,
+    end_flight,
+    get_flight,
+    normalize_question,
+    prior_turns,
+    start_flight,
+)
+
+
+class TestNormalizeQuestion:
+    def test_ignores_case_accents_and_punctuation(self):
+        assert normalize_question("  Quels SERVICES proposez-vous ? ") == "quels services proposez vous"
+        assert normalize_question("Électricité") == normalize_question("electricite")
+
+    def test_cache_key_depends_on_prompt_version(self):
+        assert answer_cache_key("Devis ?", "a") == answer_cache_key("devis", "a")
+        assert answer_cache_key("devis", "a") != answer_cache_key("devis", "b")
+
+
+class TestPriorTurns:
+    def test_greeting_and_echoed_question_ignored(self):
+        history = [
+            {"role": "assistant", "content": "Bonjour !"},
+            {"role": "user", "content": "Devis ?"},
+        ]
+        assert prior_turns(history, "Devis ?") == []
+
+    def test_earlier_user_turns_kept(self):
+        history = [{"role": "user", "content": "Bonjour"}, {"role": "assistant", "content": "Salut"}]
+        assert prior_turns(history, "Devis ?") == history
+
+
+class TestFlight:
+    def test_followers_receive_every_event(self):
+        flight = Flight()
+
+        async def lead():
+            for event in ("a", "b"):
+                await asyncio.sleep(0.01)
+                flight.publish(event)
+            flight.finish("done")
+
+        async def follow():
+            return [event async for event in flight.follow()]
+
+        async def run():
+            return await asyncio.gather(follow(), follow(), lead())
+
+        first, second, _ = async_to_sync(run)()
+        assert first == second == ["a", "b", "done"]
+
+    def test_end_flight_unregisters(self):
+        flight = start_flight("k")
+        assert get_flight("k") is flight
+        end_flight("k", flight)
+        assert get_flight("k") is None
+        assert flight.done
+
+    @patch("apps.chatbot.answers.FLIGHT_IDLE_TIMEOUT", -1)
+    def test_stale_flight_abandoned(self):
+        flight = start_flight("k")
+
+        async def follow():
+            return [event async for event in flight.follow("error")]
+
+        assert async_to_sync(follow)() == ["error"]
+        assert get_flight("k") is None
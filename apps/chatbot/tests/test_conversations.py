@@ -0,0 +1,51 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.chatbot import conversations
+from apps.chatbot.conversations import append_turns, load_turns, parse_conversation_id
+from apps.chatbot.models import Conversation
+
+
+def turn(role, content):
+    return {"role": role, "content": content}
+
+
+class TestParseConversationId:
+    def test_rejects_garbage(self):
+        assert parse_conversation_id("not-a-uuid") is None
+        assert parse_conversation_id(None) is None
+
+
+@pytest.mark.django_db
+class TestConversationStore:
+    def test_append_creates_and_loads(self):
+        conversation_id = uuid.uuid4()
+        append_turns(conversation_id, turn("user", "Bonjour"), turn("assistant", "Salut"))
+        assert load_turns(conversation_id) == [turn("user", "Bonjour"), turn("assistant", "Salut")]
+
+    def test_keeps_latest_turns(self):
+        conversation_id = uuid.uuid4()
+        with patch.object(conversations, "MAX_TURNS", 2):
+            append_turns(conversation_id, turn("user", "1"), turn("assistant", "2"))
+            append_turns(conversation_id, turn("user", "3"), turn("assistant", "4"))
+        assert load_turns(conversation_id) == [turn("user", "3"), turn("assistant", "4")]
+
+    def test_expired_conversation_ignored(self):
+        conversation_id = uuid.uuid4()
+        append_turns(conversation_id, turn("user", "Bonjour"))
+        Conversation.objects.filter(pk=conversation_id).update(updated_at=timezone.now() - timedelta(days=2))
+        assert load_turns(conversation_id) == []
+
+    def test_purge_command(self):
+        append_turns(uuid.uuid4(), turn("user", "ancien"))
+        Conversation.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        append_turns(uuid.uuid4(), turn("user", "récent"))
+        call_command("purge_chatbot_conversations", "--dry-run")
+        assert Conversation.objects.count() == 2
+        call_command("purge_chatbot_conversations")
+        assert Conversation.objects.count() == 1
@@ -0,0 +1,31 @@
+import pytest
+
+from apps.chatbot.fallback import CONTACT_LINE, find_local_answer
+from apps.core.factories import FAQFactory
+from apps.projects.factories import ProjectFactory
+
+
+@pytest.mark.django_db
+class TestFindLocalAnswer:
+    def test_faq_match(self):
+        FAQFactory(question="Quels sont vos délais d'intervention ?", answer="Nous intervenons sous **48 heures**.")
+        answer = find_local_answer("Quels sont vos délais d'intervention ?")
+        assert answer.score == pytest.approx(1)
+        assert answer.text.startswith("Nous intervenons sous 48 heures.")
+        assert answer.text.endswith(CONTACT_LINE)
+
+    def test_unpublished_faq_ignored(self):
+        FAQFactory(question="Quels sont vos délais d'intervention ?", published=False)
+        assert find_local_answer("Quels sont vos délais d'intervention ?") is None
+
+    def test_service_match(self):
+        answer = find_local_answer("Faites-vous des essais de laboratoire sur le béton ?")
+        assert "/services/essai-laboratoire/" in answer.text
+
+    def test_project_match(self):
+        project = ProjectFactory(title="Barrage de Kandadji", published=True)
+        answer = find_local_answer("Barrage de Kandadji")
+        assert project.get_absolute_url() in answer.text
+
+    def test_no_match_returns_none(self):
+        assert find_local_answer("Bonjour") is None
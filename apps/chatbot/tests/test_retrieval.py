@@ -0,0 +1,45 @@
+import pytest
+
+from apps.chatbot.retrieval import build_context, find_snippets, search_query, trim_history
+from apps.core.factories import FAQFactory
+from apps.projects.factories import ProjectFactory
+
+
+class TestSearchQuery:
+    def test_short_words_only_returns_none(self):
+        assert search_query("et le ?") is None
+
+
+class TestTrimHistory:
+    def test_keeps_most_recent_turns_within_budget(self):
+        turns = [
+            {"role": "user", "content": "a" * 400},
+            {"role": "assistant", "content": "b" * 400},
+            {"role": "user", "content": "c" * 40},
+        ]
+        assert trim_history(turns, budget=120) == turns[1:]
+
+    def test_drops_everything_when_latest_turn_too_long(self):
+        assert trim_history([{"role": "user", "content": "a" * 4000}], budget=100) == []
+
+
+@pytest.mark.django_db
+class TestFindSnippets:
+    def test_matches_projects_and_faqs(self):
+        ProjectFactory(title="Route Niamey-Tillabéri", location="Tillabéri", published=True)
+        ProjectFactory(title="Barrage de Kandadji", description="Ouvrage hydraulique.", published=True)
+        FAQFactory(question="Réalisez-vous des études de routes ?", answer="Oui, sur tout le territoire.")
+        snippets = find_snippets("Quels projets de route avez-vous ?")
+        assert any("Route Niamey-Tillabéri" in snippet for snippet in snippets)
+        assert any(snippet.startswith("FAQ") for snippet in snippets)
+        assert not any("Kandadji" in snippet for snippet in snippets)
+
+    def test_unpublished_excluded(self):
+        ProjectFactory(title="Route secrète", published=False)
+        assert find_snippets("route") == []
+
+    def test_context_respects_budget(self):
+        for i in range(3):
+            ProjectFactory(title=f"Route {i}", description="route " * 200, published=True)
+        context = build_context("route", budget=120)
+        assert context.count("\n- ") == 1
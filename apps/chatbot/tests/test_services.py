@@ -1,19 +1,11 @@
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from asgiref.sync import async_to_sync
 
 from apps.chatbot import services
 
 
-@pytest.fixture(autouse=True)
-def reset_circuit():
-    services._failure_count = 0
-    services._disabled_until = 0
-    yield
-    services._failure_count = 0
-    services._disabled_until = 0
-
-
 class TestCircuitBreaker:
     def test_initially_closed(self):
         assert services.is_circuit_open() is False
@@ -44,6 +36,68 @@ class TestCircuitBreaker:
         mock_time.time.return_value = 1301.0
         assert services.is_circuit_open() is False
 
+    @patch("apps.chatbot.services.time")
+    def test_half_open_allows_single_probe(self, mock_time):
+        mock_time.time.return_value = 1000.0
+        for _ in range(5):
+            services.record_failure()
+        mock_time.time.return_value = 1301.0
+        assert services.is_circuit_open() is False
+        assert services.is_circuit_open() is True
+
+    @patch("apps.chatbot.services.time")
+    def test_failed_probe_reopens(self, mock_time):
+        mock_time.time.return_value = 1000.0
+        for _ in range(5):
+            services.record_failure()
+        mock_time.time.return_value = 1301.0
+        assert services.is_circuit_open() is False
+        services.record_failure()
+        assert services.is_circuit_open() is True
+        mock_time.time.return_value = 1602.0
+        assert services.is_circuit_open() is False
+
+    @patch("apps.chatbot.services.time")
+    def test_successful_probe_closes(self, mock_time):
+        mock_time.time.return_value = 1000.0
+        for _ in range(5):
+            services.record_failure()
+        mock_time.time.return_value = 1301.0
+        assert services.is_circuit_open() is False
+        services.record_success()
+        assert services.is_circuit_open() is False
+        assert services.is_circuit_open() is False
+
+
+class TestStreamSlots:
+    def test_limits_concurrent_streams(self, settings):
+        settings.CHATBOT_MAX_STREAMS = 2
+        settings.CHATBOT_QUEUE_TIMEOUT = 0
+        first = async_to_sync(services.acquire_stream_slot)()
+        second = async_to_sync(services.acquire_stream_slot)()
+        assert {first, second} == {"chatbot:stream-slot:0", "chatbot:stream-slot:1"}
+        assert async_to_sync(services.acquire_stream_slot)() is None
+
+    def test_released_slot_reusable(self, settings):
+        settings.CHATBOT_MAX_STREAMS = 1
+        settings.CHATBOT_QUEUE_TIMEOUT = 0
+        slot = async_to_sync(services.acquire_stream_slot)()
+        async_to_sync(services.release_stream_slot)(slot)
+        assert async_to_sync(services.acquire_stream_slot)() == slot
+
+    def test_slot_refreshed_while_streaming(self, settings):
+        settings.CHATBOT_MAX_STREAMS = 1
+        settings.CHATBOT_QUEUE_TIMEOUT = 0
+        slot = async_to_sync(services.acquire_stream_slot)()
+        with patch("apps.chatbot.services.cache") as mock_cache:
+            mock_cache.atouch = AsyncMock()
+            async_to_sync(services.keep_stream_slot)(slot)
+            mock_cache.atouch.assert_not_awaited()
+            services._slot_refreshed[slot] -= services.STREAM_SLOT_REFRESH
+            async_to_sync(services.keep_stream_slot)(slot)
+        mock_cache.atouch.assert_awaited_once_with(slot, services.stream_slot_timeout())
+        async_to_sync(services.release_stream_slot)(slot)
+
 
 class TestGetOpenAIClient:
     def setup_method(self):
@@ -56,9 +110,15 @@ class TestGetOpenAIClient:
     def test_creates_client_on_first_call(self, mock_openai, settings):
         settings.OPENAI_API_KEY = "test-key"
         client = services.get_openai_client()
-        mock_openai.assert_called_once_with(api_key="test-key")
+        mock_openai.assert_called_once_with(api_key="test-key", base_url=None)
         assert client is mock_openai.return_value
 
+    @patch("apps.chatbot.services.OpenAI")
+    def test_base_url_from_settings(self, mock_openai, settings):
+        settings.OPENAI_BASE_URL = "http://127.0.0.1:8001/v1"
+        services.get_openai_client()
+        assert mock_openai.call_args.kwargs["base_url"] == "http://127.0.0.1:8001/v1"
+
     @patch("apps.chatbot.services.OpenAI")
     def test_reuses_cached_client(self, mock_openai, settings):
         settings.OPENAI_API_KEY = "test-key"
@@ -81,3 +141,21 @@ class TestFetchCompanyStats:
         assert stats["article_count"] == 1
         assert isinstance(stats["categories"], dict)
         assert len(stats["categories"]) > 0
+
+    def test_counts_in_two_queries(self, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            services.fetch_company_stats()
+
+
+@pytest.mark.django_db
+class TestBuildSystemPrompt:
+    def test_memoized_until_projects_change(self, django_assert_num_queries, django_capture_on_commit_callbacks):
+        from apps.chatbot.prompt import build_system_prompt
+        from apps.projects.factories import ProjectFactory
+
+        assert "- 0 projets realises" in build_system_prompt()
+        with django_assert_num_queries(0):
+            build_system_prompt()
+        with django_capture_on_commit_callbacks(execute=True):
+            ProjectFactory()
+        assert "- 1 projets realises" in build_system_prompt()
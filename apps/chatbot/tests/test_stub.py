@@ -0,0 +1,66 @@
+import json
+
+import httpx
+from asgiref.sync import async_to_sync
+from openai import AsyncOpenAI, InternalServerError
+
+from apps.chatbot.benchmark import SessionResult, percentile, summarize
+from apps.chatbot.stub import StubConfig, StubOpenAI
+
+
+def stub_client(**config):
+    transport = httpx.ASGITransport(app=StubOpenAI(StubConfig(ttft=0, tokens_per_second=0, **config)))
+    return AsyncOpenAI(
+        api_key="stub",
+        base_url="http://stub/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=transport),
+    )
+
+
+async def collect(client):
+    stream = await client.chat.completions.create(
+        model="gpt-4o-mini", messages=[{"role": "user", "content": "Bonjour"}], stream=True
+    )
+    return [chunk.choices[0].delta.content async for chunk in stream]
+
+
+class TestStubOpenAI:
+    def test_streams_requested_tokens(self):
+        parts = async_to_sync(collect)(stub_client(tokens=3))
+        assert "".join(part for part in parts if part) == "GEOCONSULTING realise des "
+
+    def test_error_injection(self):
+        try:
+            async_to_sync(collect)(stub_client(error_rate=1))
+        except InternalServerError as exc:
+            assert json.loads(exc.response.text)["error"]["type"] == "server_error"
+        else:
+            raise AssertionError("expected an injected error")
+
+    def test_unknown_path_404(self):
+        async def get():
+            transport = httpx.ASGITransport(app=StubOpenAI())
+            async with httpx.AsyncClient(transport=transport, base_url="http://stub") as client:
+                return await client.get("/v1/models")
+
+        assert async_to_sync(get)().status_code == 404
+
+
+class TestSummarize:
+    def test_percentile(self):
+        assert percentile([], 50) is None
+        assert percentile([3, 1, 2, 4], 50) == 3
+
+    def test_counts_outcomes_and_tokens(self):
+        results = [
+            SessionResult("ok", 200, 0.1, 10, 2.0),
+            SessionResult("busy", 503),
+            SessionResult("dropped", 200, 0.3, 4, 5.0),
+        ]
+        report = summarize(results, 5.0, [0.01], [0.02, 0.04])
+        assert report["outcomes"] == {"ok": 1, "busy": 1, "dropped": 1}
+        assert report["tokens"] == 14
+        assert report["tokens_per_second"] == 2.8
+        assert report["stream_tokens_per_second_p50"] == 5.0
+        assert report["probe_load_p95"] == 0.04
@@ -1,20 +1,83 @@
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from asgiref.sync import async_to_sync
 from django.test import Client
 
+from apps.chatbot.answers import _flights
+from apps.chatbot.views import SSEEvents
+from apps.core.factories import FAQFactory
+
 CHATBOT_URL = "/api/chatbot/"
 
 
 @pytest.fixture(autouse=True)
-def reset_circuit():
-    from apps.chatbot import services
-    services._failure_count = 0
-    services._disabled_until = 0
+def clear_flights():
     yield
-    services._failure_count = 0
-    services._disabled_until = 0
+    _flights.clear()
+
+
+class FakeStream:
+    def __init__(self, chunks=(), error=None):
+        self.chunks = list(chunks)
+        self.error = error
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        if self.error:
+            raise self.error
+        for chunk in self.chunks:
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+def make_chunk(content):
+    choice = MagicMock()
+    choice.delta.content = content
+    chunk = MagicMock()
+    chunk.choices = [choice]
+    return chunk
+
+
+def mock_create(mock_client, stream):
+    mock_client.return_value.chat.completions.create = AsyncMock(return_value=stream)
+    return mock_client.return_value.chat.completions.create
+
+
+def read_stream(response):
+    async def consume():
+        return b"".join([part async for part in response.streaming_content])
+
+    return async_to_sync(consume)().decode()
+
+
+class TestSSEEvents:
+    async def events(self):
+        yield "data: [DONE]\n\n"
+
+    def test_cleanup_runs_when_closed_unread(self):
+        cleanup = AsyncMock()
+        events = SSEEvents(self.events(), cleanup)
+        events.close()
+        events.close()
+        cleanup.assert_awaited_once()
+
+    def test_cleanup_runs_once_after_iteration(self):
+        cleanup = AsyncMock()
+        events = SSEEvents(self.events(), cleanup)
+
+        async def consume():
+            return [event async for event in events]
+
+        assert async_to_sync(consume)() == ["data: [DONE]\n\n"]
+        events.close()
+        cleanup.assert_awaited_once()
 
 
 @pytest.mark.django_db
@@ -22,16 +85,10 @@ class TestChatbotView:
     def setup_method(self):
         self.client = Client()
 
-    @patch("apps.chatbot.views.get_openai_client")
+    @patch("apps.chatbot.views.get_async_openai_client")
     @patch("apps.chatbot.views.is_circuit_open", return_value=False)
     def test_valid_post_returns_sse(self, mock_circuit, mock_client):
-        mock_stream = MagicMock()
-        mock_choice = MagicMock()
-        mock_choice.delta.content = "Bonjour"
-        mock_chunk = MagicMock()
-        mock_chunk.choices = [mock_choice]
-        mock_stream.__iter__ = MagicMock(return_value=iter([mock_chunk]))
-        mock_client.return_value.chat.completions.create.return_value = mock_stream
+        mock_create(mock_client, FakeStream([make_chunk("Bonjour")]))
 
         response = self.client.post(
             CHATBOT_URL,
@@ -74,14 +131,56 @@ class TestChatbotView:
         )
         assert response.status_code == 503
 
+    @patch("apps.chatbot.views.acquire_stream_slot", new_callable=AsyncMock, return_value=None)
+    @patch("apps.chatbot.views.is_circuit_open", return_value=False)
+    def test_no_stream_slot_503(self, mock_circuit, mock_acquire):
+        response = self.client.post(
+            CHATBOT_URL,
+            json.dumps({"message": "Test"}),
+            content_type="application/json",
+        )
+        assert response.status_code == 503
+        assert response["Retry-After"] == "10"
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    @patch("apps.chatbot.views.is_circuit_open", return_value=False)
+    def test_stream_slot_released_after_streaming(self, mock_circuit, mock_client, settings):
+        settings.CHATBOT_MAX_STREAMS = 1
+        settings.CHATBOT_QUEUE_TIMEOUT = 0
+        mock_create(mock_client, FakeStream([make_chunk("Bonjour")]))
+        for i in range(2):
+            response = self.client.post(
+                CHATBOT_URL,
+                json.dumps({"message": f"Test {i}"}),
+                content_type="application/json",
+            )
+            assert response.status_code == 200
+            read_stream(response)
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    @patch("apps.chatbot.views.is_circuit_open", return_value=False)
+    def test_unread_response_releases_slot_and_flight(self, mock_circuit, mock_client, settings):
+        settings.CHATBOT_MAX_STREAMS = 1
+        settings.CHATBOT_QUEUE_TIMEOUT = 0
+        stream = FakeStream([make_chunk("Bonjour")])
+        mock_create(mock_client, stream)
+        response = self.client.post(CHATBOT_URL, json.dumps({"message": "Devis"}), content_type="application/json")
+        assert _flights
+        response.close()
+        assert stream.closed
+        assert not _flights
+        mock_create(mock_client, FakeStream([make_chunk("Oui")]))
+        response = self.client.post(CHATBOT_URL, json.dumps({"message": "Autre"}), content_type="application/json")
+        assert "Oui" in read_stream(response)
+
     def test_get_not_allowed(self):
         response = self.client.get(CHATBOT_URL)
         assert response.status_code == 405
 
-    @patch("apps.chatbot.views.get_openai_client")
+    @patch("apps.chatbot.views.get_async_openai_client")
     @patch("apps.chatbot.views.is_circuit_open", return_value=False)
     def test_openai_error_502(self, mock_circuit, mock_client):
-        mock_client.return_value.chat.completions.create.side_effect = Exception("API error")
+        mock_client.return_value.chat.completions.create = AsyncMock(side_effect=Exception("API error"))
         response = self.client.post(
             CHATBOT_URL,
             json.dumps({"message": "Test"}),
@@ -89,12 +188,10 @@ class TestChatbotView:
         )
         assert response.status_code == 502
 
-    @patch("apps.chatbot.views.get_openai_client")
+    @patch("apps.chatbot.views.get_async_openai_client")
     @patch("apps.chatbot.views.is_circuit_open", return_value=False)
     def test_history_non_list_ignored(self, mock_circuit, mock_client):
-        mock_stream = MagicMock()
-        mock_stream.__iter__ = MagicMock(return_value=iter([]))
-        mock_client.return_value.chat.completions.create.return_value = mock_stream
+        mock_create(mock_client, FakeStream())
         response = self.client.post(
             CHATBOT_URL,
             json.dumps({"message": "Test", "history": "not-a-list"}),
@@ -102,12 +199,10 @@ class TestChatbotView:
         )
         assert response.status_code == 200
 
-    @patch("apps.chatbot.views.get_openai_client")
+    @patch("apps.chatbot.views.get_async_openai_client")
     @patch("apps.chatbot.views.is_circuit_open", return_value=False)
     def test_history_entries_forwarded(self, mock_circuit, mock_client):
-        mock_stream = MagicMock()
-        mock_stream.__iter__ = MagicMock(return_value=iter([]))
-        mock_client.return_value.chat.completions.create.return_value = mock_stream
+        create = mock_create(mock_client, FakeStream())
         history = [
             {"role": "user", "content": "Bonjour"},
             {"role": "assistant", "content": "Salut"},
@@ -119,61 +214,191 @@ class TestChatbotView:
             content_type="application/json",
         )
         assert response.status_code == 200
-        call_args = mock_client.return_value.chat.completions.create.call_args
+        call_args = create.call_args
         messages = call_args[1]["messages"]
         roles = [m["role"] for m in messages]
         assert roles.count("user") == 2
         assert roles.count("assistant") == 1
 
-    @patch("apps.chatbot.views.get_openai_client")
+    @patch("apps.chatbot.views.get_async_openai_client")
     @patch("apps.chatbot.views.is_circuit_open", return_value=False)
     def test_streaming_body_content(self, mock_circuit, mock_client):
-        mock_choice = MagicMock()
-        mock_choice.delta.content = "Bonjour"
-        mock_chunk = MagicMock()
-        mock_chunk.choices = [mock_choice]
-        mock_stream = MagicMock()
-        mock_stream.__iter__ = MagicMock(return_value=iter([mock_chunk]))
-        mock_client.return_value.chat.completions.create.return_value = mock_stream
+        stream = FakeStream([make_chunk("Bonjour")])
+        mock_create(mock_client, stream)
         response = self.client.post(
             CHATBOT_URL,
             json.dumps({"message": "Test"}),
             content_type="application/json",
         )
-        content = b"".join(response.streaming_content).decode()
+        content = read_stream(response)
         assert "Bonjour" in content
         assert "[DONE]" in content
+        assert stream.closed
 
-    @patch("apps.chatbot.views.get_openai_client")
+    @patch("apps.chatbot.views.get_async_openai_client")
     @patch("apps.chatbot.views.is_circuit_open", return_value=False)
     def test_streaming_error_yields_error_event(self, mock_circuit, mock_client):
-        mock_stream = MagicMock()
-        mock_stream.__iter__ = MagicMock(side_effect=Exception("stream fail"))
-        mock_client.return_value.chat.completions.create.return_value = mock_stream
+        mock_create(mock_client, FakeStream(error=Exception("stream fail")))
         response = self.client.post(
             CHATBOT_URL,
             json.dumps({"message": "Test"}),
             content_type="application/json",
         )
-        content = b"".join(response.streaming_content).decode()
+        content = read_stream(response)
         assert "error" in content
 
-    @patch("apps.chatbot.views.get_openai_client")
+    @patch("apps.chatbot.views.get_async_openai_client")
     @patch("apps.chatbot.views.is_circuit_open", return_value=False)
     def test_chunk_with_no_choices_skipped(self, mock_circuit, mock_client):
         mock_chunk_empty = MagicMock()
         mock_chunk_empty.choices = []
-        mock_choice = MagicMock()
-        mock_choice.delta.content = "OK"
-        mock_chunk_valid = MagicMock()
-        mock_chunk_valid.choices = [mock_choice]
-        mock_stream = MagicMock()
-        mock_stream.__iter__ = MagicMock(return_value=iter([mock_chunk_empty, mock_chunk_valid]))
-        mock_client.return_value.chat.completions.create.return_value = mock_stream
+        mock_create(mock_client, FakeStream([mock_chunk_empty, make_chunk("OK")]))
         response = self.client.post(
             CHATBOT_URL,
             json.dumps({"message": "Test"}),
             content_type="application/json",
         )
-        content = b"".join(response.streaming_content).decode()
+        content = read_stream(response)
         assert "OK" in content
+
+
+@pytest.mark.django_db
+class TestChatbotAnswerCache:
+    def setup_method(self):
+        self.client = Client()
+
+    def post(self, message, history=()):
+        return self.client.post(
+            CHATBOT_URL,
+            json.dumps({"message": message, "history": list(history)}),
+            content_type="application/json",
+        )
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_repeated_question_replayed_from_cache(self, mock_client):
+        create = mock_create(mock_client, FakeStream([make_chunk("Nous "), make_chunk("proposons...")]))
+        read_stream(self.post("Quels services ?"))
+        greeting = {"role": "assistant", "content": "Bonjour ! Comment puis-je vous aider ?"}
+        content = read_stream(self.post("quels services", [greeting, {"role": "user", "content": "quels services"}]))
+        assert create.call_count == 1
+        assert content == 'data: {"content": "Nous proposons..."}\n\ndata: [DONE]\n\n'
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_conversation_not_cached(self, mock_client):
+        create = mock_client.return_value.chat.completions.create = AsyncMock(
+            side_effect=lambda **kwargs: FakeStream([make_chunk("Oui")])
+        )
+        history = [{"role": "user", "content": "Bonjour"}, {"role": "assistant", "content": "Salut"}]
+        read_stream(self.post("Devis ?", history))
+        read_stream(self.post("Devis ?", history))
+        assert create.call_count == 2
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_failed_stream_not_cached(self, mock_client):
+        mock_create(mock_client, FakeStream(error=Exception("stream fail")))
+        read_stream(self.post("Devis"))
+        create = mock_create(mock_client, FakeStream([make_chunk("Oui")]))
+        assert "Oui" in read_stream(self.post("Devis"))
+        create.assert_called_once()
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_flight_claimed_before_local_lookup(self, mock_client):
+        mock_create(mock_client, FakeStream([make_chunk("Oui")]))
+        claimed = []
+        with patch("apps.chatbot.views.find_local_answer", side_effect=lambda text: claimed.append(bool(_flights))):
+            read_stream(self.post("Devis"))
+        assert claimed == [True]
+
+    @patch("apps.chatbot.views.is_circuit_open", return_value=True)
+    def test_early_return_ends_flight(self, mock_circuit):
+        assert self.post("Devis").status_code == 503
+        assert not _flights
+
+
+@pytest.mark.django_db
+class TestChatbotConversation:
+    def setup_method(self):
+        self.client = Client()
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_follow_up_uses_stored_turns(self, mock_client):
+        create = mock_client.return_value.chat.completions.create = AsyncMock(
+            side_effect=lambda **kwargs: FakeStream([make_chunk("Oui")])
+        )
+        response = self.client.post(CHATBOT_URL, json.dumps({"message": "Bonjour"}), content_type="application/json")
+        read_stream(response)
+        conversation_id = response["X-Conversation-Id"]
+
+        response = self.client.post(
+            CHATBOT_URL,
+            json.dumps({"message": "Et les devis ?"}),
+            content_type="application/json",
+            headers={"X-Conversation-Id": conversation_id},
+        )
+        read_stream(response)
+        assert response["X-Conversation-Id"] == conversation_id
+        messages = create.call_args.kwargs["messages"]
+        assert [m["content"] for m in messages[1:]] == ["Bonjour", "Oui", "Et les devis ?"]
+
+
+@pytest.mark.django_db
+class TestChatbotFallback:
+    def setup_method(self):
+        self.client = Client()
+        FAQFactory(question="Quels sont vos délais d'intervention ?", answer="Sous 48 heures.")
+
+    def post(self, message):
+        return self.client.post(CHATBOT_URL, json.dumps({"message": message}), content_type="application/json")
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_confident_local_answer_skips_upstream(self, mock_client):
+        create = mock_create(mock_client, FakeStream([make_chunk("Oui")]))
+        content = read_stream(self.post("Quels sont vos délais d'intervention ?"))
+        assert "Sous 48 heures." in content
+        assert content.endswith("data: [DONE]\n\n")
+        create.assert_not_called()
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_weak_local_answer_goes_upstream(self, mock_client, settings):
+        settings.CHATBOT_LOCAL_ANSWER_THRESHOLD = 1.1
+        create = mock_create(mock_client, FakeStream([make_chunk("Oui")]))
+        assert "Oui" in read_stream(self.post("Quels sont vos délais d'intervention ?"))
+        create.assert_called_once()
+
+    @patch("apps.chatbot.views.is_circuit_open", return_value=True)
+    def test_circuit_open_serves_local_answer(self, mock_circuit, settings):
+        settings.CHATBOT_LOCAL_ANSWER_THRESHOLD = 1.1
+        response = self.post("Vos délais d'intervention ?")
+        assert response.status_code == 200
+        assert "Sous 48 heures." in read_stream(response)
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_upstream_error_serves_local_answer(self, mock_client, settings):
+        settings.CHATBOT_LOCAL_ANSWER_THRESHOLD = 1.1
+        mock_client.return_value.chat.completions.create = AsyncMock(side_effect=Exception("API error"))
+        response = self.post("Vos délais d'intervention ?")
+        assert response.status_code == 200
+        assert "Sous 48 heures." in read_stream(response)
+
+    @patch("apps.chatbot.views.find_local_answer")
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_follow_up_skips_local_lookup(self, mock_client, mock_local):
+        mock_create(mock_client, FakeStream([make_chunk("Oui")]))
+        history = [{"role": "user", "content": "Bonjour"}, {"role": "assistant", "content": "Salut"}]
+        response = self.client.post(
+            CHATBOT_URL, json.dumps({"message": "Vos délais ?", "history": history}), content_type="application/json"
+        )
+        assert "Oui" in read_stream(response)
+        mock_local.assert_not_called()
+
+    @patch("apps.chatbot.views.get_async_openai_client")
+    def test_follow_up_upstream_error_serves_local_answer(self, mock_client):
+        mock_client.return_value.chat.completions.create = AsyncMock(side_effect=Exception("API error"))
+        history = [{"role": "user", "content": "Bonjour"}, {"role": "assistant", "content": "Salut"}]
+        response = self.client.post(
+            CHATBOT_URL,
+            json.dumps({"message": "Vos délais d'intervention ?", "history": history}),
+            content_type="application/json",
+        )
+        assert response.status_code == 200
+        assert "Sous 48 heures." in read_stream(response)
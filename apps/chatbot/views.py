@@ -1,28 +1,145 @@
+import asyncio
 import json
 import logging
+import uuid
 
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
 from django.http import JsonResponse, StreamingHttpResponse
-from django.utils.decorators import method_decorator
 from django.views import View
-from django_ratelimit.decorators import ratelimit
+from django_ratelimit.core import is_ratelimited
+from django_ratelimit.exceptions import Ratelimited
 
+from apps.chatbot.answers import (
+    ANSWER_CACHE_TIMEOUT,
+    answer_cache_key,
+    end_flight,
+    get_flight,
+    prior_turns,
+    prompt_version,
+    start_flight,
+)
+from apps.chatbot.conversations import append_turns, load_turns, parse_conversation_id
+from apps.chatbot.fallback import find_local_answer
 from apps.chatbot.prompt import build_system_prompt
+from apps.chatbot.retrieval import retrieve_context, trim_history
 from apps.chatbot.services import (
-    get_openai_client,
+    acquire_stream_slot,
+    get_async_openai_client,
     is_circuit_open,
+    keep_stream_slot,
     record_failure,
     record_success,
+    release_stream_slot,
 )
 
 logger = logging.getLogger(__name__)
 
 MAX_MESSAGE_LENGTH = 2000
 MAX_HISTORY_ENTRIES = 50
+RATE_LIMIT = "20/5m"
+
+
+def sse_event(payload):
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+DONE_EVENT = "data: [DONE]\n\n"
+STREAM_ERROR_EVENT = sse_event({"error": "Erreur pendant le streaming."})
+
+
+class SSEEvents:
+    """Runs cleanup when the stream ends, and also when the response is closed before it was read."""
+
+    def __init__(self, events, cleanup=None):
+        self.events = events
+        self.cleanup = cleanup
+        self.closed = False
+
+    def __aiter__(self):
+        return self.iterate()
+
+    async def iterate(self):
+        try:
+            async for event in self.events:
+                yield event
+        finally:
+            await self.aclose()
+
+    async def aclose(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self.events.aclose()
+        finally:
+            if self.cleanup is not None:
+                await self.cleanup()
+
+    def close(self):
+        if not self.closed:
+            async_to_sync(self.aclose)()
+
+
+def sse_response(events, conversation_id, user_message, cleanup=None):
+    response = StreamingHttpResponse(
+        SSEEvents(record_conversation(events, conversation_id, user_message), cleanup),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    response["X-Conversation-Id"] = str(conversation_id)
+    return response
+
+
+async def record_conversation(events, conversation_id, user_message):
+    parts = []
+    try:
+        async for event in events:
+            payload = event.removeprefix("data: ").strip()
+            if payload == "[DONE]":
+                await sync_to_async(append_turns)(
+                    conversation_id,
+                    {"role": "user", "content": user_message},
+                    {"role": "assistant", "content": "".join(parts)},
+                )
+            else:
+                parts.append(json.loads(payload).get("content", ""))
+            yield event
+    finally:
+        await events.aclose()
+
+
+def publish(flight, event):
+    if flight is not None:
+        flight.publish(event)
+    return event
+
+
+async def replay_answer(answer):
+    yield sse_event({"content": answer})
+    yield DONE_EVENT
+
+
+def finish_flight(cache_key, flight, answer=None):
+    if flight is None:
+        return
+    if answer is None:
+        end_flight(cache_key, flight, STREAM_ERROR_EVENT)
+        return
+    flight.publish(sse_event({"content": answer}))
+    end_flight(cache_key, flight, DONE_EVENT)
 
 
-@method_decorator(ratelimit(key="ip", rate="20/5m", method="POST", block=True), name="dispatch")
 class ChatbotView(View):
-    def post(self, request):
+    async def post(self, request):
+        limited = await sync_to_async(is_ratelimited)(
+            request, group="chatbot", key="ip", rate=RATE_LIMIT, method="POST", increment=True
+        )
+        if limited:
+            raise Ratelimited()
+
         try:
             body = json.loads(request.body)
         except (json.JSONDecodeError, ValueError):
@@ -38,60 +155,128 @@ class ChatbotView(View):
                 status=400,
             )
 
-        history = body.get("history", [])
-        if not isinstance(history, list):
-            history = []
-        history = history[:MAX_HISTORY_ENTRIES]
-
-        if is_circuit_open():
-            return JsonResponse(
-                {"error": "Le service est temporairement indisponible. Veuillez reessayer dans quelques minutes."},
-                status=503,
-            )
-
-        system_prompt = build_system_prompt()
-        messages = [{"role": "system", "content": system_prompt}]
+        conversation_id = parse_conversation_id(request.headers.get("X-Conversation-Id"))
+        if conversation_id is not None:
+            history = await sync_to_async(load_turns)(conversation_id)
+        else:
+            conversation_id = uuid.uuid4()
+            history = body.get("history", [])
+            if not isinstance(history, list):
+                history = []
+            history = history[:MAX_HISTORY_ENTRIES]
 
+        turns = []
         for entry in history:
             role = entry.get("role")
             content = entry.get("content", "")
             if role in ("user", "assistant") and content:
-                messages.append({"role": role, "content": content[:MAX_MESSAGE_LENGTH]})
+                turns.append({"role": role, "content": content[:MAX_MESSAGE_LENGTH]})
 
-        messages.append({"role": "user", "content": user_message})
+        system_prompt = await sync_to_async(build_system_prompt)()
+        context = await sync_to_async(retrieve_context)(user_message)
+        if context:
+            system_prompt = f"{system_prompt}\n\n{context}"
 
-        try:
-            client = get_openai_client()
-            stream = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                stream=True,
-                max_tokens=1024,
-                temperature=0.7,
+        turns = prior_turns(turns, user_message)
+        cache_key = flight = None
+        if not turns:
+            cache_key = answer_cache_key(user_message, prompt_version(system_prompt))
+            answer = await cache.aget(cache_key)
+            if answer is not None:
+                return sse_response(replay_answer(answer), conversation_id, user_message)
+            flight = get_flight(cache_key)
+            if flight is not None:
+                return sse_response(flight.follow(STREAM_ERROR_EVENT), conversation_id, user_message)
+            # Claimed before the next await so identical concurrent questions follow this stream.
+            flight = start_flight(cache_key)
+
+        # Follow-ups only need the local answer if upstream fails, so it is looked up lazily for them.
+        local_answer = None if turns else await sync_to_async(find_local_answer)(user_message)
+        if local_answer is not None and local_answer.score >= settings.CHATBOT_LOCAL_ANSWER_THRESHOLD:
+            finish_flight(cache_key, flight, local_answer.text)
+            return sse_response(replay_answer(local_answer.text), conversation_id, user_message)
+
+        async def unavailable(response):
+            answer = local_answer
+            if turns:
+                answer = await sync_to_async(find_local_answer)(user_message)
+            if answer is None:
+                finish_flight(cache_key, flight)
+                return response
+            finish_flight(cache_key, flight, answer.text)
+            return sse_response(replay_answer(answer.text), conversation_id, user_message)
+
+        if await sync_to_async(is_circuit_open)():
+            return await unavailable(
+                JsonResponse(
+                    {"error": "Le service est temporairement indisponible. Veuillez reessayer dans quelques minutes."},
+                    status=503,
+                )
             )
-            record_success()
-
-            def event_stream():
-                try:
-                    for chunk in stream:
-                        delta = chunk.choices[0].delta if chunk.choices else None
-                        if delta and delta.content:
-                            yield f"data: {json.dumps({'content': delta.content})}\n\n"
-                    yield "data: [DONE]\n\n"
-                except Exception:
-                    logger.exception("Streaming error")
-                    record_failure()
-                    yield f"data: {json.dumps({'error': 'Erreur pendant le streaming.'})}\n\n"
-
-            return StreamingHttpResponse(
-                event_stream(),
-                content_type="text/event-stream",
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            *trim_history(turns),
+            {"role": "user", "content": user_message},
+        ]
+
+        slot = await acquire_stream_slot()
+        if slot is None:
+            response = JsonResponse(
+                {"error": "Le service est tres sollicite. Veuillez reessayer dans quelques instants."},
+                status=503,
             )
+            response["Retry-After"] = "10"
+            return await unavailable(response)
 
+        try:
+            client = get_async_openai_client()
+            stream = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=messages,
+                    stream=True,
+                    max_tokens=1024,
+                    temperature=0.7,
+                ),
+                settings.CHATBOT_UPSTREAM_TIMEOUT,
+            )
+            await sync_to_async(record_success)()
         except Exception:
             logger.exception("OpenAI API error")
-            record_failure()
-            return JsonResponse(
-                {"error": "Erreur de communication avec le service IA."},
-                status=502,
+            await sync_to_async(record_failure)()
+            await release_stream_slot(slot)
+            return await unavailable(
+                JsonResponse(
+                    {"error": "Erreur de communication avec le service IA."},
+                    status=502,
+                )
             )
+
+        parts = []
+        last_event = None
+
+        async def event_stream():
+            nonlocal last_event
+            try:
+                async for chunk in stream:
+                    await keep_stream_slot(slot)
+                    delta = chunk.choices[0].delta if chunk.choices else None
+                    if delta and delta.content:
+                        parts.append(delta.content)
+                        yield publish(flight, sse_event({"content": delta.content}))
+                yield (last_event := publish(flight, DONE_EVENT))
+            except Exception:
+                logger.exception("Streaming error")
+                await sync_to_async(record_failure)()
+                yield (last_event := publish(flight, STREAM_ERROR_EVENT))
+
+        async def cleanup():
+            await stream.close()
+            await release_stream_slot(slot)
+            if flight is not None:
+                if last_event == DONE_EVENT:
+                    await cache.aset(cache_key, "".join(parts), ANSWER_CACHE_TIMEOUT)
+                end_flight(cache_key, flight, None if last_event else STREAM_ERROR_EVENT)
+
+        return sse_response(event_stream(), conversation_id, user_message, cleanup)
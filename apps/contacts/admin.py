@@ -1,11 +1,32 @@
 import csv
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.contrib.postgres.search import SearchRank
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db.models import F
 from django.http import HttpResponse
 from unfold.admin import ModelAdmin
 
 from apps.contacts.models import Contact, ContactAssignment
 from apps.core.enums import ContactStatus
+from apps.core.search import prefix_query
+
+
+def is_email(term):
+    try:
+        validate_email(term)
+    except ValidationError:
+        return False
+    return True
+
+
+class RankedChangeList(ChangeList):
+    def get_ordering(self, request, queryset):
+        if ORDER_VAR not in self.params and "search_rank" in queryset.query.annotations:
+            return ["-search_rank", "-pk"]
+        return super().get_ordering(request, queryset)
 
 
 @admin.action(description="Marquer comme lu")
@@ -62,11 +83,28 @@ class ContactAdmin(ModelAdmin):
     )
     list_filter = ("status", "read", "archived", "created_at")
     search_fields = ("name", "email", "subject", "message")
+    search_help_text = "Mots ou débuts de mots (nom, email, sujet, message), ou une adresse email exacte."
     readonly_fields = ("name", "email", "phone", "subject", "message", "created_at")
     actions = [mark_read, mark_in_progress, mark_resolved, archive_contacts, export_contacts_csv]
+    show_full_result_count = False
 
     def get_queryset(self, request):
-        return super().get_queryset(request).prefetch_related("assignments__assigned_to")
+        return super().get_queryset(request).defer("search_vector").prefetch_related("assignments__assigned_to")
+
+    def get_changelist(self, request, **kwargs):
+        return RankedChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if is_email(term):
+            return queryset.filter(email__iexact=term), False
+        query = prefix_query(term)
+        if query is None:
+            return queryset.none(), False
+        queryset = queryset.filter(search_vector=query).annotate(search_rank=SearchRank(F("search_vector"), query))
+        return queryset.order_by("-search_rank", "-pk"), False
 
     def changelist_view(self, request, extra_context=None):
         extra_context = extra_context or {}
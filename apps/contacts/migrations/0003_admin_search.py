@@ -0,0 +1,62 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:50
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contacts", "0002_fts_trigger"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                django.db.models.functions.text.Upper("email"),
+                name="contacts_contact_email_upper",
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION update_contact_search_vector()
+                RETURNS trigger AS $$
+                BEGIN
+                  NEW.search_vector :=
+                    to_tsvector('french', coalesce(NEW.name, '')) ||
+                    to_tsvector('simple', regexp_replace(coalesce(NEW.email, ''), '[@._-]+', ' ', 'g')) ||
+                    to_tsvector('french', coalesce(NEW.subject, '')) ||
+                    to_tsvector('french', coalesce(NEW.message, ''));
+                  RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                DROP TRIGGER IF EXISTS contact_search_update ON contacts_contact;
+                CREATE TRIGGER contact_search_update
+                  BEFORE INSERT OR UPDATE OF name, email, subject, message
+                  ON contacts_contact
+                  FOR EACH ROW EXECUTE FUNCTION update_contact_search_vector();
+
+                UPDATE contacts_contact SET email = email;
+            """,
+            reverse_sql="""
+                CREATE OR REPLACE FUNCTION update_contact_search_vector()
+                RETURNS trigger AS $$
+                BEGIN
+                  NEW.search_vector :=
+                    to_tsvector('french', coalesce(NEW.name, '')) ||
+                    to_tsvector('french', coalesce(NEW.subject, '')) ||
+                    to_tsvector('french', coalesce(NEW.message, ''));
+                  RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                DROP TRIGGER IF EXISTS contact_search_update ON contacts_contact;
+                CREATE TRIGGER contact_search_update
+                  BEFORE INSERT OR UPDATE OF name, subject, message
+                  ON contacts_contact
+                  FOR EACH ROW EXECUTE FUNCTION update_contact_search_vector();
+            """,
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.conf import settings
 from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 
 from apps.core.enums import ContactStatus
 
@@ -23,6 +24,7 @@ class Contact(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["status", "archived"]),
+            models.Index(Upper("email"), name="contacts_contact_email_upper"),
             GinIndex(fields=["search_vector"]),
         ]
 
@@ -0,0 +1,67 @@
+import pytest
+from django.urls import reverse
+
+from apps.contacts.admin import is_email
+from apps.contacts.factories import ContactFactory
+
+
+def test_is_email():
+    assert is_email("awa@example.com")
+    assert not is_email("awa example")
+
+
+@pytest.mark.django_db
+class TestContactAdminSearch:
+    url = reverse("admin:contacts_contact_changelist")
+
+    def results(self, admin_client, term, **params):
+        return list(admin_client.get(self.url, {"q": term, **params}).context["cl"].result_list)
+
+    def test_exact_email_fast_path(self, admin_client):
+        contact = ContactFactory(email="Awa.Diallo@example.com")
+        ContactFactory(email="awa@example.org")
+        assert self.results(admin_client, "awa.diallo@example.com") == [contact]
+
+    def test_prefix_match(self, admin_client):
+        contact = ContactFactory(subject="Devis pour un forage")
+        ContactFactory(subject="Recrutement")
+        assert self.results(admin_client, "fora") == [contact]
+
+    def test_email_parts_searchable(self, admin_client):
+        contact = ContactFactory(email="moussa@sahelbtp.ne")
+        ContactFactory(email="awa@example.com")
+        assert self.results(admin_client, "sahelbtp") == [contact]
+
+    def test_full_domain_searchable(self, admin_client):
+        contact = ContactFactory(email="moussa@sahel-btp.com")
+        ContactFactory(email="awa@sahel.ne")
+        assert self.results(admin_client, "sahel-btp.com") == [contact]
+
+    def test_dotted_local_part_searchable(self, admin_client):
+        contact = ContactFactory(name="Awa", email="awa.diallo@example.com")
+        ContactFactory(name="Awa", email="awa@example.com")
+        assert self.results(admin_client, "diallo") == [contact]
+
+    def test_ranked_by_relevance(self, admin_client):
+        passing = ContactFactory(subject="Question", message="Forage mentionné une fois.")
+        focused = ContactFactory(subject="Forage", message="Forage profond et forage pastoral.")
+        assert self.results(admin_client, "forage") == [focused, passing]
+
+    def test_explicit_ordering_wins(self, admin_client):
+        older = ContactFactory(subject="Forage", message="Forage forage.")
+        newer = ContactFactory(subject="Question", message="Un forage.")
+        assert self.results(admin_client, "forage", o="-7") == [newer, older]
+
+    def test_autocomplete_uses_full_text_search(self, admin_client):
+        contact = ContactFactory(name="Moussa Issoufou")
+        ContactFactory(name="Awa Diallo")
+        response = admin_client.get(
+            reverse("admin:autocomplete"),
+            {
+                "term": "issou",
+                "app_label": "contacts",
+                "model_name": "contactassignment",
+                "field_name": "contact",
+            },
+        )
+        assert [result["id"] for result in response.json()["results"]] == [str(contact.pk)]
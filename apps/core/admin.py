@@ -1,7 +1,8 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin
 
-from apps.core.models import FAQ, Department, Division, SiteSetting, TeamMember
+from apps.core.models import FAQ, Department, Division, SearchDocument, SiteSetting, TeamMember
+from apps.core.search import search_stats
 
 
 @admin.register(FAQ)
@@ -64,3 +65,24 @@ class TeamMemberAdmin(ModelAdmin):
     @admin.display(description="Nom complet")
     def full_name_display(self, obj):
         return obj.full_name
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(ModelAdmin):
+    list_display = ("title", "kind", "category", "published_at")
+    list_filter = ("kind",)
+    search_fields = ("title",)
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        extra_context["search_stats"] = search_stats()
+        return super().changelist_view(request, extra_context)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,72 @@
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from django.views.decorators.cache import cache_page
+from django.views.decorators.csrf import ensure_csrf_cookie
+
+TAG_KEY_PREFIX = "cache-tag:"
+
+
+def _tag_key(tag):
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def _new_version():
+    return int(time.time() * 1000)
+
+
+def tag_versions(tags):
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+def invalidate_tags(*tags):
+    for tag in set(tags):
+        key = _tag_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
+
+
+def invalidate_tags_on_commit(*tags):
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+def _resolve_tags(tags, request, args, kwargs):
+    return [tag(request, *args, **kwargs) if callable(tag) else tag for tag in tags]
+
+
+def cache_page_tagged(timeout, tags):
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                return view_func(request, *args, **kwargs)
+            resolved = _resolve_tags(tags, request, args, kwargs)
+            key_prefix = f"tagged.{tag_versions(resolved)}"
+            # Cached HTML must not carry a CSRF token; the cookie is set per visitor outside the cache.
+            cached_view = cache_page(timeout, key_prefix=key_prefix)(view_func)
+            return ensure_csrf_cookie(cached_view)(request, *args, **kwargs)
+
+        return _wrapped
+
+    return decorator
+
+
+def get_or_set_tagged(key, tags, compute, timeout=DEFAULT_TIMEOUT):
+    versioned_key = f"{key}:{tag_versions(tags)}"
+    value = cache.get(versioned_key)
+    if value is None:
+        value = compute()
+        cache.set(versioned_key, value, timeout)
+    return value
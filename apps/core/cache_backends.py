@@ -0,0 +1,213 @@
+import base64
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+
+import psycopg
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections, router, transaction
+from django.utils.timezone import now as tz_now
+from psycopg import sql
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+CLEAR_ALL = "*"
+RECONNECT_DELAY = 5
+MAX_PAYLOAD_BYTES = 7900
+
+
+class PostgresCache(DatabaseCache):
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        db = router.db_for_write(self.cache_model_class)
+        connection = connections[db]
+        quote_name = connection.ops.quote_name
+        table = quote_name(self._table)
+
+        with transaction.atomic(using=db), connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {quote_name('value')}, {quote_name('expires')} FROM {table} "
+                f"WHERE {quote_name('cache_key')} = %s FOR UPDATE",
+                [key],
+            )
+            row = cursor.fetchone()
+            if row is None or row[1] < tz_now():
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(base64.b64decode(row[0].encode())) + delta
+            pickled = base64.b64encode(pickle.dumps(value, self.pickle_protocol)).decode("latin1")
+            cursor.execute(
+                f"UPDATE {table} SET {quote_name('value')} = %s WHERE {quote_name('cache_key')} = %s",
+                [pickled, key],
+            )
+        return value
+
+
+class TwoTierCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared_alias = options.get("SHARED_ALIAS", "shared")
+        self._local_timeout = options.get("LOCAL_TIMEOUT", 5)
+        self._channel = options.get("NOTIFY_CHANNEL", "cache_invalidation")
+        self._notify_alias = options.get("NOTIFY_DATABASE", "default")
+        # Write-heavy keys skip the local tier, so their writes need no invalidation notice.
+        self._bypass_prefixes = tuple(options.get("LOCAL_BYPASS_PREFIXES", ()))
+        self._local = LocMemCache(
+            f"two-tier-{location or self._shared_alias}",
+            {"TIMEOUT": self._local_timeout, "OPTIONS": {"MAX_ENTRIES": options.get("LOCAL_MAX_ENTRIES", 1000)}},
+        )
+        self._origin = uuid.uuid4().hex
+        self._listener_pid = None
+        self._listening = threading.Event()
+        self._listener_lock = threading.Lock()
+
+    @property
+    def _shared(self):
+        return caches[self._shared_alias]
+
+    def _local_key(self, key):
+        return not key.startswith(self._bypass_prefixes)
+
+    def _local_enabled(self):
+        if not self._channel:
+            return True
+        self._ensure_listener()
+        return self._listening.is_set()
+
+    def _local_set(self, key, value, timeout, version):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            timeout = self._local_timeout
+        else:
+            timeout = min(timeout, self._local_timeout)
+        if timeout <= 0:
+            self._local.delete(key, version=version)
+        else:
+            self._local.set(key, value, timeout, version=version)
+
+    def _publish(self, *keys, version=None):
+        keys = [key for key in keys if self._local_key(key)]
+        self._local.delete_many(keys, version=version)
+        if not self._channel or not keys:
+            return
+        payload = json.dumps({"origin": self._origin, "version": version, "keys": keys})
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            payload = json.dumps({"origin": self._origin, "version": version, "keys": [CLEAR_ALL]})
+        with connections[self._notify_alias].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self._channel, payload])
+
+    def handle_notification(self, payload):
+        message = json.loads(payload)
+        if message["origin"] == self._origin:
+            return
+        if message["keys"] == [CLEAR_ALL]:
+            self._local.clear()
+            return
+        self._local.delete_many(message["keys"], version=message["version"])
+
+    def _ensure_listener(self):
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._listener_lock:
+            if self._listener_pid == pid:
+                return
+            self._listening.clear()
+            self._local.clear()
+            self._listener_pid = pid
+            threading.Thread(target=self._listen, name="cache-invalidation", daemon=True).start()
+
+    def _listen(self):
+        params = connections[self._notify_alias].get_connection_params()
+        while True:
+            try:
+                with psycopg.connect(**params, autocommit=True) as conn:
+                    conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self._channel)))
+                    self._local.clear()
+                    self._listening.set()
+                    for notify in conn.notifies():
+                        self.handle_notification(notify.payload)
+            except Exception:
+                logger.warning("Cache invalidation listener disconnected", exc_info=True)
+            self._listening.clear()
+            self._local.clear()
+            time.sleep(RECONNECT_DELAY)
+
+    def get(self, key, default=None, version=None):
+        local_enabled = self._local_key(key) and self._local_enabled()
+        if local_enabled:
+            value = self._local.get(key, _MISSING, version=version)
+            if value is not _MISSING:
+                return value
+        value = self._shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        if local_enabled:
+            self._local_set(key, value, DEFAULT_TIMEOUT, version)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        local_keys = [key for key in keys if self._local_key(key)] if self._local_enabled() else []
+        result = self._local.get_many(local_keys, version=version)
+        missing = [key for key in keys if key not in result]
+        if missing:
+            fetched = self._shared.get_many(missing, version=version)
+            for key, value in fetched.items():
+                if key in local_keys:
+                    self._local_set(key, value, DEFAULT_TIMEOUT, version)
+            result.update(fetched)
+        return result
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._shared.set(key, value, timeout, version=version)
+        self._publish(key, version=version)
+        if self._local_key(key) and self._local_enabled():
+            self._local_set(key, value, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self._shared.set_many(data, timeout, version=version)
+        self._publish(*data, version=version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self._shared.add(key, value, timeout, version=version)
+        if added:
+            self._publish(key, version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self._shared.incr(key, delta, version=version)
+        self._publish(key, version=version)
+        return value
+
+    def delete(self, key, version=None):
+        deleted = self._shared.delete(key, version=version)
+        self._publish(key, version=version)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self._shared.delete_many(keys, version=version)
+        self._publish(*keys, version=version)
+
+    def clear(self):
+        self._shared.clear()
+        self._local.clear()
+        self._publish(CLEAR_ALL)
+
+    def close(self, **kwargs):
+        self._shared.close(**kwargs)
@@ -17,9 +17,7 @@ def company_info(request):
         "current_year": datetime.now().year,
     }
     if hasattr(request, "user") and request.user.is_authenticated:
-        from apps.portal.models import Message
+        from apps.portal.services import get_unread_count
 
-        ctx["unread_count"] = Message.objects.filter(
-            to_user=request.user, read=False
-        ).count()
+        ctx["unread_count"] = get_unread_count(request)
     return ctx
@@ -32,3 +32,27 @@ class TemplateCategory(models.TextChoices):
     INQUIRY = "project_inquiry", "Demande projet"
     INFO = "general_info", "Information générale"
     CUSTOM = "custom", "Personnalisé"
+
+
+class JobStatus(models.TextChoices):
+    PENDING = "pending", "En attente"
+    RUNNING = "running", "En cours"
+    DONE = "done", "Terminée"
+    DEAD = "dead", "En échec"
+
+
+class AuditAction(models.IntegerChoices):
+    CREATED = 1, "Création"
+    UPDATED = 2, "Modification"
+    DELETED = 3, "Suppression"
+
+
+class AuditEntity(models.IntegerChoices):
+    PROJECT = 1, "Projet"
+    ARTICLE = 2, "Article"
+    CONTACT = 3, "Contact"
+    CLIENT_PROJECT = 4, "Accès client"
+    MESSAGE = 5, "Message"
+    PROJECT_COMMENT = 6, "Commentaire"
+    EMAIL_TEMPLATE = 7, "Modèle email"
+    ASSIGNMENT_RULE = 8, "Règle d'attribution"
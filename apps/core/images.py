@@ -0,0 +1,141 @@
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.jobs.services import enqueue
+
+logger = logging.getLogger(__name__)
+
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+UPLOAD_FORMATS = ("JPEG", "PNG", "WEBP")
+GENERATE_VARIANTS_TASK = "core.generate_image_variants"
+
+
+def open_bounded(fileobj, max_size):
+    img = Image.open(fileobj)
+    image_format = img.format
+    if image_format == "JPEG":
+        img.draft(img.mode, (max_size, max_size))
+    return ImageOps.exif_transpose(img), image_format
+
+
+def _flatten(img):
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, "white")
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+def _encode(img, fmt):
+    image_format, options = VARIANT_FORMATS[fmt]
+    if image_format == "JPEG":
+        img = _flatten(img)
+    elif img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or img.mode == "P" else "RGB")
+    buf = BytesIO()
+    img.save(buf, format=image_format, **options)
+    return buf.getvalue()
+
+
+def downscale_upload(upload, max_size):
+    try:
+        upload.seek(0)
+        img, image_format = open_bounded(upload, max_size)
+    except (UnidentifiedImageError, OSError):
+        upload.seek(0)
+        return upload
+    if img.width <= max_size and img.height <= max_size:
+        upload.seek(0)
+        return upload
+
+    img.thumbnail((max_size, max_size), Image.LANCZOS)
+    if image_format not in UPLOAD_FORMATS:
+        image_format = "PNG"
+    if image_format == "JPEG":
+        img = _flatten(img)
+    buf = BytesIO()
+    img.save(buf, format=image_format, quality=85)
+    return ContentFile(buf.getvalue(), name=posixpath.basename(upload.name))
+
+
+def build_variants(storage, name, widths):
+    variants = {"source": name}
+    try:
+        with storage.open(name, "rb") as f:
+            img = open_bounded(f, max(widths))[0]
+            img.load()
+    except (UnidentifiedImageError, OSError):
+        logger.warning("Cannot decode %s, skipping image variants", name)
+        return variants
+
+    root = posixpath.splitext(name)[0]
+    variants["width"] = img.width
+    for fmt in VARIANT_FORMATS:
+        variants[fmt] = {}
+    for width in sorted({min(w, img.width) for w in widths}):
+        height = max(round(img.height * width / img.width), 1)
+        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        for fmt in VARIANT_FORMATS:
+            saved = storage.save(f"{root}.{width}w.{fmt}", ContentFile(_encode(resized, fmt)))
+            variants[fmt][str(width)] = saved
+    return variants
+
+
+def variant_names(variants):
+    return [name for fmt in VARIANT_FORMATS for name in variants.get(fmt, {}).values()]
+
+
+def current_variants(instance, field_name):
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, f"{field_name}_variants", None) or {}
+    if not field_file or variants.get("source") != field_file.name:
+        return {}
+    return variants
+
+
+def _delete_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.warning("Failed to delete image variant %s", name, exc_info=True)
+
+
+def generate_variants(instance, field_name):
+    from apps.core.cache import invalidate_tags
+    from apps.core.signals import instance_tags
+
+    model = type(instance)
+    field_file = getattr(instance, field_name)
+    variants_field = f"{field_name}_variants"
+    previous = getattr(instance, variants_field) or {}
+    name = field_file.name or ""
+
+    variants = build_variants(field_file.storage, name, model.variant_widths[field_name]) if name else {}
+    updated = model._default_manager.filter(pk=instance.pk, **{field_name: name}).update(**{variants_field: variants})
+    if not updated:
+        _delete_files(field_file.storage, variant_names(variants))
+        return None
+
+    setattr(instance, variants_field, variants)
+    _delete_files(field_file.storage, set(variant_names(previous)) - set(variant_names(variants)))
+    invalidate_tags(*instance_tags(instance))
+    return variants
+
+
+def schedule_variants(instance, field_name):
+    enqueue(GENERATE_VARIANTS_TASK, label=instance._meta.label, pk=instance.pk, field_name=field_name)
+
+
+def needs_variants(instance, field_name):
+    field_file = getattr(instance, field_name)
+    variants = getattr(instance, f"{field_name}_variants") or {}
+    return (field_file.name or "") != variants.get("source", "")
@@ -0,0 +1,58 @@
+from django.core.files import File
+from django.core.files.storage import storages
+from django.core.management.base import BaseCommand
+
+from apps.articles.models import Article
+from apps.core.cache import invalidate_tags
+from apps.core.models import SiteSetting, TeamMember
+from apps.core.signals import article_tags, project_tags
+from apps.core.storage import PUBLIC_STORAGE_ALIAS, public_storage
+from apps.projects.models import Project
+
+PUBLIC_FIELDS = [
+    (Project, "image"),
+    (Article, "image"),
+    (SiteSetting, "image"),
+    (TeamMember, "photo"),
+]
+
+
+class Command(BaseCommand):
+    help = "Copy existing public images from the private bucket to the public content-hashed storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        source = storages["default"]
+        target = public_storage()
+        if target is source:
+            self.stderr.write(self.style.WARNING(f"No '{PUBLIC_STORAGE_ALIAS}' storage configured."))
+            return
+
+        copied = 0
+        for model, field in PUBLIC_FIELDS:
+            for obj in model.objects.exclude(**{field: ""}).only("pk", field):
+                name = getattr(obj, field).name
+                if target.exists(name):
+                    continue
+                self.stdout.write(f"  {model.__name__} {obj.pk}: {name}")
+                if options["dry_run"]:
+                    continue
+                with source.open(name, "rb") as f:
+                    new_name = target.save(name, File(f, name=name))
+                model.objects.filter(pk=obj.pk).update(**{field: new_name})
+                copied += 1
+
+        if copied:
+            invalidate_tags(
+                "team",
+                "site-settings",
+                *project_tags(*Project.objects.values_list("slug", flat=True)),
+                *article_tags(*Article.objects.values_list("slug", flat=True)),
+            )
+        self.stdout.write(self.style.SUCCESS(f"Copied: {copied}"))
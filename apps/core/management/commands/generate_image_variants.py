@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from apps.core.images import generate_variants, needs_variants
+
+BATCH_SIZE = 200
+
+
+class Command(BaseCommand):
+    help = "Generate responsive WebP/JPEG variants for images that are missing them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate variants for every image, not only missing ones",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            for field_name in getattr(model, "variant_widths", {}):
+                qs = model._default_manager.exclude(**{field_name: ""}).only("pk", field_name, f"{field_name}_variants")
+                pending = [
+                    obj
+                    for obj in qs.iterator(chunk_size=BATCH_SIZE)
+                    if options["all"] or needs_variants(obj, field_name)
+                ]
+                self.stdout.write(f"  {model.__name__}.{field_name}: {len(pending)}")
+                if options["dry_run"]:
+                    continue
+                for obj in pending:
+                    generate_variants(obj, field_name)
+
+        self.stdout.write(self.style.SUCCESS("Image variants up to date."))
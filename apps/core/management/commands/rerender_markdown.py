@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.articles.models import Article
+from apps.core.cache import invalidate_tags
+from apps.core.models import FAQ
+from apps.core.rendering import RENDERER_VERSION
+from apps.core.signals import article_tags, project_tags
+from apps.projects.models import Project
+
+BATCH_SIZE = 200
+
+
+class Command(BaseCommand):
+    help = "Re-render stored Markdown HTML that is missing or from an older renderer version"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-render every row, not only outdated ones",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        tags = set()
+        for model in (Project, Article, FAQ):
+            qs = model.objects.all()
+            if not options["all"]:
+                qs = qs.filter(~Q(markdown_version=RENDERER_VERSION))
+            count = qs.count()
+            self.stdout.write(f"  {model.__name__}: {count}")
+            if options["dry_run"] or not count:
+                continue
+
+            fields = [*model.markdown_fields.values(), "markdown_version"]
+            batch = []
+            for obj in qs.iterator(chunk_size=BATCH_SIZE):
+                obj.render_markdown_fields()
+                batch.append(obj)
+                if len(batch) >= BATCH_SIZE:
+                    model.objects.bulk_update(batch, fields)
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, fields)
+
+            if model is FAQ:
+                tags.add("faq")
+            else:
+                tag_func = project_tags if model is Project else article_tags
+                tags.update(tag_func(*model.objects.values_list("slug", flat=True)))
+
+        if tags:
+            invalidate_tags(*tags)
+        self.stdout.write(self.style.SUCCESS("Markdown rendering up to date."))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.models import SearchDocument
+from apps.core.search import reindex_documents, sync_service_documents
+from apps.core.views import SERVICES
+
+
+class Command(BaseCommand):
+    help = "Sync the service entries of the site search index; --all rebuilds every entry"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild project, article and FAQ entries too",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            self.stdout.write(f"  Indexed documents: {SearchDocument.objects.count()}")
+            self.stdout.write(f"  Services to sync: {len(SERVICES)}")
+            return
+        if options["all"]:
+            counts = reindex_documents()
+        else:
+            counts = {"Service (changed)": sync_service_documents()}
+        for name, count in counts.items():
+            self.stdout.write(f"  {name}: {count}")
+        self.stdout.write(self.style.SUCCESS("Search index up to date."))
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:30
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_image_variants"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="faq",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name="faq",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="core_faq_search__28d0b4_gin"
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION update_faq_search_vector()
+                RETURNS trigger AS $$
+                BEGIN
+                  NEW.search_vector :=
+                    to_tsvector('french', coalesce(NEW.question, '')) ||
+                    to_tsvector('french', coalesce(NEW.answer, ''));
+                  RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER faq_search_update
+                  BEFORE INSERT OR UPDATE OF question, answer
+                  ON core_faq
+                  FOR EACH ROW EXECUTE FUNCTION update_faq_search_vector();
+
+                UPDATE core_faq SET question = question;
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS faq_search_update ON core_faq;
+                DROP FUNCTION IF EXISTS update_faq_search_vector();
+            """,
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:33
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_faq_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="faq",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["question"],
+                name="core_faq_question_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,152 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:41
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0006_image_variants"),
+        ("core", "0012_faq_question_trigram"),
+        ("projects", "0008_image_variants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("project", "Projet"),
+                            ("article", "Actualité"),
+                            ("faq", "FAQ"),
+                            ("service", "Service"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("object_id", models.CharField(max_length=255)),
+                ("slug", models.SlugField(blank=True, db_index=False, max_length=255)),
+                ("title", models.CharField(max_length=500)),
+                ("category", models.CharField(blank=True, max_length=100)),
+                ("published_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(null=True),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="core_search_search__e96428_gin"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "object_id"),
+                        name="core_searchdocument_unique_object",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE OR REPLACE FUNCTION sync_project_search_document()
+                RETURNS trigger AS $$
+                BEGIN
+                  IF TG_OP <> 'INSERT' THEN
+                    DELETE FROM core_searchdocument WHERE kind = 'project' AND object_id = OLD.id::text;
+                  END IF;
+                  IF TG_OP <> 'DELETE' AND NEW.published THEN
+                    INSERT INTO core_searchdocument (kind, object_id, slug, title, category, search_vector)
+                    VALUES (
+                      'project', NEW.id::text, NEW.slug, NEW.title, NEW.category,
+                      setweight(to_tsvector('french', coalesce(NEW.title, '')), 'A') ||
+                      setweight(to_tsvector('french', coalesce(NEW.location, '') || ' ' || NEW.category), 'B') ||
+                      setweight(to_tsvector('french', coalesce(NEW.description, '')), 'C')
+                    );
+                  END IF;
+                  RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER project_search_document
+                  AFTER INSERT OR DELETE OR UPDATE OF title, slug, description, location, category, published
+                  ON projects_project
+                  FOR EACH ROW EXECUTE FUNCTION sync_project_search_document();
+
+                CREATE OR REPLACE FUNCTION sync_article_search_document()
+                RETURNS trigger AS $$
+                BEGIN
+                  IF TG_OP <> 'INSERT' THEN
+                    DELETE FROM core_searchdocument WHERE kind = 'article' AND object_id = OLD.id::text;
+                  END IF;
+                  IF TG_OP <> 'DELETE' AND NEW.published THEN
+                    INSERT INTO core_searchdocument
+                      (kind, object_id, slug, title, category, published_at, search_vector)
+                    VALUES (
+                      'article', NEW.id::text, NEW.slug, NEW.title, NEW.category, NEW.published_at,
+                      setweight(to_tsvector('french', coalesce(NEW.title, '')), 'A') ||
+                      setweight(to_tsvector('french', coalesce(NEW.excerpt, '')), 'B') ||
+                      setweight(to_tsvector('french', coalesce(NEW.content, '')), 'C')
+                    );
+                  END IF;
+                  RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER article_search_document
+                  AFTER INSERT OR DELETE OR UPDATE OF title, slug, excerpt, content, category, published, published_at
+                  ON articles_article
+                  FOR EACH ROW EXECUTE FUNCTION sync_article_search_document();
+
+                CREATE OR REPLACE FUNCTION sync_faq_search_document()
+                RETURNS trigger AS $$
+                BEGIN
+                  IF TG_OP <> 'INSERT' THEN
+                    DELETE FROM core_searchdocument WHERE kind = 'faq' AND object_id = OLD.id::text;
+                  END IF;
+                  IF TG_OP <> 'DELETE' AND NEW.published THEN
+                    INSERT INTO core_searchdocument (kind, object_id, slug, title, category, search_vector)
+                    VALUES (
+                      'faq', NEW.id::text, '', NEW.question, NEW.category,
+                      setweight(to_tsvector('french', coalesce(NEW.question, '')), 'A') ||
+                      setweight(to_tsvector('french', coalesce(NEW.answer, '')), 'B')
+                    );
+                  END IF;
+                  RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER faq_search_document
+                  AFTER INSERT OR DELETE OR UPDATE OF question, answer, category, published
+                  ON core_faq
+                  FOR EACH ROW EXECUTE FUNCTION sync_faq_search_document();
+
+                UPDATE projects_project SET title = title WHERE published;
+                UPDATE articles_article SET title = title WHERE published;
+                UPDATE core_faq SET question = question WHERE published;
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS project_search_document ON projects_project;
+                DROP FUNCTION IF EXISTS sync_project_search_document();
+                DROP TRIGGER IF EXISTS article_search_document ON articles_article;
+                DROP FUNCTION IF EXISTS sync_article_search_document();
+                DROP TRIGGER IF EXISTS faq_search_document ON core_faq;
+                DROP FUNCTION IF EXISTS sync_faq_search_document();
+            """,
+        ),
+    ]
@@ -1,13 +1,18 @@
-import posixpath
-from io import BytesIO
+from typing import ClassVar
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
-from django.core.files.base import ContentFile
 from django.db import models
+from django.urls import reverse
 from django.utils import timezone
-from PIL import Image
+from django.utils.safestring import mark_safe
 
+from apps.core.enums import ProjectCategory
+from apps.core.images import downscale_upload
+from apps.core.rendering import RENDERER_VERSION, render_markdown, render_markdown_cached
+from apps.core.storage import public_storage
 from apps.core.validators import validate_image_file
 
 TEAM_PHOTO_MAX_SIZE = 100
@@ -49,10 +54,41 @@ class SoftDeleteMixin(models.Model):
         abstract = True
 
 
+class RenderedMarkdownMixin(models.Model):
+    markdown_fields: ClassVar[dict[str, str]] = {}
+
+    markdown_version = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def render_markdown_fields(self):
+        for source, target in self.markdown_fields.items():
+            setattr(self, target, render_markdown(getattr(self, source)))
+        self.markdown_version = RENDERER_VERSION
+
+    def rendered(self, source):
+        if self.markdown_version == RENDERER_VERSION:
+            return mark_safe(getattr(self, self.markdown_fields[source]))
+        return mark_safe(render_markdown_cached(getattr(self, source)))
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self.render_markdown_fields()
+        elif set(update_fields) & set(self.markdown_fields):
+            self.render_markdown_fields()
+            kwargs["update_fields"] = {*update_fields, *self.markdown_fields.values(), "markdown_version"}
+        super().save(*args, **kwargs)
+
+
 class SiteSetting(models.Model):
+    variant_widths = {"image": (640, 1280, 1920)}
+
     key = models.CharField(max_length=100, unique=True)
     value = models.TextField(blank=True)
-    image = models.ImageField(upload_to="site/", blank=True, validators=[validate_image_file])
+    image = models.ImageField(upload_to="site/", storage=public_storage, blank=True, validators=[validate_image_file])
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
@@ -67,9 +103,12 @@ class FAQCategory(models.TextChoices):
     CONTACT = "contact", "Contact & Devis"
 
 
-class FAQ(TimestampMixin):
+class FAQ(RenderedMarkdownMixin, TimestampMixin):
+    markdown_fields = {"answer": "answer_html"}
+
     question = models.CharField(max_length=500)
     answer = models.TextField(help_text="Contenu en Markdown")
+    answer_html = models.TextField(blank=True, editable=False)
     category = models.CharField(
         max_length=20,
         choices=FAQCategory.choices,
@@ -84,15 +123,24 @@ class FAQ(TimestampMixin):
         settings.AUTH_USER_MODEL,
         on_delete=models.PROTECT,
     )
+    search_vector = SearchVectorField(null=True)
 
     class Meta:
         ordering = ["category", "order"]
         verbose_name = "FAQ"
         verbose_name_plural = "FAQs"
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+            GinIndex(fields=["question"], name="core_faq_question_trgm", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return self.question
 
+    @property
+    def rendered_answer(self):
+        return self.rendered("answer")
+
 
 class Department(TimestampMixin):
     name = models.CharField(max_length=150, unique=True)
@@ -141,6 +189,8 @@ class Division(TimestampMixin):
 
 
 class TeamMember(TimestampMixin):
+    variant_widths = {"photo": (56, 100)}
+
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     role = models.CharField(max_length=150)
@@ -151,7 +201,8 @@ class TeamMember(TimestampMixin):
         Division, on_delete=models.SET_NULL, related_name="members",
         null=True, blank=True,
     )
-    photo = models.ImageField(upload_to="team/", blank=True, validators=[validate_image_file])
+    photo = models.ImageField(upload_to="team/", storage=public_storage, blank=True, validators=[validate_image_file])
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(blank=True)
     email = models.EmailField(blank=True)
     phone = models.CharField(max_length=30, blank=True)
@@ -170,18 +221,9 @@ class TeamMember(TimestampMixin):
             )
 
     def save(self, *args, **kwargs):
+        if self.photo and not self.photo._committed:
+            self.photo = downscale_upload(self.photo.file, TEAM_PHOTO_MAX_SIZE)
         super().save(*args, **kwargs)
-        if self.photo:
-            with self.photo.storage.open(self.photo.name) as f:
-                img = Image.open(f)
-                if img.width > TEAM_PHOTO_MAX_SIZE or img.height > TEAM_PHOTO_MAX_SIZE:
-                    img.thumbnail((TEAM_PHOTO_MAX_SIZE, TEAM_PHOTO_MAX_SIZE), Image.LANCZOS)
-                    buf = BytesIO()
-                    fmt = "JPEG" if self.photo.name.lower().endswith((".jpg", ".jpeg")) else "PNG"
-                    img.save(buf, format=fmt, quality=85)
-                    basename = posixpath.basename(self.photo.name)
-                    self.photo.save(basename, ContentFile(buf.getvalue()), save=False)
-                    super().save(update_fields=["photo"])
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -193,3 +235,41 @@ class TeamMember(TimestampMixin):
     @property
     def initials(self):
         return f"{self.first_name[:1]}{self.last_name[:1]}".upper()
+
+
+class SearchKind(models.TextChoices):
+    PROJECT = "project", "Projet"
+    ARTICLE = "article", "Actualité"
+    FAQ = "faq", "FAQ"
+    SERVICE = "service", "Service"
+
+
+class SearchDocument(models.Model):
+    kind = models.CharField(max_length=10, choices=SearchKind.choices)
+    object_id = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=255, blank=True, db_index=False)
+    title = models.CharField(max_length=500)
+    category = models.CharField(max_length=100, blank=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="core_searchdocument_unique_object"),
+        ]
+        indexes = [GinIndex(fields=["search_vector"])]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} : {self.title}"
+
+    def get_absolute_url(self):
+        if self.kind == SearchKind.FAQ:
+            return reverse("faq")
+        return reverse(f"{self.kind}_detail", kwargs={"slug": self.slug})
+
+    @property
+    def category_label(self):
+        choices = {SearchKind.PROJECT: ProjectCategory, SearchKind.FAQ: FAQCategory}.get(self.kind)
+        if choices is None or self.category not in choices.values:
+            return self.category
+        return choices(self.category).label
@@ -0,0 +1,42 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import bleach
+import markdown as md
+
+RENDERER_VERSION = 1
+CACHE_MAX_ENTRIES = 256
+
+ALLOWED_TAGS = [
+    "p", "br", "strong", "em", "ul", "ol", "li", "a",
+    "h2", "h3", "h4", "blockquote", "code", "pre",
+]
+ALLOWED_ATTRIBUTES = {"a": ["href", "title"]}
+
+_cache: OrderedDict[str, str] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def render_markdown(value):
+    if not value:
+        return ""
+    html = md.markdown(value, extensions=["extra"])
+    return bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
+
+
+def render_markdown_cached(value):
+    if not value:
+        return ""
+    digest = hashlib.sha256(value.encode()).hexdigest()
+    with _cache_lock:
+        html = _cache.get(digest)
+        if html is not None:
+            _cache.move_to_end(digest)
+            return html
+    html = render_markdown(value)
+    with _cache_lock:
+        _cache[digest] = html
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return html
@@ -0,0 +1,215 @@
+import atexit
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.db.models.lookups import Exact
+
+from apps.core.cache import get_or_set_tagged, invalidate_tags, tag_versions
+from apps.core.models import SearchDocument, SearchKind
+from apps.core.signals import SEARCH_TAG
+
+logger = logging.getLogger(__name__)
+
+SEARCH_LIMIT = 20
+SUGGESTION_LIMIT = 8
+SUGGESTION_MIN_LENGTH = 2
+SUGGESTION_MAX_LENGTH = 100
+SUGGESTION_TIMEOUT = 60 * 15
+SEARCH_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+SEARCH_HITS_KEY = "search:stats:hits"
+SEARCH_MISSES_KEY = "search:stats:misses"
+SEARCH_STATS_FLUSH_INTERVAL = 60
+
+_pending_counts: Counter[str] = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def service_vector(service):
+    return SearchVector(Value(service["name"]), config="french", weight="A") + SearchVector(
+        Value(" ".join([service["short"], *service["items"]])), config="french", weight="B"
+    )
+
+
+def sync_service_documents():
+    from apps.core.views import SERVICES
+
+    slugs = [service["slug"] for service in SERVICES]
+    services = SearchDocument.objects.filter(kind=SearchKind.SERVICE)
+    changed, _ = services.exclude(object_id__in=slugs).delete()
+    for service in SERVICES:
+        vector = service_vector(service)
+        # Runs on every boot; unchanged rows must not bump the search tag and drop cached results.
+        if services.filter(
+            Exact(F("search_vector"), vector), object_id=service["slug"], slug=service["slug"], title=service["name"]
+        ).exists():
+            continue
+        SearchDocument.objects.update_or_create(
+            kind=SearchKind.SERVICE,
+            object_id=service["slug"],
+            defaults={"slug": service["slug"], "title": service["name"], "search_vector": vector},
+        )
+        changed += 1
+    if changed:
+        invalidate_tags(SEARCH_TAG)
+    return changed
+
+
+def reindex_documents():
+    from apps.articles.models import Article
+    from apps.core.models import FAQ
+    from apps.projects.models import Project
+
+    # Touching the indexed columns re-runs the search document triggers.
+    SearchDocument.objects.exclude(kind=SearchKind.SERVICE).delete()
+    counts = {}
+    for model, field in ((Project, "title"), (Article, "title"), (FAQ, "question")):
+        counts[model.__name__] = model.objects.filter(published=True).update(**{field: F(field)})
+    counts["Service"] = sync_service_documents()
+    invalidate_tags(SEARCH_TAG)
+    return counts
+
+
+def search_documents(text, limit=SEARCH_LIMIT):
+    query = SearchQuery(text, config="french", search_type="websearch")
+    return (
+        SearchDocument.objects.filter(search_vector=query)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "title")[:limit]
+    )
+
+
+def normalize_query(text):
+    return " ".join(text.casefold().split())
+
+
+def _count(key):
+    # Counted in process; a shared counter row would serialize every search.
+    global _last_flush
+    with _pending_lock:
+        _pending_counts[key] += 1
+        if time.monotonic() - _last_flush < SEARCH_STATS_FLUSH_INTERVAL:
+            return
+        _last_flush = time.monotonic()
+    threading.Thread(target=_flush_in_background, name="search-stats-flush", daemon=True).start()
+
+
+@atexit.register
+def flush_search_stats():
+    with _pending_lock:
+        counts = dict(_pending_counts)
+        _pending_counts.clear()
+    for key, count in counts.items():
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            cache.set(key, count, None)
+
+
+def _flush_in_background():
+    try:
+        close_old_connections()
+        flush_search_stats()
+    except Exception:
+        logger.exception("Failed to flush search stats")
+    finally:
+        connection.close()
+
+
+def cached_search(text):
+    digest = hashlib.sha256(normalize_query(text).encode()).hexdigest()
+    # The version moves with published content; the timeout only ages out unused keys.
+    key = f"search:results:{digest}:{tag_versions([SEARCH_TAG])}"
+    results = cache.get(key)
+    if results is not None:
+        _count(SEARCH_HITS_KEY)
+        return results
+    _count(SEARCH_MISSES_KEY)
+    results = list(search_documents(text))
+    cache.set(key, results, SEARCH_CACHE_TIMEOUT)
+    return results
+
+
+def search_stats():
+    flush_search_stats()
+    counts = cache.get_many([SEARCH_HITS_KEY, SEARCH_MISSES_KEY])
+    hits, misses = counts.get(SEARCH_HITS_KEY, 0), counts.get(SEARCH_MISSES_KEY, 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else None}
+
+
+def prefix_query(text):
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    return SearchQuery(" & ".join(f"{term}:*" for term in terms), config="french", search_type="raw")
+
+
+def trigram_suggestions(text, limit=SUGGESTION_LIMIT):
+    from apps.articles.models import Article
+    from apps.projects.models import Project
+
+    projects = (
+        Project.objects.filter(published=True)
+        .filter(
+            Q(title__trigram_word_similar=text)
+            | Q(location__trigram_word_similar=text)
+            | Q(client_name__trigram_word_similar=text)
+        )
+        .annotate(
+            score=Greatest(
+                TrigramWordSimilarity(text, "title"),
+                TrigramWordSimilarity(text, "location"),
+                TrigramWordSimilarity(text, "client_name"),
+            )
+        )
+        .only("title", "slug")
+        .order_by("-score")[:limit]
+    )
+    articles = (
+        Article.objects.filter(published=True, title__trigram_word_similar=text)
+        .annotate(score=TrigramWordSimilarity(text, "title"))
+        .only("title", "slug")
+        .order_by("-score")[:limit]
+    )
+    matches = [(project.score, SearchKind.PROJECT, project) for project in projects]
+    matches += [(article.score, SearchKind.ARTICLE, article) for article in articles]
+    matches.sort(key=lambda match: match[0], reverse=True)
+    return [{"kind": kind.label, "title": obj.title, "url": obj.get_absolute_url()} for _, kind, obj in matches[:limit]]
+
+
+def find_suggestions(text, limit=SUGGESTION_LIMIT):
+    query = prefix_query(text)
+    if query is not None:
+        documents = (
+            SearchDocument.objects.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "title")[:limit]
+        )
+        suggestions = [
+            {"kind": document.get_kind_display(), "title": document.title, "url": document.get_absolute_url()}
+            for document in documents
+        ]
+        if suggestions:
+            return suggestions
+    return trigram_suggestions(text, limit)
+
+
+def suggest(text):
+    text = " ".join(text.split())[:SUGGESTION_MAX_LENGTH]
+    if len(text) < SUGGESTION_MIN_LENGTH:
+        return []
+    digest = hashlib.sha256(normalize_query(text).encode()).hexdigest()
+    return get_or_set_tagged(
+        f"search:suggest:{digest}", [SEARCH_TAG], lambda: find_suggestions(text), SUGGESTION_TIMEOUT
+    )
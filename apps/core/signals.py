@@ -0,0 +1,85 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from apps.core.cache import invalidate_tags_on_commit
+from apps.core.images import needs_variants, schedule_variants
+
+
+SEARCH_TAG = "search"
+
+
+def project_tags(*slugs):
+    return ["project-list", *(f"project:{slug}" for slug in slugs)]
+
+
+def article_tags(*slugs):
+    return ["article-list", *(f"article:{slug}" for slug in slugs)]
+
+
+def instance_tags(instance):
+    from apps.articles.models import Article
+    from apps.core.models import FAQ, Department, Division, SiteSetting, TeamMember
+    from apps.projects.models import Project, ProjectDocument
+
+    if isinstance(instance, Project):
+        slugs = {instance.slug, getattr(instance, "_old_slug", None) or instance.slug}
+        return [*project_tags(*slugs), *search_tags(instance)]
+    if isinstance(instance, ProjectDocument):
+        slug = Project.objects.filter(pk=instance.project_id).values_list("slug", flat=True).first()
+        return [f"project:{slug}"] if slug else []
+    if isinstance(instance, Article):
+        slugs = {instance.slug, getattr(instance, "_old_slug", None) or instance.slug}
+        return [*article_tags(*slugs), *search_tags(instance)]
+    if isinstance(instance, FAQ):
+        return ["faq", *search_tags(instance)]
+    if isinstance(instance, SiteSetting):
+        return ["site-settings"]
+    if isinstance(instance, (TeamMember, Department, Division)):
+        return ["team"]
+    return []
+
+
+def search_tags(instance):
+    if instance.published or getattr(instance, "_was_published", False):
+        return [SEARCH_TAG]
+    return []
+
+
+def _capture_old_state(sender, instance, **kwargs):
+    if instance.pk:
+        fields = [name for name in ("slug", "published") if hasattr(instance, name)]
+        old = sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+        instance._old_slug = old.get("slug")
+        instance._was_published = old.get("published", False)
+
+
+def _invalidate(sender, instance, **kwargs):
+    invalidate_tags_on_commit(*instance_tags(instance))
+
+
+def _schedule_image_variants(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for field_name in sender.variant_widths:
+        if needs_variants(instance, field_name):
+            schedule_variants(instance, field_name)
+
+
+def register_image_signals():
+    for model in apps.get_models():
+        if getattr(model, "variant_widths", None):
+            post_save.connect(_schedule_image_variants, sender=model, dispatch_uid=f"image_variants_{model.__name__}")
+
+
+def register_cache_signals():
+    from apps.articles.models import Article
+    from apps.core.models import FAQ, Department, Division, SiteSetting, TeamMember
+    from apps.projects.models import Project, ProjectDocument
+
+    for model in (Project, Article, FAQ):
+        pre_save.connect(_capture_old_state, sender=model, dispatch_uid=f"cache_state_{model.__name__}")
+
+    models = [Project, ProjectDocument, Article, FAQ, TeamMember, Department, Division, SiteSetting]
+    for model in models:
+        post_save.connect(_invalidate, sender=model, dispatch_uid=f"cache_save_{model.__name__}")
+        post_delete.connect(_invalidate, sender=model, dispatch_uid=f"cache_delete_{model.__name__}")
@@ -0,0 +1,77 @@
+import hashlib
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.files.storage import storages
+from storages.backends.s3 import S3Storage
+
+PUBLIC_STORAGE_ALIAS = "public"
+
+
+class SignedURLCacheS3Storage(S3Storage):
+    url_cache_margin = 600
+    url_cache_max_entries = 5000
+
+    def __init__(self, **settings):
+        super().__init__(**settings)
+        self._url_cache = OrderedDict()
+        self._url_cache_lock = threading.Lock()
+
+    def get_default_settings(self):
+        return {
+            **super().get_default_settings(),
+            "url_cache_margin": self.url_cache_margin,
+            "url_cache_max_entries": self.url_cache_max_entries,
+        }
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        if parameters or http_method or not self.querystring_auth:
+            return super().url(name, parameters, expire, http_method)
+        expire = expire or self.querystring_expire
+        key = (name, expire)
+        now = time.monotonic()
+        with self._url_cache_lock:
+            cached = self._url_cache.get(key)
+            if cached and cached[1] > now:
+                self._url_cache.move_to_end(key)
+                return cached[0]
+        url = super().url(name, expire=expire)
+        with self._url_cache_lock:
+            self._url_cache[key] = (url, now + max(expire - self.url_cache_margin, 0))
+            while len(self._url_cache) > self.url_cache_max_entries:
+                self._url_cache.popitem(last=False)
+        return url
+
+    def delete(self, name):
+        super().delete(name)
+        with self._url_cache_lock:
+            for key in [k for k in self._url_cache if k[0] == name]:
+                del self._url_cache[key]
+
+
+class PublicHashedS3Storage(S3Storage):
+    querystring_auth = False
+    file_overwrite = True
+    default_acl = None
+    object_parameters = {"CacheControl": "public, max-age=31536000, immutable"}
+
+    def save(self, name, content, max_length=None):
+        return super().save(hashed_name(name, content), content, max_length)
+
+
+def hashed_name(name, content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    root, ext = posixpath.splitext(name)
+    return f"{root}.{digest.hexdigest()[:12]}{ext}"
+
+
+def public_storage():
+    if PUBLIC_STORAGE_ALIAS in settings.STORAGES:
+        return storages[PUBLIC_STORAGE_ALIAS]
+    return storages["default"]
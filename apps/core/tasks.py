@@ -0,0 +1,11 @@
+from django.apps import apps
+
+from apps.core.images import GENERATE_VARIANTS_TASK, generate_variants
+from apps.jobs.services import task
+
+
+@task(GENERATE_VARIANTS_TASK)
+def generate_image_variants(label, pk, field_name):
+    instance = apps.get_model(label)._default_manager.filter(pk=pk).first()
+    if instance is not None:
+        generate_variants(instance, field_name)
@@ -1,25 +1,16 @@
-import bleach
-import markdown as md
 from django import template
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
-register = template.Library()
+from apps.core.images import current_variants
+from apps.core.rendering import render_markdown_cached
 
-ALLOWED_TAGS = [
-    "p", "br", "strong", "em", "ul", "ol", "li", "a",
-    "h2", "h3", "h4", "blockquote", "code", "pre",
-]
-ALLOWED_ATTRIBUTES = {"a": ["href", "title"]}
+register = template.Library()
 
 
 @register.filter(name="markdown")
 def render_markdown(value):
-    if not value:
-        return ""
-    html = md.markdown(value, extensions=["extra"])
-    cleaned = bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
-    return mark_safe(cleaned)
+    return mark_safe(render_markdown_cached(value))
 
 
 ACTIVE_CLS = "text-primary-700 bg-primary-50/70 font-semibold"
@@ -47,3 +38,29 @@ def dict_get(d, key):
     if isinstance(d, dict):
         return d.get(key)
     return None
+
+
+def _variant_items(instance, field_name, fmt):
+    variants = current_variants(instance, field_name).get(fmt, {})
+    return sorted(((int(width), name) for width, name in variants.items()), key=lambda item: item[0])
+
+
+@register.simple_tag
+def srcset(instance, field_name, fmt="webp"):
+    storage = getattr(instance, field_name).storage
+    return ", ".join(f"{storage.url(name)} {width}w" for width, name in _variant_items(instance, field_name, fmt))
+
+
+@register.inclusion_tag("partials/_picture.html")
+def responsive_image(instance, field_name, sizes="100vw", alt="", css_class="", loading="lazy"):
+    field_file = getattr(instance, field_name)
+    jpeg = _variant_items(instance, field_name, "jpeg")
+    return {
+        "src": field_file.storage.url(jpeg[-1][1]) if jpeg else field_file.url,
+        "webp_srcset": srcset(instance, field_name, "webp"),
+        "jpeg_srcset": srcset(instance, field_name, "jpeg"),
+        "sizes": sizes,
+        "alt": alt,
+        "css_class": css_class,
+        "loading": loading,
+    }
@@ -0,0 +1,94 @@
+import re
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+
+from apps.core.cache import get_or_set_tagged, invalidate_tags, tag_versions
+from apps.core.factories import FAQFactory
+from apps.projects.admin import bulk_unpublish
+from apps.projects.factories import ProjectFactory
+from apps.projects.models import Project
+
+
+class TestTagVersions:
+    def test_versions_stable_until_invalidated(self):
+        first = tag_versions(["project-list"])
+        assert tag_versions(["project-list"]) == first
+        invalidate_tags("project-list")
+        assert tag_versions(["project-list"]) != first
+
+    def test_invalidate_leaves_other_tags(self):
+        faq = tag_versions(["faq"])
+        invalidate_tags("project-list")
+        assert tag_versions(["faq"]) == faq
+
+    def test_invalidate_does_not_touch_other_keys(self):
+        cache.set("rl:counter", 3)
+        invalidate_tags("project-list")
+        assert cache.get("rl:counter") == 3
+
+    def test_get_or_set_tagged_recomputes_after_invalidation(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert get_or_set_tagged("stats", ["project-list"], compute) == 1
+        assert get_or_set_tagged("stats", ["project-list"], compute) == 1
+        invalidate_tags("project-list")
+        assert get_or_set_tagged("stats", ["project-list"], compute) == 2
+
+
+@pytest.mark.django_db
+class TestTaggedPages:
+    def setup_method(self):
+        self.client = Client()
+
+    def test_list_served_from_cache(self):
+        ProjectFactory(title="Route A")
+        self.client.get("/projets/")
+        Project.objects.update(title="Route B")
+        response = self.client.get("/projets/")
+        assert "Route A" in response.content.decode()
+
+    def test_save_invalidates_list_and_detail(self, django_capture_on_commit_callbacks):
+        project = ProjectFactory(title="Route A", slug="route")
+        self.client.get("/projets/")
+        self.client.get("/projets/route/")
+        with django_capture_on_commit_callbacks(execute=True):
+            project.title = "Route B"
+            project.save()
+        assert "Route B" in self.client.get("/projets/").content.decode()
+        assert "Route B" in self.client.get("/projets/route/").content.decode()
+
+    def test_bulk_unpublish_invalidates_list(self, django_capture_on_commit_callbacks):
+        ProjectFactory(title="Route A")
+        self.client.get("/projets/")
+        with django_capture_on_commit_callbacks(execute=True):
+            bulk_unpublish(None, None, Project.objects.all())
+        assert "Route A" not in self.client.get("/projets/").content.decode()
+
+    def test_faq_save_keeps_project_pages(self, django_capture_on_commit_callbacks):
+        ProjectFactory(title="Route A")
+        self.client.get("/projets/")
+        Project.objects.update(title="Route B")
+        with django_capture_on_commit_callbacks(execute=True):
+            FAQFactory()
+        assert "Route A" in self.client.get("/projets/").content.decode()
+
+    def test_cached_page_does_not_share_csrf_token(self):
+        ProjectFactory(title="Route A")
+        first, second = Client(enforce_csrf_checks=True), Client(enforce_csrf_checks=True)
+        first.get("/projets/")
+        response = second.get("/projets/")
+        assert "csrftoken" in response.cookies
+        assert first.cookies["csrftoken"].value not in response.content.decode()
+        token = second.cookies["csrftoken"].value
+        response = second.post("/contact/", {}, HTTP_X_CSRFTOKEN=token)
+        assert response.status_code == 200
+
+    def test_cached_page_has_no_inline_script(self):
+        content = self.client.get("/projets/").content.decode()
+        assert re.findall(r"<script(?![^>]*\bsrc=)[^>]*>", content) == []
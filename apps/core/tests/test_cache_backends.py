@@ -0,0 +1,109 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.core.cache_backends import TwoTierCache
+
+
+def make_cache(**options):
+    return TwoTierCache("test", {"OPTIONS": {"SHARED_ALIAS": "default", "NOTIFY_CHANNEL": None, **options}})
+
+
+class TestTwoTierCache:
+    def test_get_populates_local_tier(self):
+        two_tier = make_cache()
+        cache.set("k", "v")
+        assert two_tier.get("k") == "v"
+        cache.delete("k")
+        assert two_tier.get("k") == "v"
+
+    def test_set_writes_shared_tier(self):
+        two_tier = make_cache()
+        two_tier.set("k", "v")
+        assert cache.get("k") == "v"
+
+    def test_writes_from_other_process_evicted_by_notification(self):
+        reader, writer = make_cache(), make_cache()
+        writer.set("k", "old")
+        assert reader.get("k") == "old"
+        cache.set("k", "new")
+        reader.handle_notification(json.dumps({"origin": writer._origin, "version": None, "keys": ["k"]}))
+        assert reader.get("k") == "new"
+
+    def test_own_notifications_ignored(self):
+        two_tier = make_cache()
+        two_tier.set("k", "v")
+        cache.delete("k")
+        two_tier.handle_notification(json.dumps({"origin": two_tier._origin, "version": None, "keys": ["k"]}))
+        assert two_tier.get("k") == "v"
+
+    def test_clear_all_notification(self):
+        two_tier = make_cache()
+        two_tier.set("k", "v")
+        cache.delete("k")
+        two_tier.handle_notification(json.dumps({"origin": "other", "version": None, "keys": ["*"]}))
+        assert two_tier.get("k") is None
+
+    def test_incr_goes_to_shared_tier(self):
+        first, second = make_cache(), make_cache()
+        first.add("counter", 0)
+        first.incr("counter")
+        second.incr("counter")
+        assert cache.get("counter") == 2
+
+    def test_incr_missing_key_raises(self):
+        with pytest.raises(ValueError):
+            make_cache().incr("missing")
+
+    def test_bypassed_keys_skip_local_tier(self):
+        two_tier = make_cache(LOCAL_BYPASS_PREFIXES=["rl:"])
+        two_tier.set("rl:ip", 1)
+        cache.set("rl:ip", 2)
+        assert two_tier.get("rl:ip") == 2
+        assert two_tier.get_many(["rl:ip"]) == {"rl:ip": 2}
+
+    def test_bypassed_keys_not_published(self):
+        two_tier = TwoTierCache("test", {"OPTIONS": {"SHARED_ALIAS": "default", "LOCAL_BYPASS_PREFIXES": ["rl:"]}})
+        with patch("apps.core.cache_backends.connections") as mock_connections:
+            two_tier.delete("rl:ip")
+        mock_connections.__getitem__.assert_not_called()
+
+    def test_listener_uses_database_options(self):
+        two_tier = TwoTierCache("test", {"OPTIONS": {"SHARED_ALIAS": "default"}})
+        with patch("apps.core.cache_backends.connections") as mock_connections, patch(
+            "apps.core.cache_backends.psycopg.connect", side_effect=OSError
+        ) as mock_connect, patch("apps.core.cache_backends.time.sleep", side_effect=SystemExit):
+            mock_connections.__getitem__.return_value.get_connection_params.return_value = {
+                "dbname": "geoconsulting",
+                "sslmode": "require",
+            }
+            with pytest.raises(SystemExit):
+                two_tier._listen()
+        assert mock_connect.call_args.kwargs == {"dbname": "geoconsulting", "sslmode": "require", "autocommit": True}
+
+
+@pytest.mark.django_db
+class TestPostgresCache:
+    @pytest.fixture
+    def pg_cache(self, settings):
+        from django.core.cache import caches
+        from django.core.management import call_command
+
+        settings.CACHES = {
+            **settings.CACHES,
+            "shared": {"BACKEND": "apps.core.cache_backends.PostgresCache", "LOCATION": "test_cache_table"},
+        }
+        call_command("createcachetable", "test_cache_table")
+        return caches["shared"]
+
+    def test_incr(self, pg_cache):
+        pg_cache.set("hits", 1)
+        assert pg_cache.incr("hits") == 2
+        assert pg_cache.incr("hits", 5) == 7
+        assert pg_cache.get("hits") == 7
+
+    def test_incr_missing_raises(self, pg_cache):
+        with pytest.raises(ValueError):
+            pg_cache.incr("missing")
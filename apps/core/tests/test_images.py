@@ -0,0 +1,106 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import InMemoryStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from PIL import Image as PILImage
+
+from apps.core.factories import TeamMemberFactory
+from apps.core.images import GENERATE_VARIANTS_TASK, build_variants, downscale_upload, generate_variants
+from apps.core.models import TeamMember
+from apps.jobs.models import Job
+from apps.projects.factories import ProjectFactory
+from apps.projects.models import Project
+
+
+def make_image(size, fmt="JPEG", mode="RGB"):
+    buf = BytesIO()
+    PILImage.new(mode, size, color="red").save(buf, format=fmt)
+    return buf.getvalue()
+
+
+class TestBuildVariants:
+    def test_generates_each_width_and_format(self):
+        storage = InMemoryStorage()
+        name = storage.save("projects/images/site.jpg", SimpleUploadedFile("site.jpg", make_image((2000, 1000))))
+        variants = build_variants(storage, name, (320, 640))
+        assert variants["source"] == name
+        assert set(variants["webp"]) == {"320", "640"}
+        assert set(variants["jpeg"]) == {"320", "640"}
+        with storage.open(variants["webp"]["320"]) as f:
+            img = PILImage.open(f)
+            assert img.format == "WEBP"
+            assert img.size == (320, 160)
+
+    def test_never_upscales(self):
+        storage = InMemoryStorage()
+        name = storage.save("team/a.png", SimpleUploadedFile("a.png", make_image((80, 80), "PNG", "RGBA")))
+        variants = build_variants(storage, name, (56, 100))
+        assert set(variants["jpeg"]) == {"56", "80"}
+
+    def test_undecodable_records_source_only(self):
+        storage = InMemoryStorage()
+        name = storage.save("site/logo.svg", SimpleUploadedFile("logo.svg", b"<svg></svg>"))
+        assert build_variants(storage, name, (640,)) == {"source": name}
+
+
+class TestDownscaleUpload:
+    def test_large_jpeg_downscaled_in_memory(self):
+        upload = SimpleUploadedFile("photo.jpg", make_image((1600, 1200)))
+        result = downscale_upload(upload, 100)
+        assert result.name == "photo.jpg"
+        img = PILImage.open(result)
+        assert img.format == "JPEG"
+        assert max(img.size) == 100
+
+    def test_small_image_untouched(self):
+        upload = SimpleUploadedFile("photo.png", make_image((50, 50), "PNG"))
+        assert downscale_upload(upload, 100) is upload
+
+
+class TestSrcsetTag:
+    def test_lists_current_variants(self):
+        project = Project(
+            image="projects/images/a.jpg",
+            image_variants={
+                "source": "projects/images/a.jpg",
+                "webp": {"640": "projects/images/a.640w.webp", "320": "projects/images/a.320w.webp"},
+            },
+        )
+        out = Template('{% load core_tags %}{% srcset project "image" %}').render(Context({"project": project}))
+        assert out == "/media/projects/images/a.320w.webp 320w, /media/projects/images/a.640w.webp 640w"
+
+    def test_ignores_stale_variants(self):
+        project = Project(
+            image="projects/images/new.jpg",
+            image_variants={"source": "projects/images/old.jpg", "webp": {"320": "projects/images/old.320w.webp"}},
+        )
+        out = Template('{% load core_tags %}{% responsive_image project "image" %}').render(Context({"project": project}))
+        assert 'src="/media/projects/images/new.jpg"' in out
+        assert "srcset" not in out
+
+
+@pytest.mark.django_db
+class TestGenerateVariants:
+    def test_stores_variants(self, tmp_path, settings):
+        settings.MEDIA_ROOT = str(tmp_path)
+        project = ProjectFactory(image=SimpleUploadedFile("p.jpg", make_image((800, 600))))
+        variants = generate_variants(project, "image")
+        project.refresh_from_db()
+        assert project.image_variants == variants
+        assert set(variants["webp"]) == {"320", "640", "800"}
+
+    def test_enqueued_on_upload(self, tmp_path, settings):
+        settings.MEDIA_ROOT = str(tmp_path)
+        project = ProjectFactory(image=SimpleUploadedFile("p.jpg", make_image((400, 300))))
+        job = Job.objects.get(task=GENERATE_VARIANTS_TASK)
+        assert job.payload == {"label": "projects.Project", "pk": project.pk, "field_name": "image"}
+
+    def test_skips_when_source_changed(self, tmp_path, settings):
+        settings.MEDIA_ROOT = str(tmp_path)
+        member = TeamMemberFactory(photo=SimpleUploadedFile("a.png", make_image((80, 80), "PNG")))
+        TeamMember.objects.filter(pk=member.pk).update(photo="team/other.png")
+        assert generate_variants(member, "photo") is None
+        member.refresh_from_db()
+        assert member.photo_variants == {}
@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from apps.articles.factories import ArticleFactory
+from apps.core import rendering
+from apps.core.factories import FAQFactory
+from apps.core.models import FAQ
+from apps.core.rendering import RENDERER_VERSION, render_markdown_cached
+from apps.projects.factories import ProjectFactory
+from apps.projects.models import Project
+
+
+class TestRenderMarkdownCached:
+    def setup_method(self):
+        rendering._cache.clear()
+
+    def test_renders_once_per_content(self):
+        with patch("apps.core.rendering.render_markdown", return_value="<p>x</p>") as mock_render:
+            render_markdown_cached("**x**")
+            render_markdown_cached("**x**")
+        assert mock_render.call_count == 1
+
+    def test_bounded(self):
+        for i in range(rendering.CACHE_MAX_ENTRIES + 10):
+            render_markdown_cached(f"item {i}")
+        assert len(rendering._cache) == rendering.CACHE_MAX_ENTRIES
+
+    def test_sanitizes(self):
+        assert "<script>" not in render_markdown_cached("<script>alert(1)</script>")
+
+
+@pytest.mark.django_db
+class TestStoredMarkdown:
+    def test_project_content_rendered_on_save(self):
+        project = ProjectFactory(content="**gras**")
+        assert project.content_html == "<p><strong>gras</strong></p>"
+        assert project.markdown_version == RENDERER_VERSION
+
+    def test_article_content_rendered_on_save(self):
+        article = ArticleFactory(content="*texte*")
+        assert "<em>texte</em>" in article.content_html
+
+    def test_faq_answer_rendered_on_save(self):
+        faq = FAQFactory(answer="- un\n- deux")
+        assert "<li>un</li>" in faq.answer_html
+        assert "<li>deux</li>" in faq.rendered_answer
+
+    def test_update_fields_with_source_rerenders(self):
+        faq = FAQFactory(answer="avant")
+        faq.answer = "**apres**"
+        faq.save(update_fields=["answer"])
+        faq.refresh_from_db()
+        assert "<strong>apres</strong>" in faq.answer_html
+
+    def test_outdated_version_falls_back_to_live_render(self):
+        project = ProjectFactory(content="**gras**")
+        Project.objects.filter(pk=project.pk).update(content_html="stale", markdown_version=0)
+        project.refresh_from_db()
+        assert "<strong>gras</strong>" in project.rendered_content
+
+    def test_rerender_command(self):
+        faq = FAQFactory(answer="**a**")
+        FAQ.objects.filter(pk=faq.pk).update(answer_html="", markdown_version=0)
+        call_command("rerender_markdown")
+        faq.refresh_from_db()
+        assert faq.answer_html == "<p><strong>a</strong></p>"
+        assert faq.markdown_version == RENDERER_VERSION
+
+    def test_rerender_command_dry_run(self):
+        faq = FAQFactory(answer="**a**")
+        FAQ.objects.filter(pk=faq.pk).update(answer_html="", markdown_version=0)
+        call_command("rerender_markdown", "--dry-run")
+        faq.refresh_from_db()
+        assert faq.answer_html == ""
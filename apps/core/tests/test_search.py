@@ -0,0 +1,172 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.articles.factories import ArticleFactory
+from apps.core import search
+from apps.core.cache import tag_versions
+from apps.core.factories import FAQFactory
+from apps.core.models import SearchDocument, SearchKind
+from apps.core.search import (
+    SEARCH_HITS_KEY,
+    cached_search,
+    flush_search_stats,
+    reindex_documents,
+    search_documents,
+    search_stats,
+    suggest,
+    sync_service_documents,
+)
+from apps.core.signals import SEARCH_TAG
+from apps.projects.factories import ProjectFactory
+from apps.projects.models import Project
+
+
+def kinds(text):
+    return [(doc.kind, doc.title) for doc in search_documents(text)]
+
+
+@pytest.mark.django_db
+class TestSearchDocumentTriggers:
+    def test_published_content_indexed(self):
+        project = ProjectFactory(title="Barrage de Kandadji", published=True)
+        ArticleFactory(title="Inauguration du barrage", published=True)
+        FAQFactory(question="Intervenez-vous sur les barrages ?")
+        results = kinds("barrage")
+        assert (SearchKind.PROJECT, "Barrage de Kandadji") in results
+        assert (SearchKind.ARTICLE, "Inauguration du barrage") in results
+        assert (SearchKind.FAQ, "Intervenez-vous sur les barrages ?") in results
+        assert search_documents("kandadji")[0].get_absolute_url() == project.get_absolute_url()
+
+    def test_unpublish_and_delete_remove_document(self):
+        project = ProjectFactory(title="Barrage de Kandadji", published=True)
+        faq = FAQFactory(question="Intervenez-vous sur les barrages ?")
+        project.published = False
+        project.save()
+        faq.delete()
+        assert kinds("barrage") == []
+
+    def test_bulk_update_reindexes(self):
+        ProjectFactory(title="Barrage de Kandadji", published=False)
+        Project.objects.update(published=True)
+        assert kinds("kandadji") == [(SearchKind.PROJECT, "Barrage de Kandadji")]
+
+    def test_title_outranks_body(self):
+        ProjectFactory(title="Pont de Gaya", description="Ouvrage sur le fleuve.", published=True)
+        ProjectFactory(title="Route Niamey-Say", description="Avec un petit pont.", published=True)
+        assert kinds("pont")[0] == (SearchKind.PROJECT, "Pont de Gaya")
+
+    def test_category_label(self):
+        ProjectFactory(title="Barrage de Kandadji", category="Hydraulique", published=True)
+        assert search_documents("kandadji")[0].category_label == "Hydraulique et assainissement"
+
+
+@pytest.mark.django_db
+class TestSyncServiceDocuments:
+    def test_services_indexed_once(self):
+        sync_service_documents()
+        sync_service_documents()
+        services = SearchDocument.objects.filter(kind=SearchKind.SERVICE)
+        assert services.count() == 3
+        assert (SearchKind.SERVICE, "Essai Laboratoire") in kinds("laboratoire")
+
+    def test_unchanged_services_keep_search_cache(self):
+        assert sync_service_documents() == 3
+        version = tag_versions([SEARCH_TAG])
+        assert sync_service_documents() == 0
+        assert tag_versions([SEARCH_TAG]) == version
+
+    def test_stale_service_removed(self):
+        SearchDocument.objects.create(kind=SearchKind.SERVICE, object_id="ancien", slug="ancien", title="Ancien")
+        sync_service_documents()
+        assert not SearchDocument.objects.filter(object_id="ancien").exists()
+
+    def test_reindex_rebuilds_everything(self):
+        ProjectFactory(title="Barrage de Kandadji", published=True)
+        SearchDocument.objects.all().delete()
+        counts = reindex_documents()
+        assert counts["Project"] == 1
+        assert kinds("kandadji") == [(SearchKind.PROJECT, "Barrage de Kandadji")]
+
+
+@pytest.mark.django_db
+class TestSuggest:
+    def test_prefix_match(self):
+        ProjectFactory(title="Route Agadez-Arlit", published=True)
+        assert [s["title"] for s in suggest("agad")] == ["Route Agadez-Arlit"]
+
+    def test_misspelling_falls_back_to_trigrams(self):
+        ProjectFactory(title="Forage pastoral", location="Tillia", published=True)
+        ProjectFactory(title="Pont de Bagaroua", published=False)
+        suggestions = suggest("Tilia")
+        assert suggestions == [{"kind": "Projet", "title": "Forage pastoral", "url": "/projets/forage-pastoral/"}]
+
+    def test_misspelled_article_title(self):
+        ArticleFactory(title="Sondages à Tillia", published=True)
+        suggestions = suggest("Tilia")
+        assert suggestions == [
+            {"kind": "Actualité", "title": "Sondages à Tillia", "url": "/actualites/sondages-a-tillia/"}
+        ]
+
+    def test_short_prefix_ignored(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert suggest(" a ") == []
+
+    def test_cached_per_prefix(self, django_assert_num_queries):
+        ProjectFactory(title="Route Agadez-Arlit", published=True)
+        suggest("Agad")
+        with django_assert_num_queries(0):
+            assert suggest("agad ")[0]["title"] == "Route Agadez-Arlit"
+
+    def test_cache_invalidated_on_publish(self, django_capture_on_commit_callbacks):
+        project = ProjectFactory(title="Route Agadez-Arlit", published=False)
+        assert suggest("agad") == []
+        project.published = True
+        with django_capture_on_commit_callbacks(execute=True):
+            project.save()
+        assert suggest("agad")[0]["title"] == "Route Agadez-Arlit"
+
+
+@pytest.mark.django_db
+class TestCachedSearch:
+    def test_normalized_query_served_from_cache(self, django_assert_num_queries):
+        ProjectFactory(title="Barrage de Kandadji", published=True)
+        assert [doc.title for doc in cached_search("Kandadji")] == ["Barrage de Kandadji"]
+        with django_assert_num_queries(0):
+            assert [doc.title for doc in cached_search("  kandadji ")] == ["Barrage de Kandadji"]
+        assert search_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_published_change_refreshes_results(self, django_capture_on_commit_callbacks):
+        cached_search("kandadji")
+        with django_capture_on_commit_callbacks(execute=True):
+            ProjectFactory(title="Barrage de Kandadji", published=True)
+        assert [doc.title for doc in cached_search("kandadji")] == ["Barrage de Kandadji"]
+
+    def test_draft_change_keeps_cache(self, django_capture_on_commit_callbacks):
+        cached_search("kandadji")
+        with django_capture_on_commit_callbacks(execute=True):
+            ArticleFactory(title="Brouillon Kandadji", published=False)
+        cached_search("kandadji")
+        assert search_stats()["hits"] == 1
+
+    def test_unpublish_refreshes_results(self, django_capture_on_commit_callbacks):
+        project = ProjectFactory(title="Barrage de Kandadji", published=True)
+        cached_search("kandadji")
+        project.published = False
+        with django_capture_on_commit_callbacks(execute=True):
+            project.save()
+        assert cached_search("kandadji") == []
+
+
+class TestSearchStats:
+    def test_counts_stay_in_process_until_flushed(self, monkeypatch):
+        monkeypatch.setattr(search, "_last_flush", time.monotonic())
+        with patch("apps.core.search.cache") as mock_cache:
+            search._count(SEARCH_HITS_KEY)
+            search._count(SEARCH_HITS_KEY)
+        assert not mock_cache.mock_calls
+        flush_search_stats()
+        flush_search_stats()
+        assert cache.get(SEARCH_HITS_KEY) == 2
@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+
+from apps.core.storage import SignedURLCacheS3Storage, hashed_name, public_storage
+
+
+def make_storage(**options):
+    return SignedURLCacheS3Storage(
+        access_key="key",
+        secret_key="secret",
+        bucket_name="bucket",
+        endpoint_url="https://account.r2.cloudflarestorage.com",
+        region_name="auto",
+        signature_version="s3v4",
+        querystring_expire=3600,
+        **options,
+    )
+
+
+class TestSignedURLCache:
+    def test_reuses_signed_url(self):
+        storage = make_storage()
+        with patch("storages.backends.s3.S3Storage.url", return_value="https://signed") as mock_url:
+            assert storage.url("docs/a.pdf") == "https://signed"
+            assert storage.url("docs/a.pdf") == "https://signed"
+        assert mock_url.call_count == 1
+
+    def test_resigns_after_margin(self):
+        storage = make_storage(url_cache_margin=600)
+        with patch("storages.backends.s3.S3Storage.url", side_effect=["https://one", "https://two"]), patch(
+            "apps.core.storage.time.monotonic", side_effect=[0, 2999, 3001]
+        ):
+            assert storage.url("docs/a.pdf") == "https://one"
+            assert storage.url("docs/a.pdf") == "https://one"
+            assert storage.url("docs/a.pdf") == "https://two"
+
+    def test_custom_parameters_not_cached(self):
+        storage = make_storage()
+        with patch("storages.backends.s3.S3Storage.url", return_value="https://signed") as mock_url:
+            storage.url("docs/a.pdf", parameters={"ResponseContentDisposition": "attachment"})
+            storage.url("docs/a.pdf", parameters={"ResponseContentDisposition": "attachment"})
+        assert mock_url.call_count == 2
+
+    def test_bounded(self):
+        storage = make_storage(url_cache_max_entries=2)
+        with patch("storages.backends.s3.S3Storage.url", return_value="https://signed"):
+            for i in range(5):
+                storage.url(f"docs/{i}.pdf")
+        assert len(storage._url_cache) == 2
+
+    def test_real_presign_is_stable(self):
+        storage = make_storage()
+        assert storage.url("docs/a.pdf") == storage.url("docs/a.pdf")
+
+
+class TestPublicStorage:
+    def test_hashed_name_depends_on_content(self):
+        first = hashed_name("team/photo.jpg", ContentFile(b"one"))
+        second = hashed_name("team/photo.jpg", ContentFile(b"two"))
+        assert first != second
+        assert first.startswith("team/photo.") and first.endswith(".jpg")
+
+    def test_falls_back_to_default_storage(self):
+        assert public_storage() is storages["default"]
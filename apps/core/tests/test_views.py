@@ -134,15 +134,42 @@ class TestSearchView:
         response = self.client.get("/recherche/?q=route")
         assert response.status_code == 200
         assert response.context["query"] == "route"
-        assert "services" in response.context
+        assert "results" in response.context
 
     def test_search_service_matching(self):
         response = self.client.get("/recherche/?q=laboratoire")
         assert response.status_code == 200
-        matched = response.context.get("services", [])
-        slugs = [s["slug"] for s in matched]
+        slugs = [result.slug for result in response.context["results"] if result.kind == "service"]
         assert "essai-laboratoire" in slugs
 
+    def test_search_single_ranked_query(self, django_assert_num_queries):
+        ProjectFactory(title="Route de Dosso", published=True)
+        FAQFactory(question="Construisez-vous des routes ?")
+        with django_assert_num_queries(1):
+            response = self.client.get("/recherche/?q=route", HTTP_HX_REQUEST="true")
+        content = response.content.decode()
+        assert "Route de Dosso" in content
+        assert "Construisez-vous des routes ?" in content
+
+    def test_repeated_search_served_from_cache(self, django_assert_num_queries):
+        ProjectFactory(title="Route de Dosso", published=True)
+        self.client.get("/recherche/?q=route")
+        with django_assert_num_queries(0):
+            response = self.client.get("/recherche/?q=Route", HTTP_HX_REQUEST="true")
+        assert "Route de Dosso" in response.content.decode()
+
+    def test_search_no_results_offers_suggestions(self):
+        ProjectFactory(title="Forage pastoral", location="Tillia", published=True)
+        response = self.client.get("/recherche/?q=Tilia")
+        assert [s["title"] for s in response.context["suggestions"]] == ["Forage pastoral"]
+
+    def test_suggestions_endpoint(self):
+        ProjectFactory(title="Route Agadez-Arlit", published=True)
+        response = self.client.get("/recherche/suggestions/?q=agad")
+        assert response.status_code == 200
+        assert "Route Agadez-Arlit" in response.content.decode()
+        assert "max-age=60" in response["Cache-Control"]
+
     def test_search_htmx_returns_partial(self):
         response = self.client.get("/recherche/?q=test", HTTP_HX_REQUEST="true")
         assert response.status_code == 200
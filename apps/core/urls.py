@@ -1,6 +1,13 @@
 from django.urls import path
 
-from apps.core.views import AboutView, FAQView, SearchView, ServiceDetailView, ServicesView
+from apps.core.views import (
+    AboutView,
+    FAQView,
+    SearchSuggestionsView,
+    SearchView,
+    ServiceDetailView,
+    ServicesView,
+)
 
 urlpatterns = [
     path("a-propos/", AboutView.as_view(), name="about"),
@@ -8,4 +15,5 @@ urlpatterns = [
     path("services/<slug:slug>/", ServiceDetailView.as_view(), name="service_detail"),
     path("faq/", FAQView.as_view(), name="faq"),
     path("recherche/", SearchView.as_view(), name="search"),
+    path("recherche/suggestions/", SearchSuggestionsView.as_view(), name="search_suggestions"),
 ]
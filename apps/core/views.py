@@ -1,13 +1,17 @@
 from collections import OrderedDict
 
-from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.conf import settings
 from django.http import Http404
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
 from django.views.generic import ListView, TemplateView
 
 from django.db import models as db_models
 
 from apps.articles.models import Article
-from apps.core.models import FAQ, Department, Division, FAQCategory, SiteSetting, TeamMember
+from apps.core.cache import cache_page_tagged
+from apps.core.models import FAQ, Department, Division, FAQCategory, SearchDocument, SiteSetting, TeamMember
+from apps.core.search import cached_search, suggest
 from apps.projects.models import Project
 
 SERVICES = [
@@ -53,7 +57,13 @@ SERVICES = [
 
 SERVICES_BY_SLUG = {s["slug"]: s for s in SERVICES}
 
+SUGGESTION_MAX_AGE = 60
 
+
+@method_decorator(
+    cache_page_tagged(settings.PAGE_CACHE_TIMEOUT, ["project-list", "article-list", "team"]),
+    name="dispatch",
+)
 class HomeView(TemplateView):
     template_name = "pages/home.html"
 
@@ -73,6 +83,7 @@ class HomeView(TemplateView):
         return context
 
 
+@method_decorator(cache_page_tagged(settings.PAGE_CACHE_TIMEOUT, ["team", "site-settings"]), name="dispatch")
 class AboutView(TemplateView):
     template_name = "pages/about.html"
 
@@ -156,6 +167,7 @@ class ServiceDetailView(TemplateView):
         return context
 
 
+@method_decorator(cache_page_tagged(settings.PAGE_CACHE_TIMEOUT, ["faq"]), name="dispatch")
 class FAQView(TemplateView):
     template_name = "pages/faq.html"
 
@@ -175,41 +187,29 @@ class SearchView(ListView):
     context_object_name = "results"
 
     def get_queryset(self):
-        return []
+        self.query = self.request.GET.get("q", "").strip()[:200]
+        if not self.query:
+            return SearchDocument.objects.none()
+        return cached_search(self.query)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        query = self.request.GET.get("q", "").strip()[:200]
-        context["query"] = query
-
-        if query:
-            search_query = SearchQuery(query, config="french")
-
-            projects = (
-                Project.objects.filter(published=True, search_vector=search_query)
-                .annotate(rank=SearchRank("search_vector", search_query))
-                .order_by("-rank")[:5]
-            )
-            articles = (
-                Article.objects.filter(published=True, search_vector=search_query)
-                .annotate(rank=SearchRank("search_vector", search_query))
-                .order_by("-rank")[:5]
-            )
-
-            query_lower = query.lower()
-            matched_services = [
-                s for s in SERVICES
-                if query_lower in s["name"].lower()
-                or any(query_lower in item.lower() for item in s["items"])
-            ]
-
-            context["projects"] = projects
-            context["articles"] = articles
-            context["services"] = matched_services
-
+        context["query"] = self.query
+        if self.query and not context["results"]:
+            context["suggestions"] = suggest(self.query)
         return context
 
     def get_template_names(self):
         if self.request.headers.get("HX-Request") == "true":
             return ["partials/_search_results.html"]
         return [self.template_name]
+
+
+@method_decorator(cache_control(public=True, max_age=SUGGESTION_MAX_AGE), name="dispatch")
+class SearchSuggestionsView(TemplateView):
+    template_name = "partials/_search_suggestions.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["suggestions"] = suggest(self.request.GET.get("q", ""))
+        return context
@@ -0,0 +1,49 @@
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+
+from apps.jobs.models import DeadJob, Job
+from apps.jobs.services import retry_jobs
+
+
+@admin.action(description="Relancer les tâches sélectionnées")
+def retry_selected(modeladmin, request, queryset):
+    count = retry_jobs(queryset)
+    modeladmin.message_user(request, f"{count} tâche(s) relancée(s).")
+
+
+@admin.register(Job)
+class JobAdmin(ModelAdmin):
+    list_display: tuple[str, ...] = ("__str__", "status", "attempts", "run_at", "created_at", "finished_at")
+    list_filter: tuple[str, ...] = ("status", "task", "created_at")
+    search_fields = ("task", "last_error")
+    readonly_fields = (
+        "task",
+        "payload",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_at",
+        "locked_at",
+        "locked_by",
+        "last_error",
+        "created_at",
+        "finished_at",
+    )
+    actions = [retry_selected]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DeadJob)
+class DeadJobAdmin(JobAdmin):
+    list_display = ("__str__", "attempts", "error_summary", "finished_at")
+    list_filter = ("task", "finished_at")
+
+    @admin.display(description="Erreur")
+    def error_summary(self, obj):
+        lines = obj.last_error.strip().splitlines()
+        return lines[-1] if lines else ""
@@ -0,0 +1,36 @@
+import base64
+import pickle
+
+from django.core.mail.backends.base import BaseEmailBackend
+
+from apps.jobs.services import enqueue
+
+SEND_EMAIL_TASK = "jobs.send_email"
+
+
+def serialize_message(message):
+    connection, message.connection = message.connection, None
+    try:
+        return base64.b64encode(pickle.dumps(message)).decode("ascii")
+    finally:
+        message.connection = connection
+
+
+def deserialize_message(data):
+    return pickle.loads(base64.b64decode(data))
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        queued = 0
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            try:
+                enqueue(SEND_EMAIL_TASK, message=serialize_message(message))
+            except Exception:
+                if not self.fail_silently:
+                    raise
+                continue
+            queued += 1
+        return queued
@@ -0,0 +1,11 @@
+import factory
+
+from apps.jobs.models import Job
+
+
+class JobFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Job
+
+    task = "tests.noop"
+    payload = factory.Dict({})
@@ -0,0 +1,89 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.core.enums import JobStatus
+from apps.jobs.models import Job
+from apps.jobs.services import claim_job, purge_finished_jobs, requeue_stale_jobs, run_job
+
+MAINTENANCE_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the database queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=2, help="Number of worker threads")
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling forever",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            due = (
+                Job.objects.filter(status=JobStatus.PENDING, run_at__lte=timezone.now())
+                .values("task")
+                .annotate(total=Count("pk"))
+                .order_by("task")
+            )
+            for row in due:
+                self.stdout.write(f"  {row['task']}: {row['total']}")
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        workers = [
+            threading.Thread(
+                target=self.work,
+                args=(f"{prefix}:{i}", stop, options["once"], options["sleep"]),
+                name=f"job-worker-{i}",
+            )
+            for i in range(max(options["concurrency"], 1))
+        ]
+        self.stdout.write(f"Starting {len(workers)} job worker(s)")
+
+        requeue_stale_jobs()
+        for worker in workers:
+            worker.start()
+        last_maintenance = time.monotonic()
+        while any(worker.is_alive() for worker in workers):
+            time.sleep(1)
+            if time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                close_old_connections()
+                requeue_stale_jobs()
+                purge_finished_jobs()
+                last_maintenance = time.monotonic()
+        connections.close_all()
+        self.stdout.write(self.style.SUCCESS("Job workers stopped."))
+
+    def work(self, worker_id, stop, once, sleep):
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                job = claim_job(worker_id)
+                if job is None:
+                    if once:
+                        break
+                    stop.wait(sleep)
+                    continue
+                run_job(job)
+        finally:
+            connections.close_all()
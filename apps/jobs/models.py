@@ -0,0 +1,46 @@
+from typing import ClassVar
+
+from django.db import models
+from django.utils import timezone
+
+from apps.core.enums import JobStatus
+
+
+class Job(models.Model):
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Tâche"
+        verbose_name_plural = "Tâches"
+        indexes = [
+            models.Index(fields=["run_at"], condition=models.Q(status=JobStatus.PENDING), name="jobs_job_pending_idx"),
+            models.Index(fields=["status", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk}"
+
+
+class DeadJobManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(status=JobStatus.DEAD)
+
+
+class DeadJob(Job):
+    objects: ClassVar[DeadJobManager] = DeadJobManager()
+
+    class Meta:
+        proxy = True
+        verbose_name = "Tâche en échec"
+        verbose_name_plural = "Tâches en échec"
@@ -0,0 +1,115 @@
+import logging
+import traceback
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from apps.audit.services import audit_buffer
+from apps.core.enums import JobStatus
+from apps.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE = 30
+BACKOFF_MAX = 60 * 60
+LOCK_TIMEOUT = timedelta(minutes=15)
+RETENTION = timedelta(days=7)
+
+TASKS: dict[str, Callable[..., Any]] = {}
+
+
+def task(name):
+    def decorator(func):
+        TASKS[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(name, *, run_at=None, max_attempts=None, **payload):
+    if name not in TASKS:
+        raise LookupError(f"Unknown task: {name}")
+    fields = {"task": name, "payload": payload, "run_at": run_at or timezone.now()}
+    if max_attempts is not None:
+        fields["max_attempts"] = max_attempts
+    return Job.objects.create(**fields)
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** max(attempts - 1, 0), BACKOFF_MAX))
+
+
+def claim_job(worker_id):
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=JobStatus.PENDING, run_at__lte=now)
+            .order_by("run_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        job.locked_by = worker_id
+        job.save(update_fields=["status", "attempts", "locked_at", "locked_by"])
+    return job
+
+
+def run_job(job):
+    try:
+        func = TASKS.get(job.task)
+        if func is None:
+            raise LookupError(f"Unknown task: {job.task}")
+        with audit_buffer():
+            func(**job.payload)
+    except Exception:
+        logger.exception("Job %s failed (attempt %s/%s)", job, job.attempts, job.max_attempts)
+        mark_failed(job, traceback.format_exc())
+        return False
+    Job.objects.filter(pk=job.pk).update(
+        status=JobStatus.DONE, finished_at=timezone.now(), locked_at=None, last_error=""
+    )
+    return True
+
+
+def mark_failed(job, error):
+    now = timezone.now()
+    fields = {"locked_at": None, "last_error": error}
+    if job.attempts >= job.max_attempts:
+        fields.update(status=JobStatus.DEAD, finished_at=now)
+    else:
+        fields.update(status=JobStatus.PENDING, run_at=now + backoff(job.attempts))
+    Job.objects.filter(pk=job.pk).update(**fields)
+
+
+def requeue_stale_jobs():
+    now = timezone.now()
+    exhausted = Q(attempts__gte=F("max_attempts"))
+    return Job.objects.filter(status=JobStatus.RUNNING, locked_at__lt=now - LOCK_TIMEOUT).update(
+        status=Case(When(exhausted, then=Value(JobStatus.DEAD)), default=Value(JobStatus.PENDING)),
+        finished_at=Case(When(exhausted, then=Value(now)), default=None),
+        locked_at=None,
+        last_error="Worker lock expired",
+    )
+
+
+def purge_finished_jobs():
+    return Job.objects.filter(status=JobStatus.DONE, finished_at__lt=timezone.now() - RETENTION).delete()[0]
+
+
+def retry_jobs(queryset):
+    return queryset.exclude(status=JobStatus.RUNNING).update(
+        status=JobStatus.PENDING,
+        attempts=0,
+        run_at=timezone.now(),
+        locked_at=None,
+        locked_by="",
+        finished_at=None,
+    )
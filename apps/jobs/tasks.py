@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.core.mail import get_connection
+
+from apps.jobs.backends import SEND_EMAIL_TASK, deserialize_message
+from apps.jobs.services import task
+
+
+@task(SEND_EMAIL_TASK)
+def send_email(message):
+    email = deserialize_message(message)
+    with get_connection(settings.JOBS_EMAIL_BACKEND) as connection:
+        connection.send_messages([email])
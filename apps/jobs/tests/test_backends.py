@@ -0,0 +1,32 @@
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives, send_mail
+
+from apps.jobs.backends import SEND_EMAIL_TASK
+from apps.jobs.models import Job
+from apps.jobs.services import claim_job, run_job
+
+
+@pytest.mark.django_db
+class TestQueuedEmailBackend:
+    @pytest.fixture(autouse=True)
+    def queued_backend(self, settings):
+        settings.EMAIL_BACKEND = "apps.jobs.backends.QueuedEmailBackend"
+        settings.JOBS_EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+    def test_send_mail_is_queued(self):
+        assert send_mail("Sujet", "Corps", "from@example.com", ["to@example.com"]) == 1
+        assert Job.objects.filter(task=SEND_EMAIL_TASK).count() == 1
+        assert mail.outbox == []
+
+    def test_worker_delivers_message(self):
+        message = EmailMultiAlternatives("Sujet", "Texte", "from@example.com", ["to@example.com"])
+        message.attach_alternative("<p>HTML</p>", "text/html")
+        message.send()
+        assert run_job(claim_job("worker")) is True
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].alternatives[0][0] == "<p>HTML</p>"
+
+    def test_no_recipients_not_queued(self):
+        assert send_mail("Sujet", "Corps", "from@example.com", []) == 0
+        assert not Job.objects.exists()
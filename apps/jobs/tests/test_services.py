@@ -0,0 +1,99 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.core.enums import JobStatus
+from apps.jobs.factories import JobFactory
+from apps.jobs.models import DeadJob, Job
+from apps.jobs.services import (
+    BACKOFF_BASE,
+    LOCK_TIMEOUT,
+    TASKS,
+    backoff,
+    claim_job,
+    enqueue,
+    requeue_stale_jobs,
+    retry_jobs,
+    run_job,
+)
+
+
+@pytest.fixture
+def noop_task():
+    calls = []
+    with patch.dict(TASKS, {"tests.noop": lambda **kwargs: calls.append(kwargs)}):
+        yield calls
+
+
+@pytest.fixture
+def failing_task():
+    def fail(**kwargs):
+        raise RuntimeError("boom")
+
+    with patch.dict(TASKS, {"tests.noop": fail}):
+        yield
+
+
+class TestBackoff:
+    def test_doubles_per_attempt(self):
+        assert backoff(1) == timedelta(seconds=BACKOFF_BASE)
+        assert backoff(3) == timedelta(seconds=BACKOFF_BASE * 4)
+
+    def test_capped(self):
+        assert backoff(50) == timedelta(hours=1)
+
+
+@pytest.mark.django_db
+class TestQueue:
+    def test_enqueue_unknown_task_rejected(self):
+        with pytest.raises(LookupError):
+            enqueue("tests.missing")
+
+    def test_enqueue_and_run(self, noop_task):
+        enqueue("tests.noop", value=1)
+        job = claim_job("worker")
+        assert job.status == JobStatus.RUNNING
+        assert job.attempts == 1
+        assert run_job(job) is True
+        job.refresh_from_db()
+        assert job.status == JobStatus.DONE
+        assert noop_task == [{"value": 1}]
+
+    def test_claim_skips_future_jobs(self, noop_task):
+        JobFactory(run_at=timezone.now() + timedelta(minutes=5))
+        assert claim_job("worker") is None
+
+    def test_failure_schedules_retry(self, failing_task):
+        JobFactory()
+        job = claim_job("worker")
+        assert run_job(job) is False
+        job.refresh_from_db()
+        assert job.status == JobStatus.PENDING
+        assert job.run_at > timezone.now()
+        assert "boom" in job.last_error
+
+    def test_exhausted_job_is_dead(self, failing_task):
+        JobFactory(max_attempts=1)
+        run_job(claim_job("worker"))
+        assert DeadJob.objects.count() == 1
+
+    def test_stale_lock_requeued(self):
+        job = JobFactory(status=JobStatus.RUNNING, attempts=1, locked_at=timezone.now() - LOCK_TIMEOUT * 2)
+        assert requeue_stale_jobs() == 1
+        job.refresh_from_db()
+        assert job.status == JobStatus.PENDING
+
+    def test_retry_resets_dead_jobs(self):
+        job = JobFactory(status=JobStatus.DEAD, attempts=5, finished_at=timezone.now())
+        retry_jobs(Job.objects.all())
+        job.refresh_from_db()
+        assert job.status == JobStatus.PENDING
+        assert job.attempts == 0
+
+    def test_run_jobs_command_drains_queue(self, noop_task):
+        JobFactory.create_batch(3)
+        call_command("run_jobs", "--once", "--concurrency=1")
+        assert Job.objects.filter(status=JobStatus.DONE).count() == 3
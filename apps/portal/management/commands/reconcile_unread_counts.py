@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts.models import Profile
+from apps.portal.services import actual_unread_count, unread_count_drift
+
+
+class Command(BaseCommand):
+    help = "Repair drift between Profile.unread_messages and actual unread messages"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        drifted = list(unread_count_drift().select_related("user"))
+        for profile in drifted:
+            self.stdout.write(f"  {profile.user.email}: {profile.unread_messages} -> {profile.actual}")
+        if drifted and not options["dry_run"]:
+            Profile.objects.filter(pk__in=[p.pk for p in drifted]).update(unread_messages=actual_unread_count())
+        self.stdout.write(self.style.SUCCESS(f"Profiles out of sync: {len(drifted)}"))
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.accounts.models import Profile
+from apps.portal.models import Message
+
+
+def get_unread_count(request):
+    if not hasattr(request, "_unread_count"):
+        request._unread_count = (
+            Profile.objects.filter(user_id=request.user.pk)
+            .values_list("unread_messages", flat=True)
+            .first()
+        ) or 0
+    return request._unread_count
+
+
+def adjust_unread_count(user_id, delta):
+    if user_id is None or not delta:
+        return
+    Profile.objects.filter(user_id=user_id).update(
+        unread_messages=Greatest(F("unread_messages") + delta, 0)
+    )
+
+
+def mark_message_read(message):
+    with transaction.atomic():
+        updated = Message.objects.filter(pk=message.pk, read=False).update(read=True)
+        if updated:
+            adjust_unread_count(message.to_user_id, -1)
+    message.read = True
+    return bool(updated)
+
+
+def actual_unread_count():
+    unread = (
+        Message.objects.filter(to_user_id=OuterRef("user_id"), read=False)
+        .order_by()
+        .values("to_user_id")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(unread), 0)
+
+
+def unread_count_drift():
+    return Profile.objects.annotate(actual=actual_unread_count()).filter(~Q(unread_messages=F("actual")))
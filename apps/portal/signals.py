@@ -1,7 +1,8 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from apps.portal.models import ClientProject
+from apps.portal.models import ClientProject, Message
+from apps.portal.services import adjust_unread_count
 from apps.projects.models import Project, ProjectDocument
 
 
@@ -91,3 +92,30 @@ def on_project_status_changed(sender, instance, created, **kwargs):
         },
         recipient_list=recipient_emails,
     )
+
+
+def _unread_recipient(to_user_id, read):
+    return None if read else to_user_id
+
+
+@receiver(pre_save, sender=Message)
+def on_message_pre_save(sender, instance, **kwargs):
+    instance._old_unread_recipient = None
+    if instance.pk:
+        old = Message.objects.filter(pk=instance.pk).values_list("to_user_id", "read").first()
+        if old:
+            instance._old_unread_recipient = _unread_recipient(*old)
+
+
+@receiver(post_save, sender=Message)
+def on_message_saved(sender, instance, **kwargs):
+    old_recipient = getattr(instance, "_old_unread_recipient", None)
+    new_recipient = _unread_recipient(instance.to_user_id, instance.read)
+    if old_recipient != new_recipient:
+        adjust_unread_count(old_recipient, -1)
+        adjust_unread_count(new_recipient, 1)
+
+
+@receiver(post_delete, sender=Message)
+def on_message_deleted(sender, instance, **kwargs):
+    adjust_unread_count(_unread_recipient(instance.to_user_id, instance.read), -1)
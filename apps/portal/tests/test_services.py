@@ -0,0 +1,91 @@
+import pytest
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from apps.accounts.factories import UserFactory
+from apps.accounts.models import Profile
+from apps.portal.factories import MessageFactory
+from apps.portal.services import get_unread_count, mark_message_read
+
+
+def unread(user):
+    return Profile.objects.get(user=user).unread_messages
+
+
+@pytest.mark.django_db
+class TestUnreadCounter:
+    def test_incremented_on_create(self):
+        user = UserFactory()
+        MessageFactory(to_user=user)
+        MessageFactory(to_user=user, read=True)
+        assert unread(user) == 1
+
+    def test_mark_read_decrements_once(self):
+        user = UserFactory()
+        msg = MessageFactory(to_user=user)
+        assert mark_message_read(msg) is True
+        assert mark_message_read(msg) is False
+        assert unread(user) == 0
+
+    def test_delete_unread_decrements(self):
+        user = UserFactory()
+        msg = MessageFactory(to_user=user)
+        msg.delete()
+        assert unread(user) == 0
+
+    def test_save_toggling_read(self):
+        user = UserFactory()
+        msg = MessageFactory(to_user=user)
+        msg.read = True
+        msg.save()
+        assert unread(user) == 0
+        msg.read = False
+        msg.save()
+        assert unread(user) == 1
+
+    def test_recipient_change_moves_count(self):
+        first, second = UserFactory(), UserFactory()
+        msg = MessageFactory(to_user=first)
+        msg.to_user = second
+        msg.save()
+        assert unread(first) == 0
+        assert unread(second) == 1
+
+    def test_never_negative(self):
+        user = UserFactory()
+        msg = MessageFactory(to_user=user)
+        Profile.objects.filter(user=user).update(unread_messages=0)
+        msg.delete()
+        assert unread(user) == 0
+
+    def test_request_memo(self, django_assert_num_queries):
+        user = UserFactory()
+        MessageFactory(to_user=user)
+        request = RequestFactory().get("/")
+        request.user = user
+        with django_assert_num_queries(1):
+            assert get_unread_count(request) == 1
+            assert get_unread_count(request) == 1
+
+    def test_reconcile_command(self):
+        user = UserFactory()
+        MessageFactory(to_user=user)
+        MessageFactory(to_user=user)
+        Profile.objects.filter(user=user).update(unread_messages=7)
+        call_command("reconcile_unread_counts")
+        assert unread(user) == 2
+
+    def test_reconcile_dry_run(self):
+        user = UserFactory()
+        MessageFactory(to_user=user)
+        Profile.objects.filter(user=user).update(unread_messages=7)
+        call_command("reconcile_unread_counts", "--dry-run")
+        assert unread(user) == 7
+
+    def test_profile_save_keeps_counter(self):
+        user = UserFactory()
+        profile = user.profile
+        MessageFactory(to_user=user)
+        profile.phone = "+227 00 00 00 00"
+        profile.save()
+        assert unread(user) == 1
@@ -1,6 +1,9 @@
 import pytest
 from django.contrib.auth.models import Group
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from apps.accounts.factories import StaffUserFactory, UserFactory
 from apps.core.enums import AccessLevel, ProjectStatus
@@ -76,6 +79,34 @@ class TestPortalDashboard:
         assert p.pk in badge_map
         assert badge_map[p.pk] >= 1
 
+    def test_badge_counts_only_documents_since_last_access(self, client_group):
+        user = make_client_user(client_group)
+        p = ProjectFactory()
+        ProjectDocumentFactory(project=p)
+        ClientProjectFactory(user=user, project=p, last_accessed=timezone.now())
+        ProjectDocumentFactory(project=p)
+        ProjectDocumentFactory(project=p)
+        c = Client()
+        c.force_login(user)
+        response = c.get("/portail/")
+        assert response.context["badge_map"][p.pk] == 2
+
+    def test_query_count_independent_of_project_count(self, client_group):
+        def dashboard_queries(user):
+            c = Client()
+            c.force_login(user)
+            with CaptureQueriesContext(connection) as ctx:
+                c.get("/portail/")
+            return len(ctx.captured_queries)
+
+        few = make_client_user(client_group)
+        many = make_client_user(client_group)
+        ClientProjectFactory(user=few)
+        for _ in range(8):
+            cp = ClientProjectFactory(user=many)
+            ProjectDocumentFactory(project=cp.project)
+        assert dashboard_queries(few) == dashboard_queries(many)
+
     def test_activities_in_context(self, client_group):
         user = make_client_user(client_group)
         p = ProjectFactory()
@@ -1,7 +1,6 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
-from django.core.files.storage import default_storage
-from django.db.models import OuterRef, Q, Subquery
+from django.db.models import Count, F, Q
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
@@ -19,6 +18,7 @@ from apps.portal.forms import (
     ProjectCommentForm,
 )
 from apps.portal.models import ClientProject, Message, ProjectComment
+from apps.portal.services import get_unread_count, mark_message_read
 from apps.projects.models import Project, ProjectDocument
 
 
@@ -40,9 +40,7 @@ class ClientPortalMixin(LoginRequiredMixin):
         context = super().get_context_data(**kwargs)
         if hasattr(self.request, "user") and self.request.user.is_authenticated:
             if not self.request.user.is_staff:
-                context["unread_count"] = Message.objects.filter(
-                    to_user=self.request.user, read=False
-                ).count()
+                context["unread_count"] = get_unread_count(self.request)
         return context
 
 
@@ -53,29 +51,22 @@ class PortalDashboardView(ClientPortalMixin, ListView):
     def get_queryset(self):
         if self.request.user.is_staff:
             return Project.objects.all()
+        new_documents = Q(client_projects__last_accessed__isnull=True) | Q(
+            documents__created_at__gt=F("client_projects__last_accessed")
+        )
         return Project.objects.filter(
             client_projects__user=self.request.user
         ).annotate(
-            user_access_level=Subquery(
-                ClientProject.objects.filter(
-                    user=self.request.user, project=OuterRef("pk")
-                ).values("access_level")[:1]
-            )
-        ).distinct()
+            user_access_level=F("client_projects__access_level"),
+            new_document_count=Count("documents", filter=new_documents),
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
 
         if not user.is_staff:
-            accesses = ClientProject.objects.filter(user=user).select_related("project")
-            badge_map = {}
-            for cp in accesses:
-                doc_qs = ProjectDocument.objects.filter(project=cp.project)
-                if cp.last_accessed:
-                    doc_qs = doc_qs.filter(created_at__gt=cp.last_accessed)
-                badge_map[cp.project_id] = doc_qs.count()
-            context["badge_map"] = badge_map
+            context["badge_map"] = {p.pk: p.new_document_count for p in context["projects"]}
 
         project_ids = [p.pk for p in context["projects"]]
         recent_docs = ProjectDocument.objects.filter(
@@ -188,8 +179,7 @@ class DocumentDownloadView(ClientPortalMixin, View):
                 user=request.user, project=document.project
             ).exists():
                 raise PermissionDenied
-        url = default_storage.url(document.file.name)
-        return redirect(url)
+        return redirect(document.file.url)
 
 
 class MessageListView(ClientPortalMixin, ListView):
@@ -231,17 +221,15 @@ class MessageDetailView(ClientPortalMixin, DetailView):
 
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
-        if obj.to_user == self.request.user and not obj.read:
-            obj.read = True
-            obj.save(update_fields=["read"])
+        if obj.to_user_id == self.request.user.pk and not obj.read:
+            mark_message_read(obj)
         return obj
 
 
 class MarkAsReadView(ClientPortalMixin, View):
     def post(self, request, pk):
         message = get_object_or_404(Message, pk=pk, to_user=request.user)
-        message.read = True
-        message.save(update_fields=["read"])
+        mark_message_read(message)
         return HttpResponse(status=204)
 
 
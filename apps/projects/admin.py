@@ -1,7 +1,8 @@
 from django.contrib import admin
-from django.core.cache import cache
 from unfold.admin import ModelAdmin, TabularInline
 
+from apps.core.cache import invalidate_tags_on_commit
+from apps.core.signals import SEARCH_TAG, project_tags
 from apps.projects.models import Project, ProjectDocument
 
 
@@ -19,12 +20,16 @@ class ProjectDocumentInline(TabularInline):
 
 @admin.action(description="Publier les projets sélectionnés")
 def bulk_publish(modeladmin, request, queryset):
+    slugs = list(queryset.values_list("slug", flat=True))
     queryset.update(published=True)
+    invalidate_tags_on_commit(SEARCH_TAG, *project_tags(*slugs))
 
 
 @admin.action(description="Dépublier les projets sélectionnés")
 def bulk_unpublish(modeladmin, request, queryset):
+    slugs = list(queryset.values_list("slug", flat=True))
     queryset.update(published=False)
+    invalidate_tags_on_commit(SEARCH_TAG, *project_tags(*slugs))
 
 
 @admin.register(Project)
@@ -40,7 +45,6 @@ class ProjectAdmin(ModelAdmin):
         if not obj.pk:
             obj.created_by = request.user
         super().save_model(request, obj, form, change)
-        cache.clear()
 
 
 @admin.register(ProjectDocument)
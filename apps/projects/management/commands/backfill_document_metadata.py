@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.projects.models import ProjectDocument
+
+
+class Command(BaseCommand):
+    help = "Record size, content type and SHA-256 for documents uploaded before they were stored"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print what would be done without making changes",
+        )
+
+    def handle(self, *args, **options):
+        qs = ProjectDocument.objects.filter(Q(file_size__isnull=True) | Q(checksum="")).exclude(file="")
+        self.stdout.write(f"Documents missing metadata: {qs.count()}")
+        if options["dry_run"]:
+            return
+
+        updated = failed = 0
+        for doc in qs.iterator():
+            try:
+                doc.record_file_metadata()
+            except Exception as exc:
+                self.stderr.write(self.style.WARNING(f"  {doc.file.name}: {exc}"))
+                failed += 1
+                continue
+            finally:
+                doc.file.close()
+            doc.save(update_fields=["file_size", "content_type", "checksum"])
+            updated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Updated: {updated}, failed: {failed}"))
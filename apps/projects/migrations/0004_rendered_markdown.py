@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0003_alter_project_image_alter_projectdocument_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="content_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="markdown_version",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0004_rendered_markdown"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="projectdocument",
+            index=models.Index(fields=["project", "created_at"], name="projects_pr_project_32a72c_idx"),
+        ),
+    ]
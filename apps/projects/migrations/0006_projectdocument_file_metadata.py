@@ -0,0 +1,28 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0005_projectdocument_project_created_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectdocument",
+            name="checksum",
+            field=models.CharField(blank=True, editable=False, help_text="SHA-256", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="projectdocument",
+            name="content_type",
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="projectdocument",
+            name="file_size",
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
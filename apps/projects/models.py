@@ -1,3 +1,6 @@
+import hashlib
+import mimetypes
+
 from django.conf import settings
 from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.search import SearchVectorField
@@ -5,21 +8,29 @@ from django.db import models
 from django.urls import reverse
 
 from apps.core.enums import ProjectCategory, ProjectStatus
-from apps.core.models import TimestampMixin
+from apps.core.models import RenderedMarkdownMixin, TimestampMixin
+from apps.core.storage import public_storage
 from apps.core.validators import validate_document_file, validate_image_file
 
 
-class Project(TimestampMixin):
+class Project(RenderedMarkdownMixin, TimestampMixin):
+    markdown_fields = {"content": "content_html"}
+    variant_widths = {"image": (320, 640, 1024, 1600)}
+
     title = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True)
     description = models.TextField(blank=True)
     content = models.TextField(blank=True, help_text="Contenu en Markdown")
+    content_html = models.TextField(blank=True, editable=False)
     category = models.CharField(max_length=20, choices=ProjectCategory.choices)
     status = models.CharField(max_length=20, choices=ProjectStatus.choices, default=ProjectStatus.EN_COURS)
     location = models.CharField(max_length=255, blank=True)
     client_name = models.CharField(max_length=255, blank=True)
     year = models.PositiveIntegerField(null=True, blank=True)
-    image = models.ImageField(upload_to="projects/images/", blank=True, validators=[validate_image_file])
+    image = models.ImageField(
+        upload_to="projects/images/", storage=public_storage, blank=True, validators=[validate_image_file]
+    )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     published = models.BooleanField(default=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="created_projects")
     search_vector = SearchVectorField(null=True)
@@ -29,6 +40,9 @@ class Project(TimestampMixin):
         indexes = [
             models.Index(fields=["category", "published"]),
             GinIndex(fields=["search_vector"]),
+            GinIndex(fields=["title"], name="projects_project_title_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["location"], name="projects_project_location_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["client_name"], name="projects_project_client_trgm", opclasses=["gin_trgm_ops"]),
         ]
 
     def __str__(self):
@@ -37,25 +51,52 @@ class Project(TimestampMixin):
     def get_absolute_url(self):
         return reverse("project_detail", kwargs={"slug": self.slug})
 
+    @property
+    def rendered_content(self):
+        return self.rendered("content")
+
 
 class ProjectDocument(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="documents")
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     file = models.FileField(upload_to="projects/documents/%Y/%m/", validators=[validate_document_file])
+    file_size = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    content_type = models.CharField(max_length=100, blank=True, editable=False)
+    checksum = models.CharField(max_length=64, blank=True, editable=False, help_text="SHA-256")
     category = models.CharField(max_length=100, blank=True, help_text="Plans, Rapports, Photos, etc.")
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["project", "created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.project.title})"
 
+    def save(self, *args, **kwargs):
+        if self.file and not self.file._committed:
+            self.record_file_metadata()
+        super().save(*args, **kwargs)
+
+    def record_file_metadata(self):
+        digest = hashlib.sha256()
+        size = 0
+        for chunk in self.file.chunks():
+            digest.update(chunk)
+            size += len(chunk)
+        self.file_size = size
+        self.checksum = digest.hexdigest()
+        self.content_type = mimetypes.guess_type(self.file.name)[0] or "application/octet-stream"
+
     @property
     def size_display(self):
-        size = self.file.size
+        if self.file_size is None:
+            return "-"
+        size = self.file_size
         for unit in ["B", "KB", "MB", "GB"]:
             if size < 1024:
                 return f"{size:.1f} {unit}"
@@ -1,8 +1,13 @@
+import hashlib
+from unittest.mock import patch
+
 import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
 from django.db import IntegrityError
 
 from apps.projects.factories import ProjectDocumentFactory, ProjectFactory
-from apps.projects.models import Project
+from apps.projects.models import Project, ProjectDocument
 
 
 @pytest.mark.django_db
@@ -29,18 +34,35 @@ class TestProjectDocument:
 
     def test_size_display_bytes(self):
         doc = ProjectDocumentFactory()
-        with pytest.MonkeyPatch.context() as m:
-            m.setattr(type(doc.file), "size", property(lambda self: 512))
-            assert doc.size_display == "512.0 B"
+        doc.file_size = 512
+        assert doc.size_display == "512.0 B"
 
     def test_size_display_kb(self):
         doc = ProjectDocumentFactory()
-        with pytest.MonkeyPatch.context() as m:
-            m.setattr(type(doc.file), "size", property(lambda self: 2048))
-            assert doc.size_display == "2.0 KB"
+        doc.file_size = 2048
+        assert doc.size_display == "2.0 KB"
 
     def test_size_display_mb(self):
         doc = ProjectDocumentFactory()
-        with pytest.MonkeyPatch.context() as m:
-            m.setattr(type(doc.file), "size", property(lambda self: 5 * 1024 * 1024))
-            assert doc.size_display == "5.0 MB"
+        doc.file_size = 5 * 1024 * 1024
+        assert doc.size_display == "5.0 MB"
+
+    def test_size_display_unknown_does_not_touch_storage(self):
+        doc = ProjectDocumentFactory()
+        doc.file_size = None
+        with patch.object(type(doc.file), "size", property(lambda self: pytest.fail("storage hit"))):
+            assert doc.size_display == "-"
+
+    def test_metadata_recorded_on_upload(self):
+        doc = ProjectDocumentFactory(file=ContentFile(b"%PDF-1.4 test", name="rapport.pdf"))
+        assert doc.file_size == 13
+        assert doc.content_type == "application/pdf"
+        assert doc.checksum == hashlib.sha256(b"%PDF-1.4 test").hexdigest()
+
+    def test_backfill_command(self):
+        doc = ProjectDocumentFactory(file=ContentFile(b"%PDF-1.4 test", name="rapport.pdf"))
+        ProjectDocument.objects.filter(pk=doc.pk).update(file_size=None, checksum="", content_type="")
+        call_command("backfill_document_metadata")
+        doc.refresh_from_db()
+        assert doc.file_size == 13
+        assert doc.checksum == hashlib.sha256(b"%PDF-1.4 test").hexdigest()
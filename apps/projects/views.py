@@ -1,12 +1,17 @@
+from django.conf import settings
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from django.views.generic import DetailView, ListView
 
+from apps.core.cache import cache_page_tagged
 from apps.core.enums import ProjectCategory
 from apps.projects.models import Project
 
 
-@method_decorator(cache_page(60), name="dispatch")
+@method_decorator(
+    [cache_page_tagged(settings.PAGE_CACHE_TIMEOUT, ["project-list"]), vary_on_headers("HX-Request")],
+    name="dispatch",
+)
 class ProjectListView(ListView):
     model = Project
     template_name = "projects/list.html"
@@ -31,6 +36,10 @@ class ProjectListView(ListView):
         return [self.template_name]
 
 
+@method_decorator(
+    cache_page_tagged(settings.PAGE_CACHE_TIMEOUT, [lambda request, slug: f"project:{slug}"]),
+    name="dispatch",
+)
 class ProjectDetailView(DetailView):
     model = Project
     template_name = "projects/detail.html"
@@ -1,5 +1,6 @@
 import environ
 from pathlib import Path
+from typing import Any
 
 from django.templatetags.static import static
 from django.urls import reverse_lazy
@@ -45,6 +46,7 @@ INSTALLED_APPS = [
     "apps.crm",
     "apps.chatbot",
     "apps.audit",
+    "apps.jobs",
 ]
 
 SITE_ID = 1
@@ -96,7 +98,16 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="info@mygeoconsulting.com")
+JOBS_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+AUDIT_ASYNC_DRAIN = env.bool("AUDIT_ASYNC_DRAIN", default=False)
+AUDIT_RETENTION_MONTHS = env.int("AUDIT_RETENTION_MONTHS", default=0)
 OPENAI_API_KEY = env("OPENAI_API_KEY", default="")
+OPENAI_BASE_URL = env("OPENAI_BASE_URL", default=None)
+CHATBOT_MAX_STREAMS = env.int("CHATBOT_MAX_STREAMS", default=8)
+CHATBOT_QUEUE_TIMEOUT = env.float("CHATBOT_QUEUE_TIMEOUT", default=5)
+CHATBOT_UPSTREAM_TIMEOUT = env.float("CHATBOT_UPSTREAM_TIMEOUT", default=10)
+CHATBOT_LOCAL_ANSWER_THRESHOLD = env.float("CHATBOT_LOCAL_ANSWER_THRESHOLD", default=0.8)
+RATELIMIT_ENABLE = env.bool("RATELIMIT_ENABLE", default=True)
 
 LANGUAGE_CODE = "fr-fr"
 TIME_ZONE = "Africa/Niamey"
@@ -154,11 +165,12 @@ CONTENT_SECURITY_POLICY = {
     }
 }
 
-CACHES = {
+CACHES: dict[str, dict[str, Any]] = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
+PAGE_CACHE_TIMEOUT = 60 * 15
 
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SAMESITE = "Lax"
@@ -292,6 +304,21 @@ UNFOLD = {
                         "icon": "security",
                         "link": reverse_lazy("admin:audit_auditlog_changelist"),
                     },
+                    {
+                        "title": _("Index de recherche"),
+                        "icon": "manage_search",
+                        "link": reverse_lazy("admin:core_searchdocument_changelist"),
+                    },
+                    {
+                        "title": _("Tâches"),
+                        "icon": "schedule",
+                        "link": reverse_lazy("admin:jobs_job_changelist"),
+                    },
+                    {
+                        "title": _("Tâches en échec"),
+                        "icon": "error",
+                        "link": reverse_lazy("admin:jobs_deadjob_changelist"),
+                    },
                 ],
             },
         ],
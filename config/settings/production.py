@@ -29,19 +29,24 @@ SECURE_REFERRER_POLICY = "strict-origin-when-cross-origin"
 _r2_account_id = env("R2_ACCOUNT_ID", default="")
 if _r2_account_id:
     _r2_origin = f"https://{_r2_account_id}.r2.cloudflarestorage.com"
+    _r2_credentials = {
+        "access_key": env("R2_ACCESS_KEY_ID", default=""),
+        "secret_key": env("R2_SECRET_ACCESS_KEY", default=""),
+        "endpoint_url": _r2_origin,
+        "region_name": "auto",
+        "signature_version": "s3v4",
+    }
     _default_storage = {
-        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        "BACKEND": "apps.core.storage.SignedURLCacheS3Storage",
         "OPTIONS": {
-            "access_key": env("R2_ACCESS_KEY_ID", default=""),
-            "secret_key": env("R2_SECRET_ACCESS_KEY", default=""),
+            **_r2_credentials,
             "bucket_name": env("R2_BUCKET", default="geoconsulting-files"),
-            "endpoint_url": _r2_origin,
-            "region_name": "auto",
-            "signature_version": "s3v4",
             "default_acl": "private",
             "file_overwrite": False,
             "querystring_auth": True,
             "querystring_expire": 3600,
+            # A reused URL must outlive any page-cached HTML that embeds it.
+            "url_cache_margin": PAGE_CACHE_TIMEOUT + 300,
         },
     }
     CONTENT_SECURITY_POLICY["DIRECTIVES"]["img-src"].append(_r2_origin)
@@ -58,16 +63,43 @@ STORAGES = {
     },
 }
 
+_r2_public_bucket = env("R2_PUBLIC_BUCKET", default="")
+_r2_public_url = env("R2_PUBLIC_URL", default="").rstrip("/")
+if _r2_account_id and _r2_public_bucket and _r2_public_url:
+    STORAGES["public"] = {
+        "BACKEND": "apps.core.storage.PublicHashedS3Storage",
+        "OPTIONS": {
+            **_r2_credentials,
+            "bucket_name": _r2_public_bucket,
+            "custom_domain": _r2_public_url.split("://", 1)[-1],
+            "url_protocol": "https:",
+        },
+    }
+    CONTENT_SECURITY_POLICY["DIRECTIVES"]["img-src"].append(_r2_public_url)
+
 ANYMAIL = {
     "RESEND_API_KEY": env("RESEND_API_KEY", default=""),
 }
-EMAIL_BACKEND = "anymail.backends.resend.EmailBackend"
+EMAIL_BACKEND = "apps.jobs.backends.QueuedEmailBackend"
+JOBS_EMAIL_BACKEND = "anymail.backends.resend.EmailBackend"
 DEFAULT_FROM_EMAIL = env("ADMIN_EMAIL", default="info@mygeoconsulting.com")
 
+_shared_cache_url = env("SHARED_CACHE_URL", default="")
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-    }
+        "BACKEND": "apps.core.cache_backends.TwoTierCache",
+        "OPTIONS": {
+            "SHARED_ALIAS": "shared",
+            "LOCAL_TIMEOUT": env.int("CACHE_LOCAL_TIMEOUT", default=5),
+            "LOCAL_MAX_ENTRIES": env.int("CACHE_LOCAL_MAX_ENTRIES", default=1000),
+            "LOCAL_BYPASS_PREFIXES": ["rl:", "chatbot:stream-slot:"],
+        },
+    },
+    "shared": env.cache_url("SHARED_CACHE_URL") if _shared_cache_url else {
+        "BACKEND": "apps.core.cache_backends.PostgresCache",
+        "LOCATION": "django_cache",
+        "OPTIONS": {"MAX_ENTRIES": 50000},
+    },
 }
 
 LOGGING = {
@@ -36,3 +36,30 @@ def client_user(db, client_group):
     u = UserFactory()
     u.groups.add(client_group)
     return u
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_interned_user_agents():
+    from apps.audit.services import _user_agent_ids
+
+    _user_agent_ids.clear()
+    yield
+    _user_agent_ids.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_pending_search_stats():
+    from apps.core.search import _pending_counts
+
+    _pending_counts.clear()
+    yield
+    _pending_counts.clear()
@@ -2,6 +2,10 @@
 set -e
 
 python manage.py migrate --noinput
+python manage.py createcachetable
+python manage.py manage_audit_partitions
+python manage.py rerender_markdown
+python manage.py sync_search_index
 python manage.py collectstatic --noinput 2>/dev/null || true
 
 if [ -n "$DJANGO_SUPERUSER_EMAIL" ] && [ -n "$DJANGO_SUPERUSER_PASSWORD" ]; then
@@ -16,4 +20,4 @@ if [ "$#" -gt 0 ]; then
     exec "$@"
 fi
 
-exec gunicorn config.wsgi:application -c gunicorn.conf.py
+exec gunicorn config.asgi:application -c gunicorn.conf.py
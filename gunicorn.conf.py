@@ -1,9 +1,10 @@
 import os
 
 bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
-workers = 2
-threads = 2
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn_worker.UvicornWorker"
 timeout = 120
+graceful_timeout = 30
 capture_output = True
 accesslog = "-"
 errorlog = "-"
@@ -1,6 +1,6 @@
 (function () {
   var isOpen = false;
-  var messages = [];
+  var conversationId = null;
   var isLoading = false;
 
   var container = null;
@@ -141,7 +141,6 @@
   }
 
   function addUserMessage(text) {
-    messages.push({ role: 'user', content: text });
     var bubble = document.createElement('div');
     bubble.style.cssText =
       'align-self:flex-end;background:#dbeafe;color:#1e3a5f;padding:8px 14px;' +
@@ -152,7 +151,6 @@
   }
 
   function addBotMessage(text) {
-    messages.push({ role: 'assistant', content: text });
     var bubble = createBotBubble();
     bubble.textContent = text;
     messagesArea.appendChild(bubble);
@@ -188,26 +186,24 @@
     if (loader) loader.remove();
   }
 
-  function buildHistory() {
-    return messages.map(function (m) {
-      return { role: m.role, content: m.content };
-    });
-  }
-
   async function sendMessage(text) {
     addUserMessage(text);
     isLoading = true;
     showLoading();
 
     try {
+      var headers = {
+        'Content-Type': 'application/json',
+        'X-CSRFToken': getCsrfToken(),
+      };
+      if (conversationId) headers['X-Conversation-Id'] = conversationId;
+
       var response = await fetch('/api/chatbot/', {
         method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'X-CSRFToken': getCsrfToken(),
-        },
-        body: JSON.stringify({ message: text, history: buildHistory() }),
+        headers: headers,
+        body: JSON.stringify({ message: text }),
       });
+      conversationId = response.headers.get('X-Conversation-Id') || conversationId;
 
       hideLoading();
 
@@ -240,6 +236,7 @@
   async function readStream(response) {
     var reader = response.body.getReader();
     var decoder = new TextDecoder();
+    var buffer = '';
     var botText = '';
     var bubble = createBotBubble();
     messagesArea.appendChild(bubble);
@@ -247,15 +244,19 @@
     while (true) {
       var result = await reader.read();
       if (result.done) break;
-      var chunk = decoder.decode(result.value, { stream: true });
-      botText += chunk;
+      buffer += decoder.decode(result.value, { stream: true });
+      var frames = buffer.split('\n\n');
+      buffer = frames.pop();
+      frames.forEach(function (frame) {
+        if (frame.indexOf('data: ') !== 0) return;
+        var payload = frame.slice(6);
+        if (payload === '[DONE]') return;
+        var data = JSON.parse(payload);
+        botText += data.content || data.error || '';
+      });
       bubble.textContent = botText;
       scrollToBottom();
     }
-
-    if (botText) {
-      messages.push({ role: 'assistant', content: botText });
-    }
   }
 
   function scrollToBottom() {
@@ -0,0 +1,4 @@
+document.addEventListener('htmx:configRequest', function (event) {
+  var cookie = document.cookie.match(/csrftoken=([^;]+)/);
+  if (cookie) event.detail.headers['X-CSRFToken'] = cookie[1];
+});